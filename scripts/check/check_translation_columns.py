@@ -3,9 +3,18 @@
 各言語のクリーンCSVで翻訳列の状態を確認するスクリプト
 """
 
+import sys
+from collections import Counter
+
 import pandas as pd
 from pathlib import Path
 
+# --detect: 翻訳候補列の言語を判定して分布を表示（文字種で判定できないセルだけ言語検出APIにまとめて送る）
+detect = '--detect' in sys.argv
+if detect:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts_google_translation' / 'scripts'))
+    from translator import detect_languages
+
 # 確認する言語
 languages = [
     'カンボジア語',
@@ -67,6 +76,13 @@ for lang in languages:
                 print(f"\n  列 [表示エラー]:")
             print(f"    データあり: {count}/{len(df)} 行")
 
+            if count > 0 and detect:
+                values = [str(v) for v in df[non_empty][col]]
+                detections = detect_languages(values)
+                distribution = Counter(d["language"] for d in detections)
+                by_script = sum(1 for d in detections if d["source"] == "script")
+                print(f"    言語の分布: {dict(distribution.most_common())}（文字種で判定: {by_script}/{len(values)}件）")
+
             if count > 0:
                 print(f"    サンプル（最初の3件）:")
                 sample_data = df[non_empty][col].head(3)
@@ -18,45 +18,19 @@ from openpyxl.utils import get_column_letter
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import requests
-import html
-import time
 from difflib import SequenceMatcher
+from pathlib import Path
+
+# 共通の翻訳クライアント（scripts_google_translation/scripts）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts_google_translation' / 'scripts'))
+from language_codes import get_language_registry
+from translation_client import TranslationClient
+from translation_telemetry import write_run_summary
 
 # .envファイルから環境変数を読み込み
 load_dotenv()
 
 
-def translate_with_api_key(texts, source_lang: str, target_lang: str, api_key: str):
-    """
-    Google Translate REST APIを使って翻訳（複数テキスト対応）
-    """
-    base_url = "https://translation.googleapis.com/language/translate/v2"
-
-    # 単一文字列の場合はリストに変換
-    single_input = isinstance(texts, str)
-    if single_input:
-        texts = [texts]
-
-    params = {
-        "key": api_key,
-        "q": texts,
-        "source": source_lang,
-        "target": target_lang,
-        "format": "text"
-    }
-
-    response = requests.post(base_url, params=params)
-    response.raise_for_status()
-
-    result = response.json()
-    # HTMLエスケープをデコード
-    translations = [html.unescape(t['translatedText']) for t in result['data']['translations']]
-
-    # 単一入力の場合は文字列を返す
-    return translations[0] if single_input else translations
-
-
 def calculate_similarity(str1, str2):
     """
     2つの文字列の類似度を計算（difflib使用）
@@ -70,16 +44,17 @@ def calculate_similarity(str1, str2):
     return round(matcher.ratio() * 100, 1)
 
 
-def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
+def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None, dry_run: bool = False):
     """
     CSVから3シート比較Excelを作成
 
     Args:
         input_csv: 入力CSVファイルパス
         output_excel: 出力Excelファイルパス（省略時は自動生成）
+        dry_run: Trueの場合は逆翻訳せず、課金文字数・リクエスト数・所要時間の見積もりだけを表示
 
     Returns:
-        出力Excelファイルパス
+        出力Excelファイルパス（dry_run=Trueの場合は見積もり結果のdict）
     """
     print('=' * 80)
     print('3シート比較Excel作成')
@@ -88,14 +63,17 @@ def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
     print()
 
     # Google Translate API初期化
-    api_key = os.getenv('GOOGLE_API_KEY')
-    if not api_key:
+    if not (os.getenv('GOOGLE_API_KEY') or os.getenv('GOOGLE_API_KEYS')) and not dry_run:
         raise ValueError(
             "Google API キーが設定されていません。\n"
             ".envファイルに GOOGLE_API_KEY=your_api_key_here を設定してください。"
         )
 
-    print('Google Translate API: 初期化成功')
+    # 用語集・キャッシュ・重複除去・並列送信は翻訳クライアントが行う
+    client = TranslationClient()
+    registry = get_language_registry()
+
+    print(f'翻訳クライアント: 初期化成功（バックエンド: {client.backend.name}）')
     print()
 
     # CSV読み込み
@@ -106,97 +84,26 @@ def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
     print(f'  列数: {len(df.columns)}列')
     print()
 
-    # 言語コードと列名のマッピング
-    lang_mapping = {
-        'en': '英語',
-        'fil-PH': 'タガログ語',
-        'pt': 'ポルトガル語',
-        'es': 'スペイン語',
-        'pt-BR': 'ポルトガル語(ブラジル)',
-        'zh': '中国語',
-        'ko': '韓国語',
-        'fr': 'フランス語',
-        'hi': 'ヒンディー語',
-        'th': 'タイ語',
-        'vi': 'ベトナム語',
-        'my': 'ミャンマー語',
-        'ne': 'ネパール語',
-        'bn': 'ベンガル語',
-        'id': 'インドネシア語',
-        'ta': 'タミル語',
-        'si': 'シンハラ語',
-        'mn': 'モンゴル語',
-        'ar': 'アラビア語',
-        'fa': 'ペルシア語',
-        'tr': 'トルコ語',
-        'ru': 'ロシア語',
-        'ur': 'ウルドゥー語',
-        'km': 'カンボジア語',
-        'lo': 'ラオス語',
-        'ms': 'マレー語',
-        'de': 'ドイツ語',
-        'hu': 'ハンガリー語',
-        'cs': 'チェコ語',
-        'pl': 'ポーランド語',
-        'nl': 'オランダ語',
-        'da': 'デンマーク語',
-        'fi': 'フィンランド語',
-        'sv': 'スウェーデン語',
-        'lb': 'ルクセンブルク語',
-        'af': 'アフリカーンス語',
-        'fr-CA': 'フランス語(カナダ)',
-    }
-
-    # Google Translate APIの言語コードマッピング
-    api_lang_codes = {
-        'en': 'en',
-        'fil-PH': 'tl',
-        'pt': 'pt',
-        'es': 'es',
-        'pt-BR': 'pt',
-        'zh': 'zh-CN',
-        'ko': 'ko',
-        'fr': 'fr',
-        'hi': 'hi',
-        'th': 'th',
-        'vi': 'vi',
-        'my': 'my',
-        'ne': 'ne',
-        'bn': 'bn',
-        'id': 'id',
-        'ta': 'ta',
-        'si': 'si',
-        'mn': 'mn',
-        'ar': 'ar',
-        'fa': 'fa',
-        'tr': 'tr',
-        'ru': 'ru',
-        'ur': 'ur',
-        'km': 'km',
-        'lo': 'lo',
-        'ms': 'ms',
-        'de': 'de',
-        'hu': 'hu',
-        'cs': 'cs',
-        'pl': 'pl',
-        'nl': 'nl',
-        'da': 'da',
-        'fi': 'fi',
-        'sv': 'sv',
-        'lb': 'lb',
-        'af': 'af',
-        'fr-CA': 'fr',
-    }
-
-    # 翻訳対象の列を決定（jaを除く全列）
-    columns_to_translate = [col for col in df.columns if col != 'ja' and col in api_lang_codes]
+    # 翻訳対象の列を決定（jaを除く、言語コードの一覧にある列）
+    columns_to_translate = registry.translatable_columns(df.columns)
 
     print('翻訳対象の列:')
     for col_code in columns_to_translate:
-        lang_name = lang_mapping.get(col_code, col_code)
+        lang_name = registry.name(col_code)
         print(f'  {col_code:10s} → {lang_name}')
     print()
 
+    if dry_run:
+        from cost_estimator import estimate_jobs, print_estimate
+
+        jobs = [
+            (col_code, [str(t).strip() for t in df[col_code].dropna()], registry.api_code(col_code), 'ja')
+            for col_code in columns_to_translate
+        ]
+        report = estimate_jobs(jobs, engine=client.engine)
+        print_estimate(report)
+        return report
+
     # 出力用データフレーム（逆翻訳結果）
     df_retranslated = df.copy()
 
@@ -213,7 +120,7 @@ def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
         if col_code not in df.columns:
             continue
 
-        lang_name = lang_mapping.get(col_code, col_code)
+        lang_name = registry.name(col_code)
 
         print(f'[{col_idx_loop}/{len(columns_to_translate)}] 処理中: {lang_name} ({col_code})')
 
@@ -233,7 +140,7 @@ def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
             non_empty_texts.append(text_str)
 
         # 重複を除いたユニークなテキスト数
-        unique_texts = list(set(non_empty_texts))
+        unique_texts = list(dict.fromkeys(non_empty_texts))
 
         print(f'  データ行数: {len(df)}行')
         print(f'  空欄でないセル: {len(non_empty_texts)}個')
@@ -245,45 +152,14 @@ def create_3sheet_comparison_excel(input_csv: str, output_excel: str = None):
             print()
             continue
 
-        # 翻訳対象のテキストを取得（空欄を除く）
+        # Google Translate APIで逆翻訳（失敗したテキストは空欄にする）
+        # 文字数の上限に達した場合はBudgetExceededErrorで以降の翻訳を行わずに中止
+        translated = client.translate(unique_texts, registry.api_code(col_code), 'ja', raise_on_error=False)
         reverse_translations = {}
-
-        # 行ごとに処理
-        translated_count = 0
-        for row_idx, text in enumerate(df[col_code], start=2):  # Excelは1行目がヘッダーなので2から
-            # 空欄チェック（厳格に）
-            if pd.isna(text):
-                continue
-            text_str = str(text).strip()
-            if text_str == '':
-                continue
-
-            # すでに翻訳済みならスキップ
-            if text_str in reverse_translations:
-                continue
-
-            try:
-                # Google Translate APIで逆翻訳
-                source_lang = api_lang_codes[col_code]
-                translated = translate_with_api_key(
-                    text_str,
-                    source_lang=source_lang,
-                    target_lang='ja',
-                    api_key=api_key
-                )
-                reverse_translations[text_str] = translated
-                translated_count += 1
-
-                # 進捗表示（10件ごと）
-                if translated_count % 10 == 0:
-                    print(f'    進捗: {translated_count}/{len(unique_texts)}件')
-
-                # API制限対策
-                time.sleep(0.1)
-
-            except Exception as e:
-                print(f'  エラー（行{row_idx}）: {e}')
-                reverse_translations[text_str] = ''
+        for text_str, result in zip(unique_texts, translated):
+            if result is None:
+                print(f'  エラー: 翻訳に失敗しました: {text_str}')
+            reverse_translations[text_str] = result if result is not None else ''
 
         # 逆翻訳結果をデータフレームに適用（空欄はそのまま）
         def apply_retranslation(x):
@@ -450,7 +326,15 @@ if __name__ == "__main__":
     # 使用例
     input_csv = r'C:\python_script\test_space\MitsubishiMultipleTranslation\core_files\for_import_インドネシア.csv'
 
+    # --dry-run: 見積もりのみ（APIに接続しない）
+    if '--dry-run' in sys.argv:
+        create_3sheet_comparison_excel(input_csv, dry_run=True)
+        sys.exit(0)
+
     output_excel = create_3sheet_comparison_excel(input_csv)
 
     print()
     print(f'作成されたファイル: {output_excel}')
+
+    # 言語ペアごとのリクエスト数・応答時間・再試行などを書き出す
+    write_run_summary()
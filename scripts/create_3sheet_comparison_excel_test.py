@@ -12,40 +12,19 @@ from openpyxl.utils import get_column_letter
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import requests
-import html
-import time
 from difflib import SequenceMatcher
+from pathlib import Path
+
+# 共通の翻訳クライアント（scripts_google_translation/scripts）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts_google_translation' / 'scripts'))
+from language_codes import get_language_registry
+from translation_client import TranslationClient
+from translation_telemetry import write_run_summary
 
 # .envファイルから環境変数を読み込み
 load_dotenv()
 
 
-def translate_with_api_key(texts, source_lang: str, target_lang: str, api_key: str):
-    """Google Translate REST APIを使って翻訳"""
-    base_url = "https://translation.googleapis.com/language/translate/v2"
-
-    single_input = isinstance(texts, str)
-    if single_input:
-        texts = [texts]
-
-    params = {
-        "key": api_key,
-        "q": texts,
-        "source": source_lang,
-        "target": target_lang,
-        "format": "text"
-    }
-
-    response = requests.post(base_url, params=params)
-    response.raise_for_status()
-
-    result = response.json()
-    translations = [html.unescape(t['translatedText']) for t in result['data']['translations']]
-
-    return translations[0] if single_input else translations
-
-
 def calculate_similarity(str1, str2):
     """2つの文字列の類似度を計算"""
     if pd.isna(str1) or pd.isna(str2):
@@ -68,10 +47,13 @@ print(f'実行日時: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
 print()
 
 # Google Translate API初期化
-api_key = os.getenv('GOOGLE_API_KEY')
-if not api_key:
+if not (os.getenv('GOOGLE_API_KEY') or os.getenv('GOOGLE_API_KEYS')):
     raise ValueError("Google API キーが設定されていません")
 
+# 用語集・キャッシュ・重複除去・並列送信は翻訳クライアントが行う
+client = TranslationClient()
+registry = get_language_registry()
+
 print('✓ Google Translate API: 初期化成功')
 print()
 
@@ -83,20 +65,8 @@ print(f'  行数: {len(df)}行')
 print(f'  列数: {len(df.columns)}列')
 print()
 
-# Google Translate APIの言語コードマッピング
-api_lang_codes = {
-    'en': 'en', 'fil-PH': 'tl', 'pt': 'pt', 'es': 'es', 'pt-BR': 'pt',
-    'zh': 'zh-CN', 'ko': 'ko', 'fr': 'fr', 'hi': 'hi', 'th': 'th',
-    'vi': 'vi', 'my': 'my', 'ne': 'ne', 'bn': 'bn', 'id': 'id',
-    'ta': 'ta', 'si': 'si', 'mn': 'mn', 'ar': 'ar', 'fa': 'fa',
-    'tr': 'tr', 'ru': 'ru', 'ur': 'ur', 'km': 'km', 'lo': 'lo',
-    'ms': 'ms', 'de': 'de', 'hu': 'hu', 'cs': 'cs', 'pl': 'pl',
-    'nl': 'nl', 'da': 'da', 'fi': 'fi', 'sv': 'sv', 'lb': 'lb',
-    'af': 'af', 'fr-CA': 'fr',
-}
-
-# 翻訳対象の列
-columns_to_translate = [col for col in df.columns if col != 'ja' and col in api_lang_codes]
+# 翻訳対象の列（jaを除く、言語コードの一覧にある列）
+columns_to_translate = registry.translatable_columns(df.columns)
 
 # 出力用データフレーム
 df_retranslated = df.copy()
@@ -128,7 +98,7 @@ for col_idx_loop, col_code in enumerate(columns_to_translate, 1):
             continue
         non_empty_texts.append(text_str)
 
-    unique_texts = list(set(non_empty_texts))
+    unique_texts = list(dict.fromkeys(non_empty_texts))
 
     print(f'  空欄でないセル: {len(non_empty_texts)}個')
     print(f'  ユニークな翻訳: {len(unique_texts)}件')
@@ -138,35 +108,13 @@ for col_idx_loop, col_code in enumerate(columns_to_translate, 1):
         print()
         continue
 
-    # 逆翻訳
+    # 逆翻訳（失敗したテキストは空欄にする）
+    translated = client.translate(unique_texts, registry.api_code(col_code), 'ja', raise_on_error=False)
     reverse_translations = {}
-    translated_count = 0
-
-    for row_idx, text in enumerate(df[col_code], start=2):
-        if pd.isna(text):
-            continue
-        text_str = str(text).strip()
-        if text_str == '':
-            continue
-
-        if text_str in reverse_translations:
-            continue
-
-        try:
-            source_lang = api_lang_codes[col_code]
-            translated = translate_with_api_key(text_str, source_lang=source_lang, target_lang='ja', api_key=api_key)
-            reverse_translations[text_str] = translated
-            translated_count += 1
-
-            # 進捗表示（10件ごと）
-            if translated_count % 10 == 0:
-                print(f'    進捗: {translated_count}/{len(unique_texts)}件')
-
-            time.sleep(0.1)
-
-        except Exception as e:
-            print(f'  エラー（行{row_idx}）: {e}')
-            reverse_translations[text_str] = ''
+    for text_str, result in zip(unique_texts, translated):
+        if result is None:
+            print(f'  エラー: 翻訳に失敗しました: {text_str}')
+        reverse_translations[text_str] = result if result is not None else ''
 
     # 結果を適用
     def apply_retranslation(x):
@@ -286,6 +234,10 @@ print(f'不一致: {total_comparisons - perfect_matches}件')
 print(f'一致率: {match_rate:.1f}%')
 print()
 
+# 言語ペアごとのリクエスト数・応答時間・再試行などを書き出す
+write_run_summary()
+print()
+
 print('=' * 80)
 print('完了')
 print('=' * 80)
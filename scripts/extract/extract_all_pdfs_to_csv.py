@@ -1,17 +1,37 @@
 """
 pdfplumberで全8言語のPDFからテーブルを抽出してCSVに出力
+
+使い方:
+    python extract_all_pdfs_to_csv.py               # 1プロセスで順番に抽出
+    python extract_all_pdfs_to_csv.py --parallel    # ページ範囲ごとにプロセスプールで並列抽出
+    python extract_all_pdfs_to_csv.py --parallel --workers 4
+
+ページごとの抽出結果は pdf_page_cache にキャッシュされ、PDFが変わらなければ2回目以降はパースしない。
+抽出した行は1ページずつCSVに書き出すため、PDFのページ数が増えてもメモリ使用量は一定。
 """
 
-import pdfplumber
+import csv
+import os
+import sys
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 import re
 
+from pdf_page_cache import cached_pdfplumber_pages, pdf_page_count
+
 # 設定
 PDF_DIR = Path(r"C:\Users\永井秀和\Documents\workspace\三菱様_多言語翻訳_202510\建設関連PDF")
 OUTPUT_DIR = Path(r"C:\Users\永井秀和\Documents\workspace\三菱様_多言語翻訳_202510\output")
 
-OUTPUT_DIR.mkdir(exist_ok=True)
+# 出力CSVの列
+OUTPUT_COLUMNS = ['言語', 'Page', '番号', '単語', '翻訳']
+
+# 並列抽出の設定（1タスクで処理するページ数の上限、プロセス数）
+PAGES_PER_TASK = 16
+DEFAULT_WORKERS = os.cpu_count() or 1
 
 # 8言語のPDFファイル
 PDF_FILES = [
@@ -32,208 +52,382 @@ def extract_language_from_filename(filename):
     return match.group(1) if match else 'Unknown'
 
 
-def extract_pdf_to_dataframe(pdf_path, pdf_file):
-    """PDFからテーブルを抽出してDataFrameを返す"""
+def extract_page_tables(page_num, tables):
+    """
+    1ページ分のテーブルからヘッダー行以降のデータ行を取り出す
 
-    language = extract_language_from_filename(pdf_file)
-    print(f"\n{'='*80}")
-    print(f"処理中: {language} - {pdf_file}")
-    print(f"{'='*80}")
+    Args:
+        page_num: ページ番号（0始まり）
+        tables: page.extract_tables() の結果
 
-    all_data = []
+    Returns:
+        (page_info, rows): テーブルごとの情報のリストと、[ページ, テーブル, セル...] の行のリスト
+    """
     page_info = []
+    rows = []
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            print(f"総ページ数: {total_pages}")
-
-            for page_num in range(total_pages):
-                page = pdf.pages[page_num]
-
-                # ページからテーブルを抽出
-                tables = page.extract_tables()
-
-                if len(tables) == 0:
-                    continue
-
-                # 各テーブルを処理
-                for table_idx, table in enumerate(tables):
-                    if len(table) == 0:
-                        continue
-
-                    # ヘッダー行を探す（"No." または "Số" を含む行）
-                    header_row_idx = None
-                    for i, row in enumerate(table):
-                        if any('No.' in str(cell) or 'Số' in str(cell) for cell in row if cell):
-                            header_row_idx = i
-                            break
-
-                    if header_row_idx is None:
-                        continue
-
-                    # ヘッダー行を取得
-                    header_row = table[header_row_idx]
-
-                    # データ行を抽出（ヘッダー行の次の行から）
-                    data_rows = table[header_row_idx + 1:]
-
-                    if len(data_rows) == 0:
-                        continue
-
-                    # ページ情報を記録
-                    page_info.append({
-                        'page': page_num + 1,
-                        'table': table_idx + 1,
-                        'header_row': header_row_idx,
-                        'data_rows': len(data_rows),
-                        'columns': len(header_row)
-                    })
-
-                    # 各データ行にページ情報を追加
-                    for row in data_rows:
-                        # 行の長さをヘッダーと合わせる
-                        if len(row) < len(header_row):
-                            row.extend([''] * (len(header_row) - len(row)))
-                        elif len(row) > len(header_row):
-                            row = row[:len(header_row)]
-
-                        # ページ番号とテーブル番号を追加
-                        row_with_page = [page_num + 1, table_idx + 1] + row
-                        all_data.append(row_with_page)
+    # 各テーブルを処理
+    for table_idx, table in enumerate(tables):
+        if len(table) == 0:
+            continue
+
+        # ヘッダー行を探す（"No." または "Số" を含む行）
+        header_row_idx = None
+        for i, row in enumerate(table):
+            if any('No.' in str(cell) or 'Số' in str(cell) for cell in row if cell):
+                header_row_idx = i
+                break
+
+        if header_row_idx is None:
+            continue
+
+        # ヘッダー行を取得
+        header_row = table[header_row_idx]
+
+        # データ行を抽出（ヘッダー行の次の行から）
+        data_rows = table[header_row_idx + 1:]
+
+        if len(data_rows) == 0:
+            continue
+
+        # ページ情報を記録
+        page_info.append({
+            'page': page_num + 1,
+            'table': table_idx + 1,
+            'header_row': header_row_idx,
+            'data_rows': len(data_rows),
+            'columns': len(header_row)
+        })
+
+        # 各データ行にページ情報を追加
+        for row in data_rows:
+            # 行の長さをヘッダーと合わせる
+            if len(row) < len(header_row):
+                row.extend([''] * (len(header_row) - len(row)))
+            elif len(row) > len(header_row):
+                row = row[:len(header_row)]
+
+            # ページ番号とテーブル番号を追加
+            row_with_page = [page_num + 1, table_idx + 1] + row
+            rows.append(row_with_page)
+
+    return page_info, rows
+
+
+def iter_page_chunks(pdf_path, start_page, end_page):
+    """
+    指定範囲のページからテーブルを1ページずつ抽出（ページを読み終えたら解放するのでメモリ使用量は一定）
+
+    抽出キャッシュ（pdf_page_cache）にあるページはPDFをパースせずに読み込み、
+    ないページだけPDFを1回開いて抽出する。
 
+    Args:
+        pdf_path: PDFファイルのパス
+        start_page: 開始ページ（0始まり）
+        end_page: 終了ページ（このページを含まない）
+
+    Yields:
+        (page_info, rows): テーブルのあるページごと（ページ順）
+    """
+    for page in cached_pdfplumber_pages(pdf_path, page_numbers=range(start_page, end_page)):
+        # ページから抽出したテーブル
+        tables = page.tables
+
+        if len(tables) == 0:
+            continue
+
+        yield extract_page_tables(page.page_num, tables)
+
+
+def extract_page_range(pdf_path, start_page, end_page):
+    """
+    指定範囲のページからテーブルを抽出（プロセスプールのワーカーで実行、範囲はPAGES_PER_TASKページまで）
+
+    Returns:
+        (page_info, rows): 範囲内の全ページ分（ページ順）
+    """
+    page_info = []
+    rows = []
+    for info, page_rows in iter_page_chunks(pdf_path, start_page, end_page):
+        page_info.extend(info)
+        rows.extend(page_rows)
+    return page_info, rows
+
+
+def split_page_ranges(total_pages, workers, pages_per_task=PAGES_PER_TASK):
+    """
+    ページをワーカー数に応じた範囲に分割（1ワーカーあたり数タスクになるようにして負荷を均す）
+
+    Returns:
+        [(開始ページ, 終了ページ), ...]
+    """
+    size = max(1, min(pages_per_task, -(-total_pages // (workers * 4))))
+    return [(start, min(start + size, total_pages)) for start in range(0, total_pages, size)]
+
+
+def clean_cell(value):
+    """セルの値をクリーニング（trim + 改行除去、空のセルは空文字）"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        # 改行を空白に置換
+        value = value.replace('\n', ' ').replace('\r', ' ')
+        # 複数の空白を1つに（前後の空白も削除）
+        value = ' '.join(value.split())
+    return value
+
+
+def output_row(language, row):
+    """
+    [ページ, テーブル, セル...] の行を出力CSVの行（言語, Page, 番号, 単語, 翻訳）にする
+
+    列の対応: Column_0=番号, Column_1=単語, Column_2=読み方, Column_3=翻訳（ない列は空欄）
+    """
+    cells = row[2:]
+
+    def cell(i):
+        return clean_cell(cells[i]) if i < len(cells) else ''
+
+    return [language, row[0], cell(0), cell(1), cell(3)]
+
+
+class LanguageCsvWriter:
+    """1言語分の抽出結果を1行ずつCSVに書き出す（ファイルは最初の行を書く時に作成）"""
+
+    def __init__(self, language, output_file):
+        self.language = language
+        self.output_file = Path(output_file)
+        self.tables = 0
+        self.rows = 0
+        self.translation_fill = 0
+        self._file = None
+        self._writer = None
+
+    def write_chunk(self, page_info, rows):
+        """1ページ（または1ページ範囲）分の行を書き出す"""
+        self.tables += len(page_info)
+        for row in rows:
+            if self._writer is None:
+                self._file = open(self.output_file, 'w', encoding='utf-8-sig', newline='')
+                self._writer = csv.writer(self._file, lineterminator=os.linesep)
+                self._writer.writerow(OUTPUT_COLUMNS)
+            values = output_row(self.language, row)
+            self._writer.writerow(values)
+            self.rows += 1
+            if str(values[4]).strip() != '':
+                self.translation_fill += 1
+
+    def close(self):
+        """ファイルを閉じる（書き出した行がない場合はFalse）"""
+        if self._file is not None:
+            self._file.close()
+        return self.rows > 0
+
+    def discard(self):
+        """途中まで書き出したファイルを削除（抽出エラーの場合）"""
+        if self._file is not None:
+            self._file.close()
+            self.output_file.unlink(missing_ok=True)
+        self.rows = 0
+
+
+def write_language_csv(language, output_file, chunks):
+    """
+    抽出結果を1ページずつ言語ごとのCSVに書き出す（全行をメモリに集めない）
+
+    Args:
+        language: 言語名
+        output_file: 出力CSVのパス
+        chunks: (page_info, rows) のイテレータ
+
+    Returns:
+        LanguageCsvWriter: 書き出した結果の集計（エラー・データなしの場合はNone）
+    """
+    writer = LanguageCsvWriter(language, output_file)
+    try:
+        for page_info, rows in chunks:
+            writer.write_chunk(page_info, rows)
     except Exception as e:
+        writer.discard()
         print(f"エラー: {language} - {type(e).__name__}: {e}")
         return None
 
-    print(f"処理したページ数: {len(page_info)}")
-    print(f"抽出した総行数: {len(all_data)}")
-
-    # DataFrameに変換
-    if len(all_data) > 0:
-        # 全データ行から最大列数を取得
-        max_cols = max(len(row) for row in all_data)
-
-        # 全ての行を最大列数に合わせる
-        for row in all_data:
-            if len(row) < max_cols:
-                row.extend([''] * (max_cols - len(row)))
-
-        # 列名を生成（Page, Table, Data columns）
-        columns = ['Page', 'Table']
-        for i in range(max_cols - 2):
-            columns.append(f'Column_{i}')
-
-        df = pd.DataFrame(all_data, columns=columns)
-
-        # 必要な列のみを選択して並び替え
-        # 列の対応: Column_0=番号, Column_1=単語, Column_2=読み方, Column_3=翻訳
-        df_final = pd.DataFrame({
-            '言語': language,
-            'Page': df['Page'],
-            '番号': df['Column_0'],
-            '単語': df['Column_1'],
-            '翻訳': df['Column_3']
-        })
+    print(f"処理したページ数: {writer.tables}")
+    print(f"抽出した総行数: {writer.rows}")
 
-        # 全セルにtrimと改行クリーニングを適用
-        def clean_cell(value):
-            """セルの値をクリーニング（trim + 改行除去）"""
-            if pd.isna(value):
-                return value
-            if isinstance(value, str):
-                # 改行を空白に置換
-                value = value.replace('\n', ' ').replace('\r', ' ')
-                # 複数の空白を1つに
-                value = ' '.join(value.split())
-                # 前後の空白を削除
-                value = value.strip()
-            return value
-
-        # 全ての列に適用
-        for col in df_final.columns:
-            df_final[col] = df_final[col].apply(clean_cell)
-
-        # 翻訳データの充足率
-        translation_fill = (df_final['翻訳'].notna() & (df_final['翻訳'].astype(str).str.strip() != '')).sum()
-        translation_rate = translation_fill / len(df_final) * 100 if len(df_final) > 0 else 0
-
-        print(f"総行数: {len(df_final)}")
-        print(f"翻訳データあり: {translation_fill}/{len(df_final)} ({translation_rate:.1f}%)")
-
-        return df_final
-
-    else:
+    if not writer.close():
         print("データが抽出できませんでした")
         return None
 
-
-def main():
-    """メイン処理"""
+    translation_rate = writer.translation_fill / writer.rows * 100
+    print(f"総行数: {writer.rows}")
+    print(f"翻訳データあり: {writer.translation_fill}/{writer.rows} ({translation_rate:.1f}%)")
+    return writer
+
+
+def iter_pdf_chunks(pdf_files, parallel=False, workers=DEFAULT_WORKERS):
+    """
+    PDFごとに、抽出結果を (page_info, rows) のイテレータで順番に返す
+
+    並列の場合は（PDF, ページ範囲）のタスクをプロセスプールで実行し、結果は投入順に受け取る。
+    同時に実行・保持するタスクは workers * 2 件までにするため、メモリ使用量はページ数によらない。
+
+    Args:
+        pdf_files: PDFファイル名のリスト（PDF_DIRからの相対）
+        parallel: Trueの場合はプロセスプールで並列に抽出
+        workers: 並列抽出のプロセス数
+
+    Yields:
+        (pdf_file, total_pages, chunks): ページ数を取得できなかったPDFは total_pages が例外、chunks がNone
+    """
+    total_pages = {}
+    for pdf_file in pdf_files:
+        try:
+            total_pages[pdf_file] = pdf_page_count(PDF_DIR / pdf_file)
+        except Exception as e:
+            total_pages[pdf_file] = e
+
+    if not parallel:
+        for pdf_file in pdf_files:
+            if isinstance(total_pages[pdf_file], Exception):
+                yield pdf_file, total_pages[pdf_file], None
+            else:
+                yield pdf_file, total_pages[pdf_file], iter_page_chunks(PDF_DIR / pdf_file, 0, total_pages[pdf_file])
+        return
+
+    # 各PDFをタスクに分割
+    ranges = {
+        pdf_file: split_page_ranges(count, workers)
+        for pdf_file, count in total_pages.items() if not isinstance(count, Exception)
+    }
+    tasks = [(str(PDF_DIR / pdf_file), start, end) for pdf_file in pdf_files for start, end in ranges.get(pdf_file, [])]
+    print(f"並列抽出: {len(ranges)}ファイル、{len(tasks)}タスク、{workers}プロセス")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # 投入順に結果を受け取り、受け取った分だけ次のタスクを投入
+        task_iter = iter(tasks)
+        pending = deque(executor.submit(extract_page_range, *task) for task in islice(task_iter, workers * 2))
+
+        def next_result():
+            future = pending.popleft()
+            task = next(task_iter, None)
+            if task is not None:
+                pending.append(executor.submit(extract_page_range, *task))
+            return future.result()
+
+        for pdf_file in pdf_files:
+            if isinstance(total_pages[pdf_file], Exception):
+                yield pdf_file, total_pages[pdf_file], None
+                continue
+
+            remaining = [len(ranges[pdf_file])]
+
+            def chunks():
+                while remaining[0] > 0:
+                    remaining[0] -= 1
+                    yield next_result()
+
+            yield pdf_file, total_pages[pdf_file], chunks()
+
+            # エラーで途中までしか読まれなかったタスクの結果を捨てる
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                try:
+                    next_result()
+                except Exception:
+                    pass
+
+
+def append_csv_body(source, destination, write_header):
+    """CSVファイルの内容を統合CSVに追記（ヘッダーは最初のファイルだけ、1行ずつコピー）"""
+    with open(source, 'r', encoding='utf-8-sig', newline='') as f:
+        header = f.readline()
+        if write_header:
+            destination.write(header)
+        for line in f:
+            destination.write(line)
+
+
+def main(parallel=False, workers=DEFAULT_WORKERS):
+    """
+    メイン処理
+
+    抽出した行は1ページずつ言語ごとのCSVに書き出し、統合CSVは言語ごとのCSVを順につなげて作る
+    （PDFのページ数が増えてもメモリ使用量は一定）。
+
+    Args:
+        parallel: Trueの場合は全PDFのページ範囲をプロセスプールで並列に抽出
+        workers: 並列抽出のプロセス数
+    """
     print(f"{'='*80}")
     print("全8言語PDF抽出処理開始")
     print(f"{'='*80}")
 
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
     all_results = []
-    all_dataframes = []
+    output_files = []
 
-    # 各言語のPDFを処理
+    pdf_files = []
     for pdf_file in PDF_FILES:
-        pdf_path = PDF_DIR / pdf_file
-
-        if not pdf_path.exists():
+        if not (PDF_DIR / pdf_file).exists():
             print(f"\n警告: ファイルが見つかりません - {pdf_file}")
             continue
+        pdf_files.append(pdf_file)
 
-        df = extract_pdf_to_dataframe(pdf_path, pdf_file)
+    # 各言語のPDFを処理
+    for pdf_file, total_pages, chunks in iter_pdf_chunks(pdf_files, parallel, workers):
+        language = extract_language_from_filename(pdf_file)
+        print(f"\n{'='*80}")
+        print(f"処理中: {language} - {pdf_file}")
+        print(f"{'='*80}")
 
-        if df is not None:
-            language = extract_language_from_filename(pdf_file)
+        if chunks is None:
+            print(f"エラー: {language} - {type(total_pages).__name__}: {total_pages}")
+            continue
+        print(f"総ページ数: {total_pages}")
 
-            # 個別CSV出力
-            output_file = OUTPUT_DIR / f"{language}_pdfplumber_抽出_最終版.csv"
-            df.to_csv(output_file, index=False, encoding='utf-8-sig')
-            print(f"出力: {output_file}")
+        # 個別CSV出力
+        output_file = OUTPUT_DIR / f"{language}_pdfplumber_抽出_最終版.csv"
+        result = write_language_csv(language, output_file, chunks)
 
-            # 統合用にDataFrameを保存
-            all_dataframes.append(df)
+        if result is not None:
+            print(f"出力: {output_file}")
+            output_files.append(output_file)
 
             # 結果を記録
-            translation_fill = (df['翻訳'].notna() & (df['翻訳'].astype(str).str.strip() != '')).sum()
-            translation_rate = translation_fill / len(df) * 100 if len(df) > 0 else 0
-
             all_results.append({
                 '言語': language,
-                '行数': len(df),
-                '翻訳あり': translation_fill,
-                '翻訳充足率': f"{translation_rate:.1f}%"
+                '行数': result.rows,
+                '翻訳あり': result.translation_fill,
+                '翻訳充足率': f"{result.translation_fill / result.rows * 100:.1f}%"
             })
 
-    # 全言語統合CSV作成
-    if len(all_dataframes) > 0:
+    # 全言語統合CSV作成（言語ごとのCSVをつなげる）
+    if len(output_files) > 0:
         print(f"\n{'='*80}")
         print("全言語統合中")
         print(f"{'='*80}")
 
-        df_combined = pd.concat(all_dataframes, ignore_index=True)
-
         combined_output = OUTPUT_DIR / "全言語統合_pdfplumber_最終版.csv"
-        df_combined.to_csv(combined_output, index=False, encoding='utf-8-sig')
+        with open(combined_output, 'w', encoding='utf-8-sig', newline='') as f:
+            for i, output_file in enumerate(output_files):
+                append_csv_body(output_file, f, write_header=(i == 0))
 
+        total_rows = sum(r['行数'] for r in all_results)
         print(f"\n統合ファイル出力: {combined_output}")
-        print(f"総行数: {len(df_combined)}")
-        print(f"総列数: {len(df_combined.columns)}")
+        print(f"総行数: {total_rows}")
+        print(f"総列数: {len(OUTPUT_COLUMNS)}")
 
         # 言語別統計
         print(f"\n言語別行数:")
-        lang_counts = df_combined['言語'].value_counts()
-        for lang, count in lang_counts.items():
-            print(f"  {lang}: {count}行")
+        for r in sorted(all_results, key=lambda r: r['行数'], reverse=True):
+            print(f"  {r['言語']}: {r['行数']}行")
 
         # 全体の翻訳充足率
-        total_translation = (df_combined['翻訳'].notna() & (df_combined['翻訳'].astype(str).str.strip() != '')).sum()
-        total_rate = total_translation / len(df_combined) * 100 if len(df_combined) > 0 else 0
-        print(f"\n全体の翻訳充足率: {total_translation}/{len(df_combined)} ({total_rate:.1f}%)")
+        total_translation = sum(r['翻訳あり'] for r in all_results)
+        total_rate = total_translation / total_rows * 100 if total_rows > 0 else 0
+        print(f"\n全体の翻訳充足率: {total_translation}/{total_rows} ({total_rate:.1f}%)")
 
     # サマリーテーブル表示
     if len(all_results) > 0:
@@ -249,4 +443,8 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    # --parallel: ページ範囲ごとにプロセスプールで並列抽出（--workers N でプロセス数を指定）
+    workers = DEFAULT_WORKERS
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    main(parallel='--parallel' in sys.argv, workers=workers)
@@ -4,134 +4,158 @@
 
 pdfplumberで文字の座標を取得し、
 X座標を基準に列を検出して正しく表データを抽出します。
+
+罫線ベースのテーブル検出（extract_tables）がうまくいかないレイアウト（タイ語・カンボジア語）向け。
+文字の座標をNumPy配列にして、行のグループ化・列の境界検出・列の割り当てをまとめて計算するため、
+文書全体を処理できる。
+
+使い方:
+    python extract_by_coordinates.py                  # カンボジア語PDFの全ページ
+    python extract_by_coordinates.py <PDFファイル> <出力CSV>
 """
 
-import pdfplumber
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from collections import defaultdict
 
-def extract_table_by_coordinates(page, page_num):
+from pdf_page_cache import CHAR_BOX_COLUMNS, cached_pdfplumber_pages, chars_to_arrays
+
+# y座標の許容差（前の文字とのy座標の差がこれ以下なら同じ行）
+LINE_TOLERANCE = 5
+# 列の境界とみなすX座標のギャップ（ポイント）
+COLUMN_GAP = 30
+# 列の境界が見つからない場合の固定値（PDF単位、左から）
+DEFAULT_COLUMN_BOUNDARIES = [250, 400, 550, 700, 850, 1000]
+# サンプルを表示するページ数
+SAMPLE_PAGES = 5
+
+X0 = CHAR_BOX_COLUMNS.index("x0")
+TOP = CHAR_BOX_COLUMNS.index("top")
+
+
+def detect_column_boundaries(x0, gap=COLUMN_GAP):
     """
-    座標ベースで表データを抽出
+    X座標の分布から列の境界を検出（ギャップが gap より大きい所の中点）
 
     Args:
-        page: pdfplumberのPageオブジェクト
-        page_num: ページ番号
+        x0: 文字の左端のX座標の配列
+        gap: 列の境界とみなすギャップ
 
     Returns:
-        list: 抽出した表データ（行のリスト）
+        np.ndarray: 列の境界（昇順、見つからない場合は DEFAULT_COLUMN_BOUNDARIES）
+    """
+    xs = np.unique(x0)
+    gaps = np.diff(xs)
+    mask = gaps > gap
+    boundaries = (xs[:-1][mask] + xs[1:][mask]) / 2
+    if boundaries.size == 0:
+        return np.array(DEFAULT_COLUMN_BOUNDARIES, dtype=float)
+    return boundaries
+
+
+def extract_table_from_arrays(chars_text, chars_box, page_num=None):
     """
-    chars = page.chars
+    文字の配列から座標ベースで表データを抽出
+
+    Args:
+        chars_text: 文字の配列（N）
+        chars_box: 文字の座標 (x0, x1, top, bottom) の配列（N x 4）
+        page_num: ページ番号（表示用、Noneの場合は表示しない）
 
-    if not chars:
+    Returns:
+        list: 抽出した表データ（行のリスト、各行は列ごとの文字列のリスト）
+    """
+    if len(chars_text) == 0:
         return []
 
-    # y座標でグループ化（行を検出）
-    chars_sorted = sorted(chars, key=lambda c: (c.get('top', 0), c.get('x0', 0)))
-
-    lines = []
-    current_line = []
-    current_y = None
-    tolerance = 5  # y座標の許容差
-
-    for char in chars_sorted:
-        y = char.get('top', 0)
-
-        if current_y is None or abs(y - current_y) <= tolerance:
-            current_line.append(char)
-            current_y = y
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = [char]
-            current_y = y
-
-    if current_line:
-        lines.append(current_line)
-
-    # 列の境界を検出（X座標の分布から）
-    # すべての文字のX座標を収集
-    all_x = [c.get('x0', 0) for c in chars]
-    all_x_sorted = sorted(set(all_x))
-
-    # 列の境界を決定（X座標の大きなギャップを探す）
-    column_boundaries = []
-    prev_x = None
-
-    for x in all_x_sorted:
-        if prev_x is not None and x - prev_x > 30:  # 30ポイント以上のギャップ
-            column_boundaries.append((prev_x + x) / 2)
-        prev_x = x
-
-    # 列の境界が見つからない場合、固定値を使用
-    if not column_boundaries:
-        # 一般的な表の列境界（PDF単位、左から）
-        column_boundaries = [250, 400, 550, 700, 850, 1000]
-
-    print(f"\nページ {page_num}:")
-    print(f"  検出された行数: {len(lines)}")
-    print(f"  列の境界 (X座標): {[f'{x:.1f}' for x in column_boundaries]}")
-
-    # 各行を列に分割
-    table_data = []
+    x0 = chars_box[:, X0].astype(float)
+    top = chars_box[:, TOP].astype(float)
 
-    for line_idx, line in enumerate(lines):
-        # 行のテキストを列ごとに分割
-        row_data = [''] * (len(column_boundaries) + 1)
+    # y座標でグループ化（行を検出）: (top, x0) の順に並べ、前の文字とのyの差が許容差を超えたら次の行
+    order = np.lexsort((x0, top))
+    line_ids = np.concatenate(([0], np.cumsum(np.diff(top[order]) > LINE_TOLERANCE)))
 
-        # 文字をx座標でソート
-        line_sorted = sorted(line, key=lambda c: c.get('x0', 0))
+    # 列の境界を検出（X座標の大きなギャップを探す）
+    column_boundaries = detect_column_boundaries(x0)
 
-        # 各文字をどの列に属するかを決定
-        for char in line_sorted:
-            x = char.get('x0', 0)
-            text = char.get('text', '')
+    if page_num is not None:
+        print(f"\nページ {page_num}:")
+        print(f"  検出された行数: {line_ids[-1] + 1}")
+        print(f"  列の境界 (X座標): {[f'{x:.1f}' for x in column_boundaries]}")
 
-            # この文字がどの列に属するかを決定
-            col_idx = 0
-            for boundary in column_boundaries:
-                if x < boundary:
-                    break
-                col_idx += 1
+    # 各文字をどの列に属するかを決定（境界以上の数 = 列のインデックス）
+    col_ids = np.searchsorted(column_boundaries, x0[order], side='right')
 
-            # 列に文字を追加
-            if col_idx < len(row_data):
-                row_data[col_idx] += text
+    # 行 → 列 → x座標の順に並べて、同じセルの文字を連結
+    n_cols = len(column_boundaries) + 1
+    cell_order = np.lexsort((np.arange(len(order)), x0[order], line_ids))
+    cell_keys = (line_ids * n_cols + col_ids)[cell_order]
+    texts = np.asarray(chars_text)[order][cell_order]
+    starts = np.flatnonzero(np.concatenate(([True], cell_keys[1:] != cell_keys[:-1])))
+    ends = np.append(starts[1:], len(cell_keys))
 
-        # 空でない行のみ追加
-        if any(cell.strip() for cell in row_data):
-            table_data.append(row_data)
+    table_data = []
+    current_line = None
+    row_data = None
+    for start, end in zip(starts, ends):
+        line, col = divmod(int(cell_keys[start]), n_cols)
+        if line != current_line:
+            # 空でない行のみ追加
+            if row_data is not None and any(cell.strip() for cell in row_data):
+                table_data.append(row_data)
+            row_data = [''] * n_cols
+            current_line = line
+        row_data[col] = ''.join(texts[start:end])
+
+    if row_data is not None and any(cell.strip() for cell in row_data):
+        table_data.append(row_data)
 
     return table_data
 
-def main():
-    """メイン処理"""
-    pdf_file = "建設関連PDF/【全課統合版】カンボジア語_げんばのことば_建設関連職種.pdf"
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
 
-    print("=" * 80)
-    print("座標ベースPDF抽出")
-    print("=" * 80)
-    print(f"\nPDFファイル: {pdf_file}")
+def extract_table_by_coordinates(page, page_num):
+    """
+    座標ベースで表データを抽出
+
+    Args:
+        page: pdfplumberのPageオブジェクト
+        page_num: ページ番号
+
+    Returns:
+        list: 抽出した表データ（行のリスト）
+    """
+    chars_text, chars_box = chars_to_arrays(page.chars)
+    return extract_table_from_arrays(chars_text, chars_box, page_num)
 
-    all_data = []
 
-    with pdfplumber.open(pdf_file) as pdf:
-        total_pages = len(pdf.pages)
-        print(f"総ページ数: {total_pages}")
+def extract_pdf_by_coordinates(pdf_file, page_numbers=None, sample_pages=SAMPLE_PAGES):
+    """
+    PDFの全ページ（またはpage_numbersのページ）を座標ベースで抽出
 
-        for page_num in range(1, min(total_pages + 1, 6)):  # 最初の5ページをテスト
-            page = pdf.pages[page_num - 1]
-            table_data = extract_table_by_coordinates(page, page_num)
+    文字の座標は抽出キャッシュ（pdf_page_cache）から読み込み、ないページだけPDFをパースする。
 
-            if table_data:
-                print(f"  抽出行数: {len(table_data)}")
+    Args:
+        pdf_file: PDFファイルのパス
+        page_numbers: 抽出するページ番号（0始まり、省略時は全ページ）
+        sample_pages: 行数・列の境界・サンプル行を表示するページ数
 
-                # ページ番号を追加
-                for row in table_data:
-                    all_data.append([page_num] + row)
+    Returns:
+        list: [ページ番号, 列0, 列1, ...] の行のリスト
+    """
+    all_data = []
+    for page in cached_pdfplumber_pages(pdf_file, page_numbers=page_numbers, with_chars=True):
+        page_num = page.page_num + 1
+        verbose = page_num <= sample_pages
+        table_data = extract_table_from_arrays(page.chars_text, page.chars_box, page_num if verbose else None)
+
+        if table_data:
+            # ページ番号を追加
+            for row in table_data:
+                all_data.append([page_num] + row)
+
+            if verbose:
+                print(f"  抽出行数: {len(table_data)}")
 
                 # サンプルを表示（最初の3行）
                 print(f"  サンプル（最初の3行）:")
@@ -143,6 +167,24 @@ def main():
                                 print(f"      列{col_idx}: {cell.strip()[:50]}")
                             except:
                                 print(f"      列{col_idx}: [カンボジア語・{len(cell)}文字]")
+    return all_data
+
+def main():
+    """メイン処理"""
+    pdf_file = "建設関連PDF/【全課統合版】カンボジア語_げんばのことば_建設関連職種.pdf"
+    output_dir = Path("output")
+    output_dir.mkdir(exist_ok=True)
+    csv_file = output_dir / "カンボジア語_coordinate_extracted.csv"
+    if len(sys.argv) >= 3:
+        pdf_file, csv_file = sys.argv[1], Path(sys.argv[2])
+
+    print("=" * 80)
+    print("座標ベースPDF抽出")
+    print("=" * 80)
+    print(f"\nPDFファイル: {pdf_file}")
+
+    all_data = extract_pdf_by_coordinates(pdf_file)
+    print(f"\n抽出ページ数: {len({row[0] for row in all_data})}（行のあるページ）")
 
     if all_data:
         # DataFrameに変換
@@ -157,7 +199,6 @@ def main():
         df = pd.DataFrame(all_data, columns=headers)
 
         # CSVに保存
-        csv_file = output_dir / "カンボジア語_coordinate_extracted.csv"
         df.to_csv(csv_file, index=False, encoding='utf-8-sig')
 
         print(f"\n統合完了:")
@@ -8,11 +8,12 @@
 - カンボジア語・タイ語の翻訳データも正しく抽出
 """
 
-import pdfplumber
 import pandas as pd
 from pathlib import Path
 import os
 
+from pdf_page_cache import cached_pdfplumber_pages, pdf_page_count
+
 def find_header_row(table):
     """
     テーブルからヘッダー行を探す
@@ -55,54 +56,54 @@ def extract_tables_from_pdf_improved(pdf_path, output_dir="output"):
 
     print(f"PDFファイルを読み込み中: {pdf_path}")
 
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
-        print(f"総ページ数: {total_pages}")
+    total_pages = pdf_page_count(pdf_path)
+    print(f"総ページ数: {total_pages}")
 
-        for page_num, page in enumerate(pdf.pages, start=1):
-            print(f"ページ {page_num}/{total_pages} を処理中...")
+    # Text戦略でテーブル抽出（同じPDF・同じ設定のページは抽出キャッシュから読み込む）
+    for page in cached_pdfplumber_pages(pdf_path, table_settings):
+        page_num = page.page_num + 1
+        print(f"ページ {page_num}/{total_pages} を処理中...")
 
-            # Text戦略でテーブル抽出
-            tables = page.extract_tables(table_settings=table_settings)
+        tables = page.tables
 
-            if tables:
-                for table_num, table in enumerate(tables, start=1):
-                    if table and len(table) > 0:
-                        # ヘッダー行を探す
-                        header_row_idx = find_header_row(table)
+        if tables:
+            for table_num, table in enumerate(tables, start=1):
+                if table and len(table) > 0:
+                    # ヘッダー行を探す
+                    header_row_idx = find_header_row(table)
 
-                        if header_row_idx >= len(table) - 1:
-                            # ヘッダー行しかない、またはデータ行がない
-                            continue
+                    if header_row_idx >= len(table) - 1:
+                        # ヘッダー行しかない、またはデータ行がない
+                        continue
 
-                        # ヘッダー行を取得
-                        headers = table[header_row_idx]
-                        headers = [str(h) if h is not None and h != '' else f"Column_{i}"
-                                   for i, h in enumerate(headers)]
+                    # ヘッダー行を取得
+                    headers = table[header_row_idx]
+                    headers = [str(h) if h is not None and h != '' else f"Column_{i}"
+                               for i, h in enumerate(headers)]
 
-                        # データ行を取得（ヘッダー行の次の行から）
-                        data_rows = table[header_row_idx + 1:]
+                    # データ行を取得（ヘッダー行の次の行から）
+                    data_rows = table[header_row_idx + 1:]
 
-                        # 空行をスキップ
-                        data_rows = [row for row in data_rows if any(cell and str(cell).strip() for cell in row)]
+                    # 空行をスキップ
+                    data_rows = [row for row in data_rows if any(cell and str(cell).strip() for cell in row)]
 
-                        if not data_rows:
-                            continue
+                    if not data_rows:
+                        continue
 
-                        # DataFrameに変換
-                        df = pd.DataFrame(data_rows, columns=headers)
+                    # DataFrameに変換
+                    df = pd.DataFrame(data_rows, columns=headers)
 
-                        # 列数を記録
-                        current_cols = len(df.columns)
-                        if current_cols > max_columns:
-                            max_columns = current_cols
+                    # 列数を記録
+                    current_cols = len(df.columns)
+                    if current_cols > max_columns:
+                        max_columns = current_cols
 
-                        # ページ番号と表番号を追加
-                        df.insert(0, 'Page', page_num)
-                        df.insert(1, 'Table', table_num)
+                    # ページ番号と表番号を追加
+                    df.insert(0, 'Page', page_num)
+                    df.insert(1, 'Table', table_num)
 
-                        all_tables.append(df)
-                        print(f"  表 {table_num} を抽出 (行数: {len(df)}, 列数: {current_cols})")
+                    all_tables.append(df)
+                    print(f"  表 {table_num} を抽出 (行数: {len(df)}, 列数: {current_cols})")
 
     if not all_tables:
         print("警告: 表が見つかりませんでした")
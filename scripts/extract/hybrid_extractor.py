@@ -0,0 +1,269 @@
+"""
+pdfplumberとPyMuPDFを組み合わせてPDFからテーブルを抽出（ハイブリッド抽出）
+
+速いエンジン（デフォルト: PyMuPDF）で全ページを抽出し、問題があるページだけもう一方のエンジンで抽出し直す。
+    - 列数の異常（ヘッダーの列数が足りない、行ごとに列数が違う）: ページ全体をもう一方のエンジンの結果にする
+    - CIDコード（"(cid:123)"、pdfplumberでクメール語のフォントなど）: そのセルだけもう一方のエンジンのセルに置き換える
+      （行は番号（No.列）で対応付ける）
+
+結果はセルごとにどのエンジンから取ったか（抽出元）を持つため、
+両方のエンジンで全ページを抽出して compare_extractions.py / normalize_and_compare.py で照合する必要がない。
+
+使い方:
+    python hybrid_extractor.py                       # 全8言語（PDF_DIR / PDF_FILES）
+    python hybrid_extractor.py --primary pdfplumber  # pdfplumberを先に使う
+"""
+
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from extract_all_pdfs_to_csv import (
+    OUTPUT_DIR, PDF_DIR, PDF_FILES, extract_language_from_filename, extract_page_tables
+)
+from pdf_page_cache import cached_pdfplumber_pages, cached_pymupdf_pages, pdf_page_count
+
+ENGINES = ("pymupdf", "pdfplumber")
+
+# CIDコード（pdfplumberでToUnicodeのないフォントの文字）
+CID_PATTERN = re.compile(r'\(cid:\d+\)')
+
+# ヘッダーに必要な列数（番号・単語・読み方・翻訳）
+MIN_TABLE_COLUMNS = 4
+
+
+@dataclass
+class HybridRow:
+    """抽出した1行（セルごとの抽出元付き）"""
+    page: int                                   # ページ番号（1始まり）
+    table: int                                  # テーブル番号（1始まり）
+    cells: list
+    sources: list                               # セルごとの抽出元（"pymupdf" / "pdfplumber"）
+
+
+@dataclass
+class HybridStats:
+    """ハイブリッド抽出の集計"""
+    pages: int = 0
+    secondary_pages: int = 0                    # もう一方のエンジンで抽出し直したページ数
+    switched_pages: int = 0                     # 列数の異常でページ全体を切り替えたページ数
+    replaced_cells: int = 0                     # CIDコードをもう一方のエンジンのセルに置き換えた数
+    unresolved_cid_cells: int = 0               # 置き換えられなかったCIDコードのセル数
+    switched_page_numbers: list = field(default_factory=list)
+
+
+def _page_tables(engine, pdf_path, page_numbers=None):
+    """エンジンごとの抽出（抽出キャッシュ経由）: {ページ番号: テーブルのリスト}"""
+    if engine == "pdfplumber":
+        pages = cached_pdfplumber_pages(pdf_path, page_numbers=page_numbers)
+    elif engine == "pymupdf":
+        pages = cached_pymupdf_pages(pdf_path, page_numbers=page_numbers)
+    else:
+        raise ValueError(f"不明な抽出エンジンです: {engine}（{', '.join(ENGINES)} のいずれか）")
+    return {page.page_num: page.tables for page in pages}
+
+
+def _find_header(table):
+    """ヘッダー行（"No." または "Số" を含む行）のインデックス（見つからない場合はNone）"""
+    for i, row in enumerate(table):
+        if any('No.' in str(cell) or 'Số' in str(cell) for cell in row if cell):
+            return i
+    return None
+
+
+def has_column_anomaly(tables):
+    """
+    列数の異常があるか
+
+    ヘッダーのあるテーブルで、ヘッダーの列数が MIN_TABLE_COLUMNS 未満、
+    またはデータ行の列数がヘッダーと違う場合はTrue。
+    """
+    for table in tables:
+        header_idx = _find_header(table)
+        if header_idx is None:
+            continue
+        width = len(table[header_idx])
+        if width < MIN_TABLE_COLUMNS:
+            return True
+        if any(len(row) != width for row in table[header_idx + 1:]):
+            return True
+    return False
+
+
+def has_cid(tables):
+    """CIDコードを含むセルがあるか"""
+    return any(cell and CID_PATTERN.search(str(cell)) for table in tables for row in table for cell in row)
+
+
+def _row_key(cells):
+    """行の対応付けに使う番号（No.列）"""
+    return ' '.join(str(cells[0] or '').split()) if cells else ''
+
+
+def _replace_cid_cells(rows, other_rows, other_engine, stats):
+    """CIDコードのセルを、番号が同じもう一方のエンジンの行のセルに置き換える"""
+    by_key = defaultdict(list)
+    for other in other_rows:
+        by_key[_row_key(other.cells)].append(other)
+
+    for row in rows:
+        candidates = by_key.get(_row_key(row.cells))
+        other = candidates.pop(0) if candidates else None
+        for i, cell in enumerate(row.cells):
+            if not (cell and CID_PATTERN.search(str(cell))):
+                continue
+            replacement = other.cells[i] if other is not None and len(other.cells) == len(row.cells) else None
+            if replacement and not CID_PATTERN.search(str(replacement)):
+                row.cells[i] = replacement
+                row.sources[i] = other_engine
+                stats.replaced_cells += 1
+            else:
+                stats.unresolved_cid_cells += 1
+
+
+def _to_rows(page_num, tables, engine):
+    """テーブルを HybridRow のリストにする（ヘッダー行以降、列数はヘッダーに合わせる）"""
+    _, rows = extract_page_tables(page_num, tables)
+    return [HybridRow(row[0], row[1], row[2:], [engine] * len(row[2:])) for row in rows]
+
+
+def extract_pdf_hybrid(pdf_path, primary="pymupdf"):
+    """
+    PDFからテーブルをハイブリッド抽出
+
+    Args:
+        pdf_path: PDFファイルのパス
+        primary: 全ページに使うエンジン（"pymupdf" / "pdfplumber"、もう一方は問題のあるページだけに使う）
+
+    Returns:
+        (rows, stats): HybridRow のリスト（ページ・テーブル・行の順）と HybridStats
+    """
+    secondary = ENGINES[1] if primary == ENGINES[0] else ENGINES[0]
+    stats = HybridStats(pages=pdf_page_count(pdf_path))
+
+    # 全ページを速いエンジンで抽出し、問題のあるページを探す
+    primary_tables = _page_tables(primary, pdf_path)
+    retry_pages = [
+        page_num for page_num, tables in primary_tables.items()
+        if has_column_anomaly(tables) or has_cid(tables)
+    ]
+
+    # 問題のあるページだけもう一方のエンジンで抽出
+    secondary_tables = _page_tables(secondary, pdf_path, retry_pages) if retry_pages else {}
+    stats.secondary_pages = len(retry_pages)
+
+    rows = []
+    for page_num in sorted(primary_tables):
+        tables = primary_tables[page_num]
+        engine, other_engine = primary, secondary
+        other_tables = secondary_tables.get(page_num)
+
+        # 列数の異常: もう一方のエンジンで異常がなければページ全体を切り替える
+        if other_tables is not None and has_column_anomaly(tables) and not has_column_anomaly(other_tables):
+            tables, other_tables = other_tables, tables
+            engine, other_engine = secondary, primary
+            stats.switched_pages += 1
+            stats.switched_page_numbers.append(page_num + 1)
+
+        page_rows = _to_rows(page_num, tables, engine)
+
+        # CIDコード: セルだけもう一方のエンジンの結果に置き換える
+        if other_tables is not None and has_cid(tables):
+            _replace_cid_cells(page_rows, _to_rows(page_num, other_tables, other_engine), other_engine, stats)
+
+        rows.extend(page_rows)
+
+    return rows, stats
+
+
+def clean_cell(value):
+    """セルの値をクリーニング（改行を空白に、連続する空白を1つに、前後の空白を削除）"""
+    if value is None:
+        return ''
+    return ' '.join(str(value).replace('\n', ' ').replace('\r', ' ').split())
+
+
+def to_dataframe(language, rows):
+    """
+    HybridRow を 言語・Page・番号・単語・翻訳 とセルごとの抽出元のDataFrameにする
+
+    列の対応は extract_all_pdfs_to_csv と同じ（Column_0=番号, Column_1=単語, Column_3=翻訳）。
+    """
+    def cell(row, i):
+        return (clean_cell(row.cells[i]), row.sources[i]) if i < len(row.cells) else ('', '')
+
+    records = []
+    for row in rows:
+        number, number_source = cell(row, 0)
+        word, word_source = cell(row, 1)
+        translation, translation_source = cell(row, 3)
+        records.append({
+            '言語': language,
+            'Page': row.page,
+            '番号': number,
+            '単語': word,
+            '翻訳': translation,
+            '番号_抽出元': number_source,
+            '単語_抽出元': word_source,
+            '翻訳_抽出元': translation_source
+        })
+    return pd.DataFrame(records)
+
+
+def print_stats(stats):
+    """ハイブリッド抽出の集計を表示"""
+    print(f"総ページ数: {stats.pages}")
+    print(f"もう一方のエンジンで抽出したページ: {stats.secondary_pages}")
+    print(f"  列数の異常で切り替えたページ: {stats.switched_pages} {stats.switched_page_numbers[:10]}")
+    print(f"  CIDコードを置き換えたセル: {stats.replaced_cells}")
+    if stats.unresolved_cid_cells:
+        print(f"  置き換えられなかったCIDコードのセル: {stats.unresolved_cid_cells}")
+
+
+def main(primary="pymupdf"):
+    """全8言語のPDFをハイブリッド抽出して、言語ごとのCSVと統合CSVを出力"""
+    print(f"{'='*80}")
+    print(f"ハイブリッド抽出（優先: {primary}）")
+    print(f"{'='*80}")
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    all_dataframes = []
+
+    for pdf_file in PDF_FILES:
+        pdf_path = PDF_DIR / pdf_file
+        if not pdf_path.exists():
+            print(f"\n警告: ファイルが見つかりません - {pdf_file}")
+            continue
+
+        language = extract_language_from_filename(pdf_file)
+        print(f"\n処理中: {language} - {pdf_file}")
+
+        rows, stats = extract_pdf_hybrid(pdf_path, primary)
+        print_stats(stats)
+        if not rows:
+            print("データが抽出できませんでした")
+            continue
+
+        df = to_dataframe(language, rows)
+        output_file = OUTPUT_DIR / f"{language}_hybrid_抽出.csv"
+        df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        print(f"総行数: {len(df)}")
+        print(f"出力: {output_file}")
+        all_dataframes.append(df)
+
+    if all_dataframes:
+        df_combined = pd.concat(all_dataframes, ignore_index=True)
+        combined_output = OUTPUT_DIR / "全言語統合_hybrid.csv"
+        df_combined.to_csv(combined_output, index=False, encoding='utf-8-sig')
+        print(f"\n統合ファイル出力: {combined_output}（{len(df_combined)}行）")
+
+
+if __name__ == '__main__':
+    # --primary pdfplumber: pdfplumberで全ページを抽出し、問題のあるページだけPyMuPDFを使う
+    primary = "pymupdf"
+    if '--primary' in sys.argv:
+        primary = sys.argv[sys.argv.index('--primary') + 1]
+    main(primary)
@@ -0,0 +1,351 @@
+"""
+PDFのページ単位の抽出結果キャッシュ
+
+キーは（PDFの内容のハッシュ, ページ番号, 抽出エンジン, エンジンのバージョン, table_settingsのハッシュ）。
+同じPDF・同じ設定のページは2回目以降パースせずにキャッシュから読み込むため、
+設定の比較やエンジンの比較をやり直しても、入力が変わったページだけが再抽出される。
+
+抽出結果は1ページずつ返し、pdfplumberのページは抽出したら解放（page.close()）するため、
+メモリ使用量はPDFのページ数によらず一定になる。
+
+保存形式（1ページ1ファイル、numpyの .npz、pickleは使わない）:
+    tables: テーブル（セルのリストのリスト）をJSONにしたバイト列
+    chars_text: 文字のリスト（with_chars=Trueで抽出した場合）
+    chars_box: 文字の座標 (x0, x1, top, bottom) の float64 配列（N x 4、pdfplumberと同じ精度）
+
+使い方:
+    from pdf_page_cache import cached_pdfplumber_pages
+
+    for page in cached_pdfplumber_pages(pdf_path, table_settings={"vertical_strategy": "text"}):
+        print(page.page_num, len(page.tables))
+
+環境変数:
+    PDF_EXTRACTION_CACHE_DIR: キャッシュの保存先（省略時はリポジトリの output/pdf_cache）
+    PDF_EXTRACTION_CACHE_DISABLED: 1 の場合はキャッシュを使わない
+"""
+import hashlib
+import json
+import os
+import threading
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# リポジトリのルート（scripts/extract から2つ上）の output/pdf_cache（.gitignoreで除外）
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "output" / "pdf_cache"
+
+# 文字の座標の列（chars_boxの列の順番）
+CHAR_BOX_COLUMNS = ("x0", "x1", "top", "bottom")
+
+
+@dataclass
+class PageExtraction:
+    """1ページ分の抽出結果"""
+    page_num: int                          # ページ番号（0始まり）
+    tables: List[List[List[Optional[str]]]]
+    chars_text: Optional[np.ndarray] = None  # 文字（with_chars=Trueの場合）
+    chars_box: Optional[np.ndarray] = None   # 文字の座標 (x0, x1, top, bottom)
+    cached: bool = False                    # キャッシュから読み込んだか
+
+
+def file_hash(pdf_path) -> str:
+    """
+    PDFファイルの内容のSHA-256（同じパス・サイズ・更新日時のファイルは再計算しない）
+
+    Args:
+        pdf_path: PDFファイルのパス
+
+    Returns:
+        str: 16進数のハッシュ
+    """
+    path = Path(pdf_path).resolve()
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    with _hash_lock:
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+
+def settings_hash(settings: Optional[dict]) -> str:
+    """table_settingsなど抽出設定のハッシュ（キーの順番に依存しない）"""
+    text = json.dumps(settings or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def engine_version(engine: str) -> str:
+    """抽出エンジンのバージョン（"pdfplumber" / "pymupdf"）"""
+    if engine == "pdfplumber":
+        import pdfplumber
+        return pdfplumber.__version__
+    if engine == "pymupdf":
+        import fitz
+        return fitz.VersionBind
+    raise ValueError(f"不明な抽出エンジンです: {engine}")
+
+
+class PageCache:
+    """
+    ページ単位の抽出結果キャッシュ（1ページ1ファイル）
+
+    <保存先>/<PDFハッシュ先頭16文字>/<エンジン>-<バージョン>-<設定ハッシュ>/p00001.npz
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir: 保存先（省略時は環境変数 PDF_EXTRACTION_CACHE_DIR、未設定の場合は output/pdf_cache）
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("PDF_EXTRACTION_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+
+    def page_dir(self, pdf_hash: str, engine: str, settings: Optional[dict]) -> Path:
+        """PDF・エンジン・設定ごとのフォルダ"""
+        return self.cache_dir / pdf_hash[:16] / f"{engine}-{engine_version(engine)}-{settings_hash(settings)}"
+
+    def load(self, path: Path, page_num: int, with_chars: bool) -> Optional[PageExtraction]:
+        """
+        キャッシュを読み込む
+
+        Returns:
+            PageExtraction: 見つからない場合・文字の座標が必要なのに保存されていない場合はNone
+        """
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if with_chars and "chars_box" not in data:
+                    return None
+                tables = json.loads(data["tables"].tobytes().decode("utf-8"))
+                chars_text = data["chars_text"] if "chars_text" in data else None
+                chars_box = data["chars_box"] if "chars_box" in data else None
+        except Exception as e:
+            # 壊れたキャッシュは無視して抽出し直す
+            print(f"[WARNING] 抽出キャッシュを読み込めません（再抽出します）: {path}: {e}")
+            return None
+        return PageExtraction(page_num, tables, chars_text, chars_box, cached=True)
+
+    def save(self, path: Path, page: PageExtraction) -> None:
+        """キャッシュを書き込む（一時ファイルに書いてから置き換える）"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "tables": np.frombuffer(json.dumps(page.tables, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+        }
+        if page.chars_box is not None:
+            arrays["chars_text"] = page.chars_text
+            arrays["chars_box"] = page.chars_box
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def pages(
+        self,
+        pdf_path,
+        engine: str,
+        settings: Optional[dict],
+        page_numbers: Optional[Iterable[int]],
+        extract_page: Callable[[object, int], PageExtraction],
+        open_pdf: Callable,
+        with_chars: bool = False
+    ) -> Iterator[PageExtraction]:
+        """
+        ページごとの抽出結果を1ページずつ返す（キャッシュにないページだけPDFを開いて抽出）
+
+        結果はまとめずに1ページずつ返すため、メモリ使用量はページ数によらない。
+
+        Args:
+            pdf_path: PDFファイルのパス
+            engine: 抽出エンジン名
+            settings: 抽出設定
+            page_numbers: 抽出するページ番号（0始まり、省略時は全ページ）
+            extract_page: (開いたPDF, ページ番号) を受け取り PageExtraction を返す関数
+            open_pdf: PDFを開く関数（コンテキストマネージャを返す）
+            with_chars: 文字の座標も必要か
+
+        Yields:
+            PageExtraction: page_numbersの順
+        """
+        page_dir = self.page_dir(file_hash(pdf_path), engine, settings)
+        if page_numbers is None:
+            page_numbers = range(self.page_count(pdf_path))
+
+        # PDFは最初にキャッシュにないページが見つかった時に1回だけ開く
+        with ExitStack() as stack:
+            pdf = None
+            for page_num in page_numbers:
+                path = page_dir / f"p{page_num + 1:05d}.npz"
+                page = self.load(path, page_num, with_chars)
+                if page is not None:
+                    self.hits += 1
+                    yield page
+                    continue
+
+                self.misses += 1
+                if pdf is None:
+                    pdf = stack.enter_context(open_pdf(pdf_path))
+                page = extract_page(pdf, page_num)
+                self.save(path, page)
+                yield page
+
+    def page_count(self, pdf_path) -> int:
+        """PDFのページ数（PDFごとのフォルダに保存して、2回目以降はPDFを開かない）"""
+        meta_path = self.cache_dir / file_hash(pdf_path)[:16] / "meta.json"
+        if meta_path.exists():
+            try:
+                return json.loads(meta_path.read_text(encoding="utf-8"))["page_count"]
+            except Exception:
+                pass
+        count = _count_pages(pdf_path)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta_path.write_text(json.dumps({"page_count": count, "file": Path(pdf_path).name}), encoding="utf-8")
+        return count
+
+
+_default_cache = None
+
+
+def get_default_page_cache() -> Optional[PageCache]:
+    """
+    共有の抽出キャッシュを取得
+
+    Returns:
+        PageCache: 環境変数 PDF_EXTRACTION_CACHE_DISABLED=1 の場合はNone
+    """
+    global _default_cache
+    if os.getenv("PDF_EXTRACTION_CACHE_DISABLED") == "1":
+        return None
+    if _default_cache is None:
+        _default_cache = PageCache()
+    return _default_cache
+
+
+def pdf_page_count(pdf_path, cache: Optional[PageCache] = None) -> int:
+    """
+    PDFのページ数（キャッシュが有効な場合は2回目以降PDFを開かない）
+
+    Args:
+        pdf_path: PDFファイルのパス
+        cache: 使用するキャッシュ（省略時は共有のキャッシュ）
+
+    Returns:
+        int: ページ数
+    """
+    if cache is None:
+        cache = get_default_page_cache()
+    return cache.page_count(pdf_path) if cache is not None else _count_pages(pdf_path)
+
+
+def _count_pages(pdf_path) -> int:
+    import fitz
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+def chars_to_arrays(chars) -> tuple:
+    """pdfplumberの page.chars を (文字の配列, 座標の float64 配列 N x 4) にする"""
+    chars_text = np.array([c["text"] for c in chars], dtype=str)
+    chars_box = np.array([[c[k] for k in CHAR_BOX_COLUMNS] for c in chars], dtype=np.float64).reshape(-1, 4)
+    return chars_text, chars_box
+
+
+def _pdfplumber_open(pdf_path):
+    import pdfplumber
+    return pdfplumber.open(pdf_path)
+
+
+def _pymupdf_open(pdf_path):
+    import fitz
+    return fitz.open(pdf_path)
+
+
+def cached_pdfplumber_pages(
+    pdf_path,
+    table_settings: Optional[dict] = None,
+    page_numbers: Optional[Iterable[int]] = None,
+    with_chars: bool = False,
+    cache: Optional[PageCache] = None
+) -> Iterator[PageExtraction]:
+    """
+    pdfplumberの page.extract_tables() の結果をページごとに返す（キャッシュを使う）
+
+    Args:
+        pdf_path: PDFファイルのパス
+        table_settings: pdfplumberのtable_settings（省略時はデフォルト設定）
+        page_numbers: 抽出するページ番号（0始まり、省略時は全ページ）
+        with_chars: Trueの場合は文字の座標（page.chars）も返す
+        cache: 使用するキャッシュ（省略時は共有のキャッシュ、無効の場合は毎回抽出）
+
+    Yields:
+        PageExtraction: page_numbersの順（1ページずつ、メモリ使用量はページ数によらない）
+    """
+    def extract_page(pdf, page_num):
+        page = pdf.pages[page_num]
+        try:
+            tables = page.extract_tables(table_settings=table_settings) if table_settings else page.extract_tables()
+            chars_text, chars_box = chars_to_arrays(page.chars) if with_chars else (None, None)
+        finally:
+            # pdfplumberはPDFを閉じるまでページのレイアウト（文字・罫線など）を保持するため、抽出したら解放
+            page.close()
+        return PageExtraction(page_num, tables, chars_text, chars_box)
+
+    yield from _cached_pages(
+        pdf_path, "pdfplumber", table_settings, page_numbers, extract_page, _pdfplumber_open, with_chars, cache
+    )
+
+
+def cached_pymupdf_pages(
+    pdf_path,
+    find_tables_settings: Optional[dict] = None,
+    page_numbers: Optional[Iterable[int]] = None,
+    cache: Optional[PageCache] = None
+) -> Iterator[PageExtraction]:
+    """
+    PyMuPDFの page.find_tables() の結果（table.extract()）をページごとに返す（キャッシュを使う）
+
+    Args:
+        pdf_path: PDFファイルのパス
+        find_tables_settings: page.find_tables() の引数（省略時はデフォルト設定）
+        page_numbers: 抽出するページ番号（0始まり、省略時は全ページ）
+        cache: 使用するキャッシュ（省略時は共有のキャッシュ、無効の場合は毎回抽出）
+
+    Yields:
+        PageExtraction: page_numbersの順（1ページずつ）
+    """
+    def extract_page(doc, page_num):
+        tables = [table.extract() for table in doc[page_num].find_tables(**(find_tables_settings or {})).tables]
+        return PageExtraction(page_num, tables)
+
+    yield from _cached_pages(
+        pdf_path, "pymupdf", find_tables_settings, page_numbers, extract_page, _pymupdf_open, False, cache
+    )
+
+
+def _cached_pages(pdf_path, engine, settings, page_numbers, extract_page, open_pdf, with_chars, cache):
+    """キャッシュがあればキャッシュ経由、なければPDFを開いて1ページずつ抽出"""
+    if cache is None:
+        cache = get_default_page_cache()
+    if cache is not None:
+        yield from cache.pages(pdf_path, engine, settings, page_numbers, extract_page, open_pdf, with_chars)
+        return
+
+    if page_numbers is None:
+        page_numbers = range(_count_pages(pdf_path))
+    with open_pdf(pdf_path) as pdf:
+        for page_num in page_numbers:
+            yield extract_page(pdf, page_num)
@@ -3,12 +3,15 @@ PyMuPDFを使ってPDFから表データを抽出する（pdfplumberの代替）
 CIDコード問題を解決
 """
 
-import fitz  # PyMuPDF
 import pandas as pd
 from pathlib import Path
 import sys
 import io
 
+# ページ単位の抽出キャッシュ（scripts/extract）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent / 'extract'))
+from pdf_page_cache import cached_pymupdf_pages, pdf_page_count
+
 # UTF-8出力を強制
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -42,9 +45,7 @@ def extract_all_tables_from_pdf(pdf_path, output_path=None):
     print(f"PDF表抽出: {pdf_path.name}")
     print(f"{'='*80}\n")
 
-    # PDFを開く
-    doc = fitz.open(pdf_path)
-    total_pages = len(doc)
+    total_pages = pdf_page_count(pdf_path)
     print(f"総ページ数: {total_pages}")
 
     # 全データを格納するリスト
@@ -52,21 +53,17 @@ def extract_all_tables_from_pdf(pdf_path, output_path=None):
     total_tables = 0
     total_rows = 0
 
-    # 各ページを処理
-    for page_num in range(total_pages):
-        page = doc[page_num]
+    # 各ページを処理（同じPDFのページはPyMuPDFの抽出キャッシュから読み込む）
+    for page in cached_pymupdf_pages(pdf_path):
+        page_num = page.page_num
 
-        # 表を検索
-        table_finder = page.find_tables()
-        tables = table_finder.tables  # TableFinderからテーブルリストを取得
+        # 表データ（page.find_tables() の各表の table.extract()）
+        tables = page.tables
 
         if len(tables) > 0:
             print(f"  ページ {page_num + 1}: {len(tables)}個の表を発見")
 
-            for table_idx, table in enumerate(tables):
-                # 表データを抽出
-                table_data = table.extract()
-
+            for table_idx, table_data in enumerate(tables):
                 if not table_data or len(table_data) < 2:
                     print(f"    表{table_idx + 1}: データなし（スキップ）")
                     continue
@@ -87,8 +84,6 @@ def extract_all_tables_from_pdf(pdf_path, output_path=None):
 
                 print(f"    表{table_idx + 1}: {len(rows)}行 x {len(header)}列")
 
-    doc.close()
-
     if not all_data:
         print("\n⚠ 表が見つかりませんでした")
         return {
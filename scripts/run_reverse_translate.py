@@ -10,6 +10,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from scripts.utils.reverse_translate_excel import create_reverse_translation_excel
+from translation_telemetry import write_run_summary
 
 if __name__ == "__main__":
     print("=" * 80)
@@ -21,11 +22,13 @@ if __name__ == "__main__":
     input_csv = project_root / 'output' / '全言語統合_テンプレート_インポート用.csv'
     output_excel = project_root / 'output' / '逆翻訳_検証結果.xlsx'
 
-    # コマンドライン引数がある場合は上書き
-    if len(sys.argv) > 1:
-        input_csv = Path(sys.argv[1])
-    if len(sys.argv) > 2:
-        output_excel = Path(sys.argv[2])
+    # コマンドライン引数がある場合は上書き（--full: 前回の結果を引き継がずに全セルを翻訳）
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    full = '--full' in sys.argv
+    if len(args) > 0:
+        input_csv = Path(args[0])
+    if len(args) > 1:
+        output_excel = Path(args[1])
 
     print(f"入力CSV: {input_csv}")
     print(f"出力Excel: {output_excel}")
@@ -35,7 +38,8 @@ if __name__ == "__main__":
     result = create_reverse_translation_excel(
         input_csv=str(input_csv),
         output_excel=str(output_excel),
-        verbose=True
+        verbose=True,
+        incremental=not full
     )
 
     print()
@@ -46,4 +50,8 @@ if __name__ == "__main__":
     print(f"出力ファイル: {result['output_excel']}")
     print(f"処理行数: {result['row_count']}行")
     print(f"翻訳した列: {', '.join(result['translated_columns'])}")
+    print(f"翻訳したセル: {result['translated_cells']}、前回の結果を引き継いだセル: {result['reused_cells']}")
     print()
+
+    # 言語ペアごとのリクエスト数・応答時間・再試行などを書き出す
+    write_run_summary()
@@ -3,10 +3,14 @@
 複数のPDF抽出設定を試して最適な設定を見つけるスクリプト
 """
 
-import pdfplumber
 import pandas as pd
 from pathlib import Path
 import os
+import sys
+
+# ページ単位の抽出キャッシュ（scripts/extract）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'extract'))
+from pdf_page_cache import cached_pdfplumber_pages, pdf_page_count
 
 def count_translation_data(df, lang):
     """
@@ -53,27 +57,27 @@ def test_extraction_settings(pdf_path, lang, test_name, table_settings):
 
     all_tables = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        # 最初の5ページだけテスト（高速化のため）
-        test_pages = min(5, len(pdf.pages))
+    # 最初の5ページだけテスト（高速化のため）
+    test_pages = min(5, pdf_page_count(pdf_path))
 
-        for page_num, page in enumerate(pdf.pages[:test_pages], start=1):
-            # 設定を使ってテーブル抽出
-            tables = page.extract_tables(table_settings=table_settings)
+    # 設定を使ってテーブル抽出（同じPDF・同じ設定のページは抽出キャッシュから読み込む）
+    for page in cached_pdfplumber_pages(pdf_path, table_settings, page_numbers=range(test_pages)):
+        page_num = page.page_num + 1
+        tables = page.tables
 
-            if tables:
-                for table_num, table in enumerate(tables, start=1):
-                    if table and len(table) > 0:
-                        # ヘッダー行を取得
-                        headers = [str(h) if h is not None else f"Column_{i}"
-                                   for i, h in enumerate(table[0])]
+        if tables:
+            for table_num, table in enumerate(tables, start=1):
+                if table and len(table) > 0:
+                    # ヘッダー行を取得
+                    headers = [str(h) if h is not None else f"Column_{i}"
+                               for i, h in enumerate(table[0])]
 
-                        # DataFrameに変換
-                        df = pd.DataFrame(table[1:], columns=headers)
-                        df.insert(0, 'Page', page_num)
-                        df.insert(1, 'Table', table_num)
+                    # DataFrameに変換
+                    df = pd.DataFrame(table[1:], columns=headers)
+                    df.insert(0, 'Page', page_num)
+                    df.insert(1, 'Table', table_num)
 
-                        all_tables.append(df)
+                    all_tables.append(df)
 
     if not all_tables:
         return {
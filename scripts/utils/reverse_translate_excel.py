@@ -8,60 +8,32 @@ from pathlib import Path
 from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill
-import time
 from dotenv import load_dotenv
-import requests
-import html
 from typing import Optional, Dict, List
+import sys
+
+# 翻訳モジュール（scripts_google_translation/scripts）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts_google_translation' / 'scripts'))
+from language_codes import get_language_registry
+from translation_client import TranslationClient
+from cell_hashes import CellHashManifest, default_manifest_path
 
 # .envファイルから環境変数を読み込み
 load_dotenv()
 
-
-def translate_with_api_key(texts, source_lang: str, target_lang: str, api_key: str):
-    """
-    Google Translate REST APIを使って翻訳（複数テキスト対応）
-
-    Args:
-        texts: 翻訳するテキスト（文字列またはリスト）
-        source_lang: ソース言語コード
-        target_lang: ターゲット言語コード
-        api_key: Google API キー
-
-    Returns:
-        翻訳結果（文字列またはリスト）
-    """
-    base_url = "https://translation.googleapis.com/language/translate/v2"
-
-    # 単一文字列の場合はリストに変換
-    single_input = isinstance(texts, str)
-    if single_input:
-        texts = [texts]
-
-    params = {
-        "key": api_key,
-        "q": texts,
-        "source": source_lang,
-        "target": target_lang,
-        "format": "text"
-    }
-
-    response = requests.post(base_url, params=params)
-    response.raise_for_status()
-
-    result = response.json()
-    # HTMLエスケープをデコード
-    translations = [html.unescape(t['translatedText']) for t in result['data']['translations']]
-
-    # 単一入力の場合は文字列を返す
-    return translations[0] if single_input else translations
+# columns省略時に逆翻訳する列
+DEFAULT_COLUMNS = ['en', 'fil-PH', 'zh', 'th', 'vi', 'my', 'id', 'km']
 
 
 def create_reverse_translation_excel(
     input_csv: str,
     output_excel: Optional[str] = None,
     columns: Optional[List[str]] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    max_concurrency: int = 8,
+    requests_per_second: float = 10,
+    incremental: bool = True,
+    hash_file: Optional[str] = None
 ) -> Dict:
     """
     CSV → 逆翻訳Excel作成
@@ -71,6 +43,12 @@ def create_reverse_translation_excel(
         output_excel (str): 出力Excelファイルパス（省略時は自動生成）
         columns (List[str]): 逆翻訳する列名のリスト（省略時は全言語列）
         verbose (bool): 進捗表示（デフォルト: True）
+        max_concurrency (int): 同時に送信するリクエスト数の上限（デフォルト: 8）
+        requests_per_second (float): 1秒あたりのリクエスト数上限（デフォルト: 10）
+        incremental (bool): Trueの場合は前回から内容が変わったセル・新しいセルだけを翻訳し、
+            変わっていないセルは前回の逆翻訳結果を引き継ぐ（デフォルト: True）
+        hash_file (str): セルごとの内容ハッシュを保存するファイル
+            （省略時は出力Excelと同じフォルダの「入力CSV名_逆翻訳.cell_hashes.json」）
 
     Returns:
         dict: 処理結果
@@ -78,7 +56,9 @@ def create_reverse_translation_excel(
                 "input_csv": 入力ファイルパス,
                 "output_excel": 出力ファイルパス,
                 "row_count": 行数,
-                "translated_columns": 翻訳した列のリスト
+                "translated_columns": 翻訳した列のリスト,
+                "reused_cells": 前回の結果を引き継いだセル数,
+                "translated_cells": 翻訳したセル数
             }
 
     Raises:
@@ -107,8 +87,7 @@ def create_reverse_translation_excel(
         print()
 
     # Google Translate API初期化
-    api_key = os.getenv('GOOGLE_API_KEY')
-    if not api_key:
+    if not (os.getenv('GOOGLE_API_KEY') or os.getenv('GOOGLE_API_KEYS')):
         raise ValueError(
             "Google API キーが設定されていません。\n"
             ".envファイルに GOOGLE_API_KEY=your_api_key_here を設定してください。"
@@ -128,33 +107,11 @@ def create_reverse_translation_excel(
         print(f"列数: {len(df.columns)}列")
         print()
 
-    # 言語コードと列名のマッピング
-    lang_mapping = {
-        'en': '英語',
-        'fil-PH': 'タガログ語',
-        'zh': '中国語',
-        'th': 'タイ語',
-        'vi': 'ベトナム語',
-        'my': 'ミャンマー語',
-        'id': 'インドネシア語',
-        'km': 'カンボジア語'
-    }
-
-    # Google Translate APIの言語コードマッピング
-    api_lang_codes = {
-        'en': 'en',
-        'fil-PH': 'tl',  # Tagalog
-        'zh': 'zh-CN',   # Chinese (Simplified)
-        'th': 'th',
-        'vi': 'vi',
-        'my': 'my',
-        'id': 'id',
-        'km': 'km'
-    }
+    registry = get_language_registry()
 
     # 翻訳対象の列を決定
     if columns is None:
-        columns = list(lang_mapping.keys())
+        columns = DEFAULT_COLUMNS
 
     # 出力用データフレーム（元のデータをコピー）
     df_output = df.copy()
@@ -162,8 +119,8 @@ def create_reverse_translation_excel(
     if verbose:
         print("翻訳対象の列:")
         for col_code in columns:
-            if col_code in lang_mapping:
-                print(f"  {col_code:10s} → {lang_mapping[col_code]}")
+            if col_code in registry:
+                print(f"  {col_code:10s} → {registry.name(col_code)}")
         print()
 
     # 各言語列を日本語に逆翻訳
@@ -175,16 +132,18 @@ def create_reverse_translation_excel(
 
     translated_columns = []
 
+    # 翻訳対象のテキストを列ごとに収集（重複除去）
+    column_texts = {}
     for col_code in columns:
         if col_code not in df.columns:
             if verbose:
                 print(f"警告: 列 '{col_code}' が見つかりません。スキップします。")
             continue
 
-        lang_name = lang_mapping.get(col_code, col_code)
+        lang_name = registry.name(col_code)
 
         if verbose:
-            print(f"処理中: {lang_name} ({col_code})")
+            print(f"対象: {lang_name} ({col_code})")
 
         # 翻訳対象のテキストを取得（空欄を除く）
         translations = df[col_code].dropna().tolist()
@@ -198,51 +157,45 @@ def create_reverse_translation_excel(
         if len(translations) == 0:
             if verbose:
                 print(f"  スキップ: 翻訳対象なし")
-                print()
             continue
 
-        # 逆翻訳結果を格納
-        reverse_translations = {}
-
-        # バッチ処理（API制限対策）
-        batch_size = 20
-        total_batches = (len(translations) + batch_size - 1) // batch_size
+        column_texts[col_code] = list(dict.fromkeys(translations))
 
-        for batch_idx in range(total_batches):
-            start_idx = batch_idx * batch_size
-            end_idx = min((batch_idx + 1) * batch_size, len(translations))
-            batch = translations[start_idx:end_idx]
+    # 前回の実行から内容が変わったセルだけを翻訳対象にする
+    manifest = CellHashManifest.load(hash_file or default_manifest_path(input_path, output_excel))
+    if not incremental:
+        manifest.entries = {}
+    plan = manifest.plan(
+        df, list(column_texts), {c: registry.api_code(c) for c in column_texts}, 'ja'
+    )
+    if verbose:
+        print()
+        print(f"差分翻訳: 変更・追加 {plan.pending_cells}セル、前回の結果を引き継ぎ {plan.reused_cells}セル")
 
-            if verbose:
-                print(f"  バッチ {batch_idx + 1}/{total_batches}: {len(batch)}件")
-
-            try:
-                # Google Translate API で翻訳
-                source_lang = api_lang_codes[col_code]
-
-                # 未翻訳のテキストのみを抽出
-                texts_to_translate = [t for t in batch if t not in reverse_translations]
-
-                if len(texts_to_translate) > 0:
-                    # REST APIで翻訳（APIキー使用・バッチ処理）
-                    translated_texts = translate_with_api_key(
-                        texts_to_translate,
-                        source_lang=source_lang,
-                        target_lang='ja',
-                        api_key=api_key
-                    )
-                    # 結果を辞書に格納
-                    for original, translated in zip(texts_to_translate, translated_texts):
-                        reverse_translations[original] = translated
-
-                # API制限対策（1秒待機）
-                if batch_idx < total_batches - 1:
-                    time.sleep(1)
-
-            except Exception as e:
-                if verbose:
-                    print(f"  エラー: {e}")
-                    print(f"  バッチ {batch_idx + 1} をスキップします")
+    # 全言語・全バッチを並列に翻訳（トークンバケットでリクエスト数を制限）
+    # 失敗したバッチは原文のまま残す
+    if verbose:
+        print()
+        print(f"並列翻訳中: {len(column_texts)}言語（同時 {max_concurrency}件、{requests_per_second}リクエスト/秒まで）")
+
+    client = TranslationClient(max_concurrency=max_concurrency, requests_per_second=requests_per_second)
+    column_results = client.translate_columns(
+        {
+            col_code: (plan.pending[col_code], registry.api_code(col_code), 'ja')
+            for col_code in column_texts
+        },
+        raise_on_error=False
+    )
+
+    for col_code, texts in column_texts.items():
+        # 逆翻訳結果を格納（HTMLエスケープは翻訳クライアントがデコード済み）
+        translated_now = {
+            original: translated
+            for original, translated in zip(plan.pending[col_code], column_results[col_code])
+            if translated is not None
+        }
+        manifest.update(plan, col_code, translated_now)
+        reverse_translations = {**plan.reused[col_code], **translated_now}
 
         # 逆翻訳結果をデータフレームに適用
         df_output[col_code] = df[col_code].apply(
@@ -252,8 +205,10 @@ def create_reverse_translation_excel(
         translated_columns.append(col_code)
 
         if verbose:
-            print(f"  完了: {len(reverse_translations)}件の逆翻訳")
-            print()
+            print(f"  完了: {registry.name(col_code)} ({col_code}) {len(reverse_translations)}/{len(texts)}件の逆翻訳")
+
+    if verbose:
+        print()
 
     if verbose:
         print("=" * 80)
@@ -309,6 +264,9 @@ def create_reverse_translation_excel(
 
     wb.save(output_excel)
 
+    # Excelの保存に成功してからハッシュを保存（途中で失敗した場合は次回も同じセルを翻訳する）
+    manifest.save()
+
     if verbose:
         print()
         print(f"保存: {output_excel}")
@@ -321,7 +279,9 @@ def create_reverse_translation_excel(
         "input_csv": str(input_path),
         "output_excel": str(output_excel),
         "row_count": len(df),
-        "translated_columns": translated_columns
+        "translated_columns": translated_columns,
+        "reused_cells": plan.reused_cells,
+        "translated_cells": plan.pending_cells
     }
 
 
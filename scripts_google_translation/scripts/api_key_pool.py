@@ -0,0 +1,356 @@
+"""
+複数の認証情報（APIキー・サービスアカウント）を使い分けるキープール
+キーごとに直近1分間のリクエスト数・文字数を記録し、余裕（クォータの残り）が最も大きいキーに送る。
+403/429を返したキーはクールダウン状態にして、その間は他のキーを使う
+（403で他に使えるキーがない場合は、同じキーのクールダウンを待たずにすぐエラーにする）
+
+設定（環境変数）:
+    GOOGLE_API_KEYS: APIキー（カンマ区切り、省略時は GOOGLE_API_KEY の1件）
+    GOOGLE_APPLICATION_CREDENTIALS_POOL: サービスアカウントJSONのパス（os.pathsep区切り、Windowsは ";"）
+    TRANSLATION_KEY_REQUESTS_PER_MINUTE: 1キーあたりの1分間のリクエスト数上限（省略時は無制限）
+    TRANSLATION_KEY_CHARS_PER_MINUTE: 1キーあたりの1分間の文字数上限（省略時は無制限）
+    TRANSLATION_KEY_COOLDOWN_SEC: 403を返したキーを使わない秒数（デフォルト: 60）
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, TypeVar
+
+from http_client import backoff_delay
+from translation_telemetry import get_default_telemetry
+
+
+# クールダウンの対象にするステータスコード（403: クォータ超過・キー無効、429: レート制限）
+COOLDOWN_STATUS_CODES = {403, 429}
+
+# 403を返したキーのクールダウン秒数
+DEFAULT_COOLDOWN_SEC = 60.0
+
+# 1件のリクエストでキーを切り替えて試す回数の上限
+DEFAULT_MAX_ATTEMPTS = 6
+
+# 利用量を数える期間（秒）
+_WINDOW_SEC = 60.0
+
+T = TypeVar("T")
+
+
+class KeyRejectedError(Exception):
+    """キーがクォータ超過・レート制限などで拒否された（別のキーで再試行できる）"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None, message: str = ""):
+        super().__init__(message or f"APIエラー: ステータスコード {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ApiCredential:
+    """
+    1つの認証情報（APIキーまたはサービスアカウント）とその利用状況
+
+    例:
+        credential = ApiCredential("key-1", api_key="AIza...", requests_per_minute=600)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api_key: Optional[str] = None,
+        service_account_file: Optional[str] = None,
+        requests_per_minute: Optional[float] = None,
+        chars_per_minute: Optional[float] = None
+    ):
+        """
+        Args:
+            name (str): 表示用の名前（キー本体はログに出さない）
+            api_key (str): APIキー（REST API用）
+            service_account_file (str): サービスアカウントJSONのパス（Client Library用）
+            requests_per_minute (float): 1分間のリクエスト数上限（Noneで無制限）
+            chars_per_minute (float): 1分間の文字数上限（Noneで無制限）
+        """
+        self.name = name
+        self.api_key = api_key
+        self.service_account_file = service_account_file
+        self.requests_per_minute = requests_per_minute
+        self.chars_per_minute = chars_per_minute
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.failures = 0
+        self.total_requests = 0
+        self.total_chars = 0
+        self.rejected_count = 0
+        # 直近1分間の送信記録: (送信時刻, 文字数)
+        self._recent: deque[tuple[float, int]] = deque()
+        self._client = None
+
+    @property
+    def client(self):
+        """Client Library（translate_v2.Client）のクライアント（初回アクセス時に作成）"""
+        if self._client is None:
+            from google.cloud import translate_v2 as translate
+            if self.service_account_file:
+                self._client = translate.Client.from_service_account_json(self.service_account_file)
+            else:
+                self._client = translate.Client()
+        return self._client
+
+    def _prune(self, now: float) -> None:
+        """1分より前の送信記録を削除"""
+        while self._recent and self._recent[0][0] <= now - _WINDOW_SEC:
+            self._recent.popleft()
+
+    def headroom(self, chars: int, now: float) -> float:
+        """
+        クォータの残りの割合（0〜1、リクエスト数・文字数の小さい方、送信中の分を含む）
+
+        Args:
+            chars (int): これから送る文字数
+            now (float): 現在時刻（time.monotonic()）
+
+        Returns:
+            float: 残りの割合（このリクエストを送ると上限を超える場合は負の値）
+        """
+        self._prune(now)
+        ratios = [1.0]
+        if self.requests_per_minute:
+            ratios.append(1 - (len(self._recent) + self.in_flight + 1) / self.requests_per_minute)
+        if self.chars_per_minute:
+            used = sum(c for _, c in self._recent)
+            ratios.append(1 - (used + chars) / self.chars_per_minute)
+        return min(ratios)
+
+    def next_available(self, now: float) -> float:
+        """クールダウン終了・送信記録の期限切れで次に余裕ができる時刻"""
+        if self.cooldown_until > now:
+            return self.cooldown_until
+        if self._recent:
+            return self._recent[0][0] + _WINDOW_SEC
+        return now
+
+
+class ApiKeyPool:
+    """
+    認証情報のプール（スレッドセーフ、並列翻訳から共有して使う）
+
+    例:
+        pool = ApiKeyPool([ApiCredential("key-1", api_key="..."), ApiCredential("key-2", api_key="...")])
+        result = pool.execute(len(text), lambda credential: send(text, credential.api_key))
+    """
+
+    def __init__(self, credentials: list[ApiCredential], cooldown_sec: float = DEFAULT_COOLDOWN_SEC):
+        """
+        Args:
+            credentials (list[ApiCredential]): 認証情報のリスト
+            cooldown_sec (float): 403を返したキーを使わない秒数
+
+        Raises:
+            ValueError: 認証情報が1件もない場合
+        """
+        if not credentials:
+            raise ValueError(
+                "翻訳APIの認証情報が設定されていません。"
+                ".envファイルに GOOGLE_API_KEY または GOOGLE_API_KEYS を設定してください。"
+            )
+        self.credentials = credentials
+        self.cooldown_sec = cooldown_sec
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def acquire(self, chars: int = 0) -> ApiCredential:
+        """
+        余裕が最も大きい認証情報を取得（全キーがクールダウン中・上限到達の場合は空くまで待つ）
+
+        取得した認証情報は送信後に必ずrelease()で返す。
+
+        Args:
+            chars (int): これから送る文字数
+
+        Returns:
+            ApiCredential: 送信に使う認証情報
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                available = [c for c in self.credentials if c.cooldown_until <= now]
+                if available:
+                    # 余裕が同じ場合は送信中の件数が少ないキーを優先
+                    best = max(available, key=lambda c: (c.headroom(chars, now), -c.in_flight))
+                    # 1分間の上限が1件分より小さい設定でも止まらないように、送信記録が空なら送る
+                    if best.headroom(chars, now) >= 0 or not best._recent:
+                        best.in_flight += 1
+                        return best
+                wait = min(c.next_available(now) for c in self.credentials) - now
+                self._condition.wait(timeout=max(0.01, wait))
+
+    def release(self, credential: ApiCredential, chars: int = 0, status_code: Optional[int] = None,
+                retry_after: Optional[float] = None) -> None:
+        """
+        送信を終えた認証情報を返す（403/429の場合はクールダウンにする）
+
+        Args:
+            credential (ApiCredential): acquire()で取得した認証情報
+            chars (int): 送信した文字数
+            status_code (int): 拒否された場合のステータスコード（成功時はNone）
+            retry_after (float): Retry-Afterヘッダーの秒数
+        """
+        with self._condition:
+            now = time.monotonic()
+            credential.in_flight -= 1
+            credential._recent.append((now, chars))
+            credential.total_requests += 1
+            if status_code in COOLDOWN_STATUS_CODES:
+                credential.failures += 1
+                credential.rejected_count += 1
+                if retry_after is not None:
+                    cooldown = retry_after
+                elif status_code == 429:
+                    # 連続して429を返すキーほど長く休ませる
+                    cooldown = backoff_delay(credential.failures - 1, maximum=self.cooldown_sec)
+                else:
+                    cooldown = self.cooldown_sec
+                credential.cooldown_until = now + cooldown
+                print(f"  [WARNING] {credential.name}: ステータスコード {status_code}、{cooldown:.1f}秒間使用を停止します")
+            else:
+                credential.failures = 0
+                credential.total_chars += chars
+            self._condition.notify_all()
+
+    def has_other_available(self, credential: ApiCredential) -> bool:
+        """
+        指定した認証情報以外に、クールダウン中でない認証情報があるか
+
+        Args:
+            credential (ApiCredential): 除外する認証情報
+
+        Returns:
+            bool: 他に今すぐ使える認証情報がある場合はTrue
+        """
+        with self._condition:
+            now = time.monotonic()
+            return any(c is not credential and c.cooldown_until <= now for c in self.credentials)
+
+    def execute(self, chars: int, send: Callable[[ApiCredential], T],
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> T:
+        """
+        認証情報を選んでsendを実行し、拒否された場合は別の認証情報で再試行
+
+        sendはKeyRejectedError、またはstatus_code / code属性が403・429の例外
+        （Client Libraryの例外）を送出すると拒否として扱われる。
+        403（APIの無効化・請求・1日のクォータなど、待っても解消しないことが多い）の場合は、
+        他に使えるキーがなければ再試行せずにすぐ送出する。429は空いたキーで再試行する。
+
+        Args:
+            chars (int): 送信する文字数
+            send (Callable): 認証情報を受け取って送信する関数
+            max_attempts (int): 最大試行回数
+
+        Returns:
+            sendの戻り値
+
+        Raises:
+            KeyRejectedError: 最大試行回数まで拒否された場合、または403で他に使えるキーがない場合
+            Exception: sendが送出したその他の例外
+        """
+        for attempt in range(max_attempts):
+            credential = self.acquire(chars)
+            try:
+                result = send(credential)
+            except Exception as e:
+                status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+                if status_code not in COOLDOWN_STATUS_CODES:
+                    self.release(credential, chars)
+                    raise
+                self.release(credential, chars, status_code, getattr(e, "retry_after", None))
+                if attempt + 1 >= max_attempts:
+                    raise
+                # 403を返したキーのクールダウンを待っても解消しないため、他のキーがなければ諦める
+                if status_code == 403 and not self.has_other_available(credential):
+                    raise
+                telemetry = get_default_telemetry()
+                if telemetry is not None:
+                    telemetry.record_retry(status_code)
+                continue
+            self.release(credential, chars)
+            return result
+
+    def stats(self) -> list[dict]:
+        """
+        認証情報ごとの利用状況を取得
+
+        Returns:
+            list[dict]: [{"name", "requests", "chars", "rejected", "cooling_down"}, ...]
+        """
+        now = time.monotonic()
+        with self._condition:
+            return [
+                {
+                    "name": c.name,
+                    "requests": c.total_requests,
+                    "chars": c.total_chars,
+                    "rejected": c.rejected_count,
+                    "cooling_down": c.cooldown_until > now
+                }
+                for c in self.credentials
+            ]
+
+
+def _env_float(name: str) -> Optional[float]:
+    """数値の環境変数を取得（未設定の場合はNone）"""
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def load_credentials_from_env() -> list[ApiCredential]:
+    """
+    環境変数からAPIキー・サービスアカウントの認証情報を読み込む
+
+    Returns:
+        list[ApiCredential]: 認証情報のリスト（APIキー → サービスアカウントの順）
+    """
+    requests_per_minute = _env_float("TRANSLATION_KEY_REQUESTS_PER_MINUTE")
+    chars_per_minute = _env_float("TRANSLATION_KEY_CHARS_PER_MINUTE")
+
+    keys = [k.strip() for k in os.getenv("GOOGLE_API_KEYS", "").split(",") if k.strip()]
+    if not keys and os.getenv("GOOGLE_API_KEY"):
+        keys = [os.getenv("GOOGLE_API_KEY")]
+    credentials = [
+        ApiCredential(f"APIキー{i}", api_key=key,
+                      requests_per_minute=requests_per_minute, chars_per_minute=chars_per_minute)
+        for i, key in enumerate(dict.fromkeys(keys), 1)
+    ]
+
+    paths = [p.strip() for p in os.getenv("GOOGLE_APPLICATION_CREDENTIALS_POOL", "").split(os.pathsep) if p.strip()]
+    credentials.extend(
+        ApiCredential(f"サービスアカウント{i}（{os.path.basename(path)}）", service_account_file=path,
+                      requests_per_minute=requests_per_minute, chars_per_minute=chars_per_minute)
+        for i, path in enumerate(paths, 1)
+    )
+    return credentials
+
+
+_default_pools: dict[str, Optional[ApiKeyPool]] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_pool(kind: str = "api_key") -> Optional[ApiKeyPool]:
+    """
+    環境変数の設定から共有のキープールを取得（初回呼び出し時に作成）
+
+    Args:
+        kind (str): "api_key"（REST API用のAPIキー）または "service_account"（Client Library用）
+
+    Returns:
+        ApiKeyPool: キープール（該当する認証情報がない場合はNone）
+    """
+    with _default_lock:
+        if kind not in _default_pools:
+            credentials = [
+                c for c in load_credentials_from_env()
+                if (c.api_key if kind == "api_key" else c.service_account_file)
+            ]
+            cooldown_sec = _env_float("TRANSLATION_KEY_COOLDOWN_SEC") or DEFAULT_COOLDOWN_SEC
+            _default_pools[kind] = ApiKeyPool(credentials, cooldown_sec) if credentials else None
+    return _default_pools[kind]
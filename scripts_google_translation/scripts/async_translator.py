@@ -0,0 +1,257 @@
+"""
+asyncioによる並列翻訳エンジン
+複数言語・複数チャンクのリクエストを同時にN件まで送信し、
+トークンバケットで「リクエスト数/秒」と「文字数/分」を制限する
+"""
+import asyncio
+import time
+from typing import Callable, Hashable, Optional
+
+import translator
+from char_budget import BudgetExceededError
+from run_journal import RunJournal
+from translation_telemetry import get_default_telemetry
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレートリミッター
+
+    rate（トークン/秒）で補充され、最大capacityまで貯まる。
+    acquire(n) はn個のトークンが貯まるまで待機してから消費する。
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate (float): 1秒あたりの補充量
+            capacity (float): バケットの容量（バースト上限）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        トークンを消費（足りない場合は補充されるまで待機）
+
+        Args:
+            tokens (float): 消費するトークン数（容量を超える場合は容量に丸める）
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class AsyncTranslationEngine:
+    """
+    並列翻訳エンジン
+
+    例:
+        engine = AsyncTranslationEngine(max_concurrency=8, requests_per_second=10)
+        results = asyncio.run(engine.translate(["犬", "猫"], "ja", "en"))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_second: Optional[float] = 10.0,
+        chars_per_minute: Optional[float] = None,
+        use_cache: bool = True,
+        use_glossary: bool = True,
+        request_func: Optional[Callable[[list[str], Optional[str], str], list[str]]] = None,
+        journal: Optional[RunJournal] = None
+    ):
+        """
+        Args:
+            max_concurrency (int): 同時に送信するリクエスト数の上限
+            requests_per_second (float): 1秒あたりのリクエスト数上限（Noneで無制限）
+            chars_per_minute (float): 1分あたりの文字数上限（Noneで無制限）
+            use_cache (bool): 翻訳キャッシュを使うか
+            use_glossary (bool): 用語集（テンプレートの訳語）を使うか
+            request_func (Callable): 1チャンクを翻訳する関数（デフォルト: translator._request_chunk）
+            journal (RunJournal): 完了したチャンクを記録するジャーナル（再開用）
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.chars_per_minute = chars_per_minute
+        self.use_cache = use_cache
+        self.use_glossary = use_glossary
+        self.request_func = request_func or translator._request_chunk
+        self.journal = journal
+        # asyncioのオブジェクトはイベントループごとに作り直す
+        self._loop = None
+        self._semaphore = None
+        self._request_bucket = None
+        self._char_bucket = None
+
+    def _setup(self) -> None:
+        """実行中のイベントループ用にセマフォとトークンバケットを作成"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._request_bucket = (
+            TokenBucket(self.requests_per_second, max(1.0, self.requests_per_second))
+            if self.requests_per_second else None
+        )
+        self._char_bucket = (
+            TokenBucket(self.chars_per_minute / 60, max(self.chars_per_minute, translator.MAX_CHARS_PER_REQUEST))
+            if self.chars_per_minute else None
+        )
+
+    async def _send_chunk(self, chunk: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        """
+        レート制限・同時実行数制限を守って1チャンクを送信
+
+        完了したチャンクはすぐにキャッシュ・翻訳メモリ・ジャーナルに保存する（途中停止しても失われない）
+        """
+        if self._request_bucket:
+            await self._request_bucket.acquire(1)
+        if self._char_bucket:
+            await self._char_bucket.acquire(sum(len(w) for w in chunk))
+        async with self._semaphore:
+            # requestsはブロッキングなのでスレッドで実行
+            outcome = await asyncio.to_thread(self.request_func, chunk, source_lang, target_lang)
+
+        translator.store_translations(chunk, outcome, source_lang, target_lang, self.use_cache)
+        if self.journal:
+            self.journal.record(chunk, outcome, source_lang, target_lang)
+        return outcome
+
+    async def translate(
+        self,
+        words: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        raise_on_error: bool = True
+    ) -> list[Optional[str]]:
+        """
+        1言語ペア分の単語リストを翻訳（チャンクは並列に送信）
+
+        Args:
+            words (list[str]): 翻訳する単語のリスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出）
+            target_lang (str): ターゲット言語コード
+            raise_on_error (bool): Falseの場合、失敗したチャンクの結果をNoneにして続行
+
+        Returns:
+            list[Optional[str]]: 入力と同じ順番の翻訳結果
+
+        Raises:
+            BudgetExceededError: 文字数の上限（TRANSLATION_CHAR_BUDGET）を超える場合（raise_on_errorに関係なく送出）
+        """
+        self._setup()
+        if not words:
+            return []
+
+        # 用語集・キャッシュにあるものはAPIに送らない
+        results, provenance = translator.lookup_local(
+            words, source_lang, target_lang, self.use_glossary, self.use_cache
+        )
+        telemetry = get_default_telemetry()
+        if telemetry is not None:
+            telemetry.record_lookup(source_lang, target_lang, provenance)
+
+        # ジャーナルに記録済み（前回の実行で完了済み）のものを再利用
+        if self.journal:
+            pending = [w for w, r in zip(words, results) if r is None]
+            replayed = {
+                translator.normalize_text(w): t
+                for w, t in zip(pending, self.journal.get_many(pending, source_lang, target_lang)) if t is not None
+            }
+            results = [
+                r if r is not None else replayed.get(translator.normalize_text(w)) for w, r in zip(words, results)
+            ]
+
+        misses = translator.unique_misses(words, results)
+        if not misses:
+            return results
+
+        chunks = translator.chunk_segments(misses)
+        outcomes = await asyncio.gather(
+            *(self._send_chunk(chunk, source_lang, target_lang) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        translated_map = {}
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                # 文字数の上限到達は個別の失敗ではないため、raise_on_error=Falseでも中止する
+                if raise_on_error or isinstance(outcome, BudgetExceededError):
+                    raise outcome
+                print(f"  [ERROR] {source_lang} → {target_lang}: {len(chunk)}件の翻訳に失敗: {outcome}")
+                continue
+            translated_map.update((translator.normalize_text(w), t) for w, t in zip(chunk, outcome))
+
+        return [r if r is not None else translated_map.get(translator.normalize_text(w)) for w, r in zip(words, results)]
+
+    async def translate_columns(
+        self,
+        jobs: dict[Hashable, tuple[list[str], Optional[str], str]],
+        raise_on_error: bool = True
+    ) -> dict[Hashable, list[Optional[str]]]:
+        """
+        複数の列（言語ペア）をまとめて並列に翻訳
+
+        Args:
+            jobs (dict): {キー: (単語リスト, ソース言語, ターゲット言語)}
+            raise_on_error (bool): Falseの場合、失敗したチャンクの結果をNoneにして続行
+
+        Returns:
+            dict: {キー: 翻訳結果のリスト（入力順）}
+        """
+        self._setup()
+        keys = list(jobs.keys())
+        outcomes = await asyncio.gather(
+            *(self.translate(*jobs[key], raise_on_error=raise_on_error) for key in keys)
+        )
+        return dict(zip(keys, outcomes))
+
+
+def translate_columns(
+    jobs: dict[Hashable, tuple[list[str], Optional[str], str]],
+    max_concurrency: int = 8,
+    requests_per_second: Optional[float] = 10.0,
+    chars_per_minute: Optional[float] = None,
+    raise_on_error: bool = True,
+    journal: Optional[RunJournal] = None
+) -> dict[Hashable, list[Optional[str]]]:
+    """
+    複数の列（言語ペア）を並列に翻訳する同期ラッパー
+
+    Args:
+        jobs (dict): {キー: (単語リスト, ソース言語, ターゲット言語)}
+        max_concurrency (int): 同時に送信するリクエスト数の上限
+        requests_per_second (float): 1秒あたりのリクエスト数上限（Noneで無制限）
+        chars_per_minute (float): 1分あたりの文字数上限（Noneで無制限）
+        raise_on_error (bool): Falseの場合、失敗したチャンクの結果をNoneにして続行
+        journal (RunJournal): 完了したチャンクを記録するジャーナル（再開用）
+
+    Returns:
+        dict: {キー: 翻訳結果のリスト（入力順）}
+
+    例:
+        results = translate_columns({
+            "en": (["dog", "cat"], "en", "ja"),
+            "vi": (["chó", "mèo"], "vi", "ja"),
+        })
+        print(results["en"])
+    """
+    engine = AsyncTranslationEngine(
+        max_concurrency=max_concurrency,
+        requests_per_second=requests_per_second,
+        chars_per_minute=chars_per_minute,
+        journal=journal
+    )
+    return asyncio.run(engine.translate_columns(jobs, raise_on_error=raise_on_error))
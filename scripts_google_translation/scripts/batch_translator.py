@@ -4,16 +4,259 @@ CSV/Excelファイルからの一括翻訳スクリプト
 複数ファイルの一括処理に対応
 """
 import csv
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Union
-from translator import round_trip_translate_batch
+from typing import Callable, Optional, List, Dict, Union, Iterable, Iterator, TextIO
+from translator import round_trip_translate_batch, get_cache_stats
+from translation_planner import round_trip_translate_planned
+from async_translator import AsyncTranslationEngine
+from char_budget import BudgetExceededError
+from run_journal import RunJournal
+from cost_estimator import estimate_round_trip, print_estimate
+from xlsx_header import read_xlsx_header, SheetNotFoundError
+from translation_telemetry import get_default_telemetry
+
+
+# ストリーミングモードで1回に翻訳する件数（メモリ使用量はこの件数分で一定）
+STREAM_WINDOW_SIZE = 1000
+
+# 列構造チェックでヘッダー行を並列に読み込むスレッド数
+STRUCTURE_CHECK_WORKERS = 8
+
+# 複数ファイル翻訳で入力ファイルを並列に読み込むワーカー数
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# 読み込み済みのヘッダー行（(パス, 更新日時, サイズ, 種類, オプション) -> 列名）
+_HEADER_CACHE: Dict[tuple, Optional[List[str]]] = {}
+
+# 出力CSVの列名
+OUTPUT_FIELDNAMES = [
+    "元の日本語",
+    "中間言語",
+    "中間言語の翻訳",
+    "日本語への逆翻訳",
+    "完全一致"
+]
+
+
+def _iter_csv_words(input_path: Path, column_index: int, encoding: str) -> Iterator[str]:
+    """
+    CSVファイルの指定列を1行ずつ読み込む（空のセルは飛ばす）
+
+    Args:
+        input_path (Path): 入力CSVファイルのパス
+        column_index (int): 読み込む列のインデックス
+        encoding (str): ファイルのエンコーディング
+
+    Yields:
+        str: セルの値（前後の空白を除去）
+    """
+    with open(input_path, 'r', encoding=encoding, newline='') as f:
+        for row in csv.reader(f):
+            if len(row) > column_index and row[column_index].strip():
+                yield row[column_index].strip()
+
+
+def _iter_excel_words(input_path: Path, column_index: int, sheet_name: Optional[str]) -> Iterator[str]:
+    """
+    Excelファイルの指定列を1行ずつ読み込む（read_onlyモード、空のセルは飛ばす）
+
+    Args:
+        input_path (Path): 入力Excelファイルのパス
+        column_index (int): 読み込む列のインデックス
+        sheet_name (str): シート名（省略時は最初のシート）
+
+    Yields:
+        str: セルの値（前後の空白を除去）
+
+    Raises:
+        ValueError: シートが見つからない場合
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        if sheet_name:
+            if sheet_name not in wb.sheetnames:
+                raise ValueError(f"シート '{sheet_name}' が見つかりません。利用可能なシート: {wb.sheetnames}")
+            ws = wb[sheet_name]
+        else:
+            ws = wb.active
+
+        for row in ws.iter_rows(values_only=True):
+            if row and len(row) > column_index and row[column_index]:
+                word = str(row[column_index]).strip()
+                if word:
+                    yield word
+    finally:
+        wb.close()
+
+
+def _read_csv_words(file_path: str, column_index: int, encoding: str) -> List[str]:
+    """CSVファイルの指定列を読み込む（並列読み込み用、プロセスプールに渡せるようにモジュールの関数にする）"""
+    return list(_iter_csv_words(Path(file_path), column_index, encoding))
+
+
+def _read_excel_words(file_path: str, column_index: int, sheet_name: Optional[str]) -> List[str]:
+    """Excelファイルの指定列を読み込む（並列読み込み用、プロセスプールに渡せるようにモジュールの関数にする）"""
+    return list(_iter_excel_words(Path(file_path), column_index, sheet_name))
+
+
+def _output_row(result: Dict, file_name: Optional[str] = None) -> Dict:
+    """往復翻訳の結果1件を出力CSVの行に変換（file_name指定時はファイル名列を追加）"""
+    row = {
+        "元の日本語": result["original"],
+        "中間言語": result["intermediate_lang"],
+        "中間言語の翻訳": result["intermediate_text"],
+        "日本語への逆翻訳": result["back_translation"],
+        "完全一致": result["is_perfect_match"]
+    }
+    if file_name is not None:
+        row = {"ファイル名": file_name, **row}
+    return row
+
+
+def _stream_round_trip(
+    words: Iterable[str],
+    f: TextIO,
+    writer: csv.DictWriter,
+    intermediate_lang: str,
+    window_size: int = STREAM_WINDOW_SIZE,
+    file_name: Optional[str] = None
+) -> tuple[int, int]:
+    """
+    単語をwindow_size件ずつ往復翻訳し、完了した分から出力CSVに書き出す
+
+    全件をメモリに保持しないため、入力の大きさに関係なくメモリ使用量は一定。
+    途中で停止しても、それまでに完了した分は出力ファイルに残る。
+
+    Args:
+        words (Iterable[str]): 翻訳する単語（ジェネレーターでよい）
+        f (TextIO): 出力ファイル（1ウィンドウごとにflushする）
+        writer (csv.DictWriter): 出力CSVのライター
+        intermediate_lang (str): 中間言語コード
+        window_size (int): 1回に翻訳する件数
+        file_name (str): ファイル名列に書き込む値（複数ファイル出力の場合）
+
+    Returns:
+        tuple: (処理件数, 完全一致件数)
+    """
+    total_count = 0
+    perfect_match_count = 0
+    words = iter(words)
+    while True:
+        window = list(islice(words, window_size))
+        if not window:
+            break
+        results = round_trip_translate_batch(window, intermediate_lang)
+        for result in results:
+            writer.writerow(_output_row(result, file_name))
+        f.flush()
+
+        total_count += len(results)
+        perfect_match_count += sum(1 for r in results if r["is_perfect_match"])
+        print(f"  [STREAM] {total_count}件完了")
+    return total_count, perfect_match_count
+
+
+def _read_header_cached(file_path: str, key: tuple, read_header) -> Optional[List[str]]:
+    """
+    ヘッダー行を読み込む（同じ内容のファイルは再度開かない）
+
+    キャッシュのキーにはファイルの更新日時・サイズを含めるため、
+    ファイルが変更された場合は読み直す。
+    """
+    stat = Path(file_path).stat()
+    cache_key = (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size) + key
+    if cache_key not in _HEADER_CACHE:
+        _HEADER_CACHE[cache_key] = read_header(file_path)
+    return _HEADER_CACHE[cache_key]
+
+
+def _check_structure(file_paths: List[str], read_header, cache_key: tuple) -> Dict:
+    """
+    ヘッダー行を並列に読み込んで列構造が一致しているかチェック（CSV/Excel共通）
+
+    Args:
+        file_paths (List[str]): チェックするファイルパスのリスト
+        read_header (Callable): ファイルパスを受け取りヘッダー行（空の場合はNone）を返す関数
+        cache_key (tuple): ヘッダーキャッシュのキー（エンコーディング・シート名など）
+
+    Returns:
+        dict: チェック結果（check_csv_structureと同じ形式）
+    """
+    if not file_paths:
+        raise ValueError("ファイルパスのリストが空です")
+
+    for file_path in file_paths:
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+
+    def read_one(file_path: str):
+        try:
+            return _read_header_cached(file_path, cache_key, read_header), None
+        except SheetNotFoundError as e:
+            return None, e
+
+    # ヘッダー行だけをスレッドプールで並列に読み込む
+    with ThreadPoolExecutor(max_workers=min(STRUCTURE_CHECK_WORKERS, len(file_paths))) as pool:
+        headers = list(pool.map(read_one, file_paths))
+
+    # 最初のファイルを基準とする
+    base_columns, base_error = headers[0]
+    if base_error is not None:
+        raise base_error
+    if base_columns is None:
+        raise ValueError(f"ファイルが空です: {file_paths[0]}")
+
+    results = {
+        "is_valid": True,
+        "column_names": base_columns,
+        "column_count": len(base_columns),
+        "files": [],
+        "error_files": []
+    }
+
+    # 全ファイルをチェック
+    for file_path, (columns, error) in zip(file_paths, headers):
+        if columns is None:
+            results["is_valid"] = False
+            results["error_files"].append(str(file_path))
+            results["files"].append({
+                "path": str(file_path),
+                "column_names": [],
+                "column_count": 0,
+                "is_match": False
+            })
+            continue
+
+        is_match = (columns == results["column_names"])
+        results["files"].append({
+            "path": str(file_path),
+            "column_names": columns,
+            "column_count": len(columns),
+            "is_match": is_match
+        })
+
+        if not is_match:
+            results["is_valid"] = False
+            results["error_files"].append(str(file_path))
+
+    return results
 
 
 def check_csv_structure(file_paths: List[str], encoding: str = "utf-8-sig") -> Dict:
     """
     複数のCSVファイルの列構造が一致しているかチェック
 
+    各ファイルのヘッダー行（1行目）だけを並列に読み込む。
+
     Args:
         file_paths (List[str]): チェックするCSVファイルパスのリスト
         encoding (str): ファイルのエンコーディング（デフォルト: "utf-8-sig"）
@@ -39,71 +282,19 @@ def check_csv_structure(file_paths: List[str], encoding: str = "utf-8-sig") -> D
     Raises:
         FileNotFoundError: ファイルが見つからない場合
     """
-    if not file_paths:
-        raise ValueError("ファイルパスのリストが空です")
-
-    results = {
-        "is_valid": True,
-        "column_names": None,
-        "column_count": 0,
-        "files": [],
-        "error_files": []
-    }
-
-    # 最初のファイルを基準とする
-    base_file = Path(file_paths[0])
-    if not base_file.exists():
-        raise FileNotFoundError(f"ファイルが見つかりません: {file_paths[0]}")
-
-    with open(base_file, 'r', encoding=encoding, newline='') as f:
-        reader = csv.reader(f)
-        try:
-            base_columns = next(reader)
-            results["column_names"] = base_columns
-            results["column_count"] = len(base_columns)
-        except StopIteration:
-            raise ValueError(f"ファイルが空です: {file_paths[0]}")
+    def read_header(file_path: str) -> Optional[List[str]]:
+        with open(file_path, 'r', encoding=encoding, newline='') as f:
+            return next(csv.reader(f), None)
 
-    # 全ファイルをチェック
-    for file_path in file_paths:
-        file = Path(file_path)
-        if not file.exists():
-            raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-
-        with open(file, 'r', encoding=encoding, newline='') as f:
-            reader = csv.reader(f)
-            try:
-                columns = next(reader)
-                is_match = (columns == results["column_names"])
-
-                file_info = {
-                    "path": str(file_path),
-                    "column_names": columns,
-                    "column_count": len(columns),
-                    "is_match": is_match
-                }
-                results["files"].append(file_info)
-
-                if not is_match:
-                    results["is_valid"] = False
-                    results["error_files"].append(str(file_path))
-            except StopIteration:
-                results["is_valid"] = False
-                results["error_files"].append(str(file_path))
-                results["files"].append({
-                    "path": str(file_path),
-                    "column_names": [],
-                    "column_count": 0,
-                    "is_match": False
-                })
-
-    return results
+    return _check_structure(file_paths, read_header, ("csv", encoding))
 
 
 def check_excel_structure(file_paths: List[str], sheet_name: Optional[str] = None) -> Dict:
     """
     複数のExcelファイルの列構造が一致しているかチェック
 
+    ブック全体は読み込まず、シートXMLから1行目だけを並列に読み込む（xlsx_header）。
+
     Args:
         file_paths (List[str]): チェックするExcelファイルパスのリスト
         sheet_name (str): チェックするシート名（省略時は最初のシート）
@@ -116,100 +307,82 @@ def check_excel_structure(file_paths: List[str], sheet_name: Optional[str] = Non
         ImportError: openpyxlがインストールされていない場合
     """
     try:
-        from openpyxl import load_workbook
+        import openpyxl  # noqa: F401
     except ImportError:
         raise ImportError("openpyxlがインストールされていません。'pip install openpyxl'を実行してください。")
 
-    if not file_paths:
-        raise ValueError("ファイルパスのリストが空です")
+    return _check_structure(
+        file_paths,
+        lambda file_path: read_xlsx_header(file_path, sheet_name),
+        ("excel", sheet_name)
+    )
+
+
+def _round_trip_to_csv(
+    words: Iterable[str],
+    input_path: Path,
+    output_file: Path,
+    column_index: int,
+    intermediate_lang: str,
+    stream: bool,
+    window_size: int
+) -> dict:
+    """
+    単一ファイルの単語を往復翻訳して出力CSVに書き出す（translate_from_csv/excelの共通処理）
 
-    results = {
-        "is_valid": True,
-        "column_names": None,
-        "column_count": 0,
-        "files": [],
-        "error_files": []
-    }
+    Args:
+        words (Iterable[str]): 翻訳する単語
+        input_path (Path): 入力ファイルのパス
+        output_file (Path): 出力CSVファイルのパス
+        column_index (int): 翻訳する列のインデックス（エラーメッセージ用）
+        intermediate_lang (str): 中間言語コード
+        stream (bool): Trueの場合はwindow_size件ずつ翻訳して逐次書き出す
+        window_size (int): ストリーミングモードで1回に翻訳する件数
 
-    # 最初のファイルを基準とする
-    base_file = Path(file_paths[0])
-    if not base_file.exists():
-        raise FileNotFoundError(f"ファイルが見つかりません: {file_paths[0]}")
-
-    wb = load_workbook(base_file, read_only=True, data_only=True)
-    if sheet_name:
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"シート '{sheet_name}' が見つかりません。利用可能なシート: {wb.sheetnames}")
-        ws = wb[sheet_name]
+    Returns:
+        dict: 処理結果の情報（translate_from_csvと同じ形式）
+    """
+    if stream:
+        print(f"[INFO] ストリーミング翻訳実行中: 日本語 → {intermediate_lang} → 日本語（{window_size}件ずつ）")
+        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDNAMES)
+            writer.writeheader()
+            total_count, perfect_match_count = _stream_round_trip(
+                words, f, writer, intermediate_lang, window_size
+            )
+        if total_count == 0:
+            raise ValueError(f"列インデックス {column_index} にデータが見つかりません")
     else:
-        ws = wb.active
-
-    # ヘッダー行を取得
-    base_columns = None
-    for row in ws.iter_rows(values_only=True, max_row=1):
-        base_columns = [str(cell) if cell is not None else "" for cell in row]
-        break
-    wb.close()
-
-    if base_columns is None:
-        raise ValueError(f"ファイルが空です: {file_paths[0]}")
-
-    results["column_names"] = base_columns
-    results["column_count"] = len(base_columns)
+        words = list(words)
+        if not words:
+            raise ValueError(f"列インデックス {column_index} にデータが見つかりません")
 
-    # 全ファイルをチェック
-    for file_path in file_paths:
-        file = Path(file_path)
-        if not file.exists():
-            raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+        print(f"[INFO] 読み込み完了: {len(words)}件")
+        print(f"[INFO] 翻訳実行中: 日本語 → {intermediate_lang} → 日本語")
 
-        wb = load_workbook(file, read_only=True, data_only=True)
-        if sheet_name:
-            if sheet_name not in wb.sheetnames:
-                results["is_valid"] = False
-                results["error_files"].append(str(file_path))
-                results["files"].append({
-                    "path": str(file_path),
-                    "column_names": [],
-                    "column_count": 0,
-                    "is_match": False
-                })
-                wb.close()
-                continue
-            ws = wb[sheet_name]
-        else:
-            ws = wb.active
+        # 往復翻訳を実行
+        results = round_trip_translate_batch(words, intermediate_lang)
 
-        columns = None
-        for row in ws.iter_rows(values_only=True, max_row=1):
-            columns = [str(cell) if cell is not None else "" for cell in row]
-            break
-        wb.close()
+        # CSV出力
+        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDNAMES)
+            writer.writeheader()
+            for result in results:
+                writer.writerow(_output_row(result))
 
-        if columns is None:
-            results["is_valid"] = False
-            results["error_files"].append(str(file_path))
-            results["files"].append({
-                "path": str(file_path),
-                "column_names": [],
-                "column_count": 0,
-                "is_match": False
-            })
-        else:
-            is_match = (columns == results["column_names"])
-            file_info = {
-                "path": str(file_path),
-                "column_names": columns,
-                "column_count": len(columns),
-                "is_match": is_match
-            }
-            results["files"].append(file_info)
+        total_count = len(results)
+        perfect_match_count = sum(1 for r in results if r["is_perfect_match"])
 
-            if not is_match:
-                results["is_valid"] = False
-                results["error_files"].append(str(file_path))
+    # 統計情報を計算
+    perfect_match_rate = (perfect_match_count / total_count * 100) if total_count > 0 else 0
 
-    return results
+    return {
+        "input_file": str(input_path),
+        "output_file": str(output_file),
+        "total_count": total_count,
+        "perfect_match_count": perfect_match_count,
+        "perfect_match_rate": perfect_match_rate
+    }
 
 
 def translate_from_csv(
@@ -217,7 +390,9 @@ def translate_from_csv(
     output_file: Optional[str] = None,
     column_index: int = 0,
     intermediate_lang: str = "en",
-    encoding: str = "utf-8-sig"
+    encoding: str = "utf-8-sig",
+    stream: bool = False,
+    window_size: int = STREAM_WINDOW_SIZE
 ) -> dict:
     """
     CSVファイルから単語を読み込んで往復翻訳を実行
@@ -228,6 +403,9 @@ def translate_from_csv(
         column_index (int): 翻訳する列のインデックス（0始まり、デフォルト: 0）
         intermediate_lang (str): 中間言語コード（デフォルト: "en"）
         encoding (str): 入力ファイルのエンコーディング（デフォルト: "utf-8-sig"）
+        stream (bool): Trueの場合は1行ずつ読み込み、window_size件ずつ翻訳して逐次書き出す
+            （大きなファイルでもメモリ使用量が一定、途中で停止しても完了分は出力に残る）
+        window_size (int): ストリーミングモードで1回に翻訳する件数（デフォルト: 1000）
 
     Returns:
         dict: 処理結果の情報
@@ -256,56 +434,10 @@ def translate_from_csv(
         output_file = Path(output_file)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # CSVファイルから単語を読み込み
-    words = []
-    with open(input_path, 'r', encoding=encoding, newline='') as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if len(row) > column_index and row[column_index].strip():
-                words.append(row[column_index].strip())
-
-    if not words:
-        raise ValueError(f"列インデックス {column_index} にデータが見つかりません")
-
-    print(f"[INFO] 読み込み完了: {len(words)}件")
-    print(f"[INFO] 翻訳実行中: 日本語 → {intermediate_lang} → 日本語")
-
-    # 往復翻訳を実行
-    results = round_trip_translate_batch(words, intermediate_lang)
-
-    # 統計情報を計算
-    perfect_match_count = sum(1 for r in results if r["is_perfect_match"])
-    total_count = len(results)
-    perfect_match_rate = (perfect_match_count / total_count * 100) if total_count > 0 else 0
-
-    # CSV出力
-    with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-        fieldnames = [
-            "元の日本語",
-            "中間言語",
-            "中間言語の翻訳",
-            "日本語への逆翻訳",
-            "完全一致"
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for result in results:
-            writer.writerow({
-                "元の日本語": result["original"],
-                "中間言語": result["intermediate_lang"],
-                "中間言語の翻訳": result["intermediate_text"],
-                "日本語への逆翻訳": result["back_translation"],
-                "完全一致": result["is_perfect_match"]
-            })
-
-    return {
-        "input_file": str(input_path),
-        "output_file": str(output_file),
-        "total_count": total_count,
-        "perfect_match_count": perfect_match_count,
-        "perfect_match_rate": perfect_match_rate
-    }
+    return _round_trip_to_csv(
+        _iter_csv_words(input_path, column_index, encoding),
+        input_path, output_file, column_index, intermediate_lang, stream, window_size
+    )
 
 
 def translate_from_excel(
@@ -313,7 +445,9 @@ def translate_from_excel(
     output_file: Optional[str] = None,
     column_index: int = 0,
     intermediate_lang: str = "en",
-    sheet_name: Optional[str] = None
+    sheet_name: Optional[str] = None,
+    stream: bool = False,
+    window_size: int = STREAM_WINDOW_SIZE
 ) -> dict:
     """
     Excelファイルから単語を読み込んで往復翻訳を実行
@@ -324,6 +458,9 @@ def translate_from_excel(
         column_index (int): 翻訳する列のインデックス（0始まり、デフォルト: 0）
         intermediate_lang (str): 中間言語コード（デフォルト: "en"）
         sheet_name (str): シート名（省略時は最初のシート）
+        stream (bool): Trueの場合は1行ずつ読み込み（read_onlyのiter_rows）、
+            window_size件ずつ翻訳して逐次書き出す
+        window_size (int): ストリーミングモードで1回に翻訳する件数（デフォルト: 1000）
 
     Returns:
         dict: 処理結果の情報
@@ -332,7 +469,7 @@ def translate_from_excel(
         Exception: ファイル読み込みエラー、翻訳エラー
     """
     try:
-        from openpyxl import load_workbook
+        import openpyxl  # noqa: F401
     except ImportError:
         raise ImportError("openpyxlがインストールされていません。'pip install openpyxl'を実行してください。")
 
@@ -350,66 +487,513 @@ def translate_from_excel(
         output_file = Path(output_file)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Excelファイルから単語を読み込み
-    wb = load_workbook(input_path, read_only=True, data_only=True)
-    if sheet_name:
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"シート '{sheet_name}' が見つかりません。利用可能なシート: {wb.sheetnames}")
-        ws = wb[sheet_name]
-    else:
-        ws = wb.active
+    return _round_trip_to_csv(
+        _iter_excel_words(input_path, column_index, sheet_name),
+        input_path, output_file, column_index, intermediate_lang, stream, window_size
+    )
 
-    words = []
-    for row in ws.iter_rows(values_only=True):
-        if row and len(row) > column_index and row[column_index]:
-            word = str(row[column_index]).strip()
-            if word:
-                words.append(word)
 
-    wb.close()
+def _parse_files(
+    file_paths: List[str],
+    read_words: Callable[[str], List[str]],
+    use_processes: bool,
+    workers: int = PARSE_WORKERS
+) -> Iterator[tuple]:
+    """
+    入力ファイルを並列に読み込み、読み込みが終わった順に返す
 
-    if not words:
-        raise ValueError(f"列インデックス {column_index} にデータが見つかりません")
+    Excel（openpyxl）の解析はCPU処理のためプロセスプール、CSVはスレッドプールで読み込む。
 
-    print(f"[INFO] 読み込み完了: {len(words)}件")
-    print(f"[INFO] 翻訳実行中: 日本語 → {intermediate_lang} → 日本語")
+    Args:
+        file_paths (List[str]): 入力ファイルパスのリスト
+        read_words (Callable): ファイルパスを受け取り単語リストを返す関数（プロセスプールの場合はpickle可能なもの）
+        use_processes (bool): Trueの場合はプロセスプールで読み込む
+        workers (int): 同時に読み込むファイル数
 
-    # 往復翻訳を実行
-    results = round_trip_translate_batch(words, intermediate_lang)
+    Yields:
+        tuple: (入力順のインデックス, ファイルパス, 単語リスト または 読み込み時の例外)
+    """
+    executor_class = ProcessPoolExecutor if use_processes and len(file_paths) > 1 else ThreadPoolExecutor
+    with executor_class(max_workers=max(1, min(workers, len(file_paths)))) as executor:
+        futures = {executor.submit(read_words, path): (i, path) for i, path in enumerate(file_paths)}
+        for future in as_completed(futures):
+            index, path = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = e
+            yield index, path, outcome
+
+
+def _accept_parsed(
+    index: int,
+    file_path: str,
+    outcome: Union[List[str], Exception],
+    total_files: int,
+    column_index: int,
+    result_data: Dict
+) -> Optional[List[str]]:
+    """
+    読み込み結果を表示し、エラー・データなしのファイルを処理結果に記録
 
-    # 統計情報を計算
-    perfect_match_count = sum(1 for r in results if r["is_perfect_match"])
-    total_count = len(results)
-    perfect_match_rate = (perfect_match_count / total_count * 100) if total_count > 0 else 0
+    Returns:
+        List[str]: 翻訳する単語リスト（エラー・データなしの場合はNone）
+    """
+    print(f"\n[{index + 1}/{total_files}] {Path(file_path).name}")
+    if isinstance(outcome, Exception):
+        result_data["error_count"] += 1
+        result_data["errors"].append({"file": file_path, "error": str(outcome)})
+        print(f"  [ERROR] {outcome}")
+        return None
+    if not outcome:
+        print(f"  [WARNING] 列インデックス {column_index} にデータが見つかりません")
+        return None
+    print(f"  読み込み: {len(outcome)}件")
+    return outcome
+
+
+def _load_files(
+    file_paths: List[str],
+    read_words: Callable[[str], List[str]],
+    use_processes: bool,
+    column_index: int,
+    result_data: Dict,
+    workers: int = PARSE_WORKERS
+) -> List[tuple]:
+    """
+    全ファイルを並列に読み込む（見積もり用）
+
+    Returns:
+        List[tuple]: 入力順の (ファイルパス, 単語リスト) のリスト（エラー・データなしのファイルを除く）
+    """
+    print(f"\n[INFO] {len(file_paths)}件のファイルを読み込み中...")
+    loaded = {}
+    for index, file_path, outcome in _parse_files(file_paths, read_words, use_processes, workers):
+        words = _accept_parsed(index, file_path, outcome, len(file_paths), column_index, result_data)
+        if words is not None:
+            loaded[index] = (file_path, words)
+    return [loaded[i] for i in sorted(loaded)]
+
+
+def _merge_dedup_report(total: Optional[Dict], report: Dict) -> Dict:
+    """往路・復路ごとの重複除去の集計を足し合わせる"""
+    if total is None:
+        return report
+    return {
+        direction: {key: total[direction][key] + value for key, value in report[direction].items()}
+        for direction in report
+    }
+
+
+def _round_trip_loaded_files(
+    loaded_files: List[tuple],
+    intermediate_lang: str,
+    result_data: Dict,
+    engine: Optional[AsyncTranslationEngine] = None
+) -> Optional[List[List[Dict]]]:
+    """
+    読み込み済みのファイルの往復翻訳をまとめて実行し、ファイルごとの結果に戻す
+
+    同時に渡したファイル間で重複する単語は1回だけ翻訳する（translation_planner）。
+    以前のグループで翻訳した単語は翻訳キャッシュで再利用される。
+    result_dataの統計情報（件数・エラー・重複除去の集計）を更新する。
+    翻訳に失敗したチャンクがあっても、エラーにするのはそのテキストを含むファイルだけ。
+
+    Args:
+        loaded_files (List[tuple]): (ファイルパス, 単語リスト) のリスト
+        intermediate_lang (str): 中間言語コード
+        result_data (Dict): 更新する処理結果
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン（同時実行数・レート制限の設定）
+
+    Returns:
+        List[List[Dict]]: loaded_filesと同じ順のファイルごとの翻訳結果（翻訳に失敗したファイルはNone）
+
+    Raises:
+        BudgetExceededError: 文字数の上限を超える場合（このグループのファイルはエラーとして記録済み）
+    """
+    total_words = sum(len(words) for _, words in loaded_files)
+    print(f"\n[INFO] 翻訳実行中: 日本語 → {intermediate_lang} → 日本語（{len(loaded_files)}ファイル、{total_words}件）")
+
+    try:
+        results_per_file, plan_report = round_trip_translate_planned(
+            [words for _, words in loaded_files], intermediate_lang, engine, raise_on_error=False
+        )
+    except Exception as e:
+        # 文字数の上限到達・チャンク以外の失敗の場合はこのグループの全ファイルをエラーとする
+        for file_path, _ in loaded_files:
+            result_data["error_count"] += 1
+            result_data["errors"].append({"file": file_path, "error": str(e)})
+        print(f"  [ERROR] {e}")
+        if isinstance(e, BudgetExceededError):
+            raise
+        return [None] * len(loaded_files)
+
+    result_data["dedup_report"] = _merge_dedup_report(result_data["dedup_report"], plan_report)
+    saved_calls = plan_report["forward"]["saved_calls"] + plan_report["backward"]["saved_calls"]
+    saved_segments = plan_report["forward"]["saved_segments"] + plan_report["backward"]["saved_segments"]
+    print(f"  重複除去: {saved_segments}件のテキスト、{saved_calls}回のAPI呼び出しを削減")
+
+    outcomes = []
+    for (file_path, _), results in zip(loaded_files, results_per_file):
+        # 失敗したチャンクのテキストを含むファイルだけをエラーとする
+        failed = sum(1 for r in results if r["back_translation"] is None)
+        if failed:
+            error = f"{failed}件のテキストの翻訳に失敗しました"
+            result_data["error_count"] += 1
+            result_data["errors"].append({"file": file_path, "error": error})
+            print(f"  [ERROR] {Path(file_path).name}: {error}")
+            outcomes.append(None)
+            continue
+
+        # 統計情報を更新
+        perfect_matches = sum(1 for r in results if r["is_perfect_match"])
+        result_data["total_count"] += len(results)
+        result_data["perfect_match_count"] += perfect_matches
+        result_data["success_count"] += 1
+
+        print(f"  {Path(file_path).name}: {len(results)}件翻訳、完全一致率 {perfect_matches / len(results) * 100:.1f}%")
+        outcomes.append(results)
+
+    return outcomes
+
+
+class _MultiFileWriter:
+    """
+    複数ファイル翻訳の書き出しステージ（別スレッドで実行）
+
+    翻訳が終わったファイルから順にファイルごとのCSVを書き出し、
+    まとめた出力CSVには入力順に追記する（前のファイルの翻訳が終わるまで後のファイルは待たせる）。
+    """
+
+    def __init__(self, file_paths: List[str], output_file: Path, per_file_dir: Optional[Path]):
+        """
+        Args:
+            file_paths (List[str]): 入力ファイルパスのリスト（入力順）
+            output_file (Path): まとめた出力CSVのパス
+            per_file_dir (Path): ファイルごとの出力CSVのフォルダ（Noneの場合は書き出さない）
+        """
+        self.file_paths = file_paths
+        self.output_file = output_file
+        self.per_file_dir = per_file_dir
+        self.per_file_outputs: List[str] = []
+        self.written = False
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, index: int, results: Optional[List[Dict]]) -> None:
+        """
+        1ファイルの結果を書き出しステージに渡す（全ファイルについて1回ずつ呼ぶ）
+
+        Args:
+            index (int): 入力順のインデックス
+            results (List[Dict]): 往復翻訳の結果（エラー・データなしのファイルはNone）
+        """
+        self._queue.put((index, results))
+
+    def close(self) -> None:
+        """書き出しの完了を待つ（書き出し中のエラーはここで送出）"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _write_per_file(self, file_path: str, results: List[Dict]) -> None:
+        path = self.per_file_dir / f"{Path(file_path).stem}_translated.csv"
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDNAMES)
+            writer.writeheader()
+            for result in results:
+                writer.writerow(_output_row(result))
+        self.per_file_outputs.append(str(path))
+
+    def _run(self) -> None:
+        pending: Dict[int, Optional[List[Dict]]] = {}
+        next_index = 0
+        combined = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                index, results = item
+                if results and self.per_file_dir is not None:
+                    self._write_per_file(self.file_paths[index], results)
+
+                # まとめた出力には入力順に追記
+                pending[index] = results
+                while next_index in pending:
+                    results = pending.pop(next_index)
+                    if results:
+                        if combined is None:
+                            f = open(self.output_file, 'w', encoding='utf-8-sig', newline='')
+                            combined = (f, csv.DictWriter(f, fieldnames=["ファイル名"] + OUTPUT_FIELDNAMES))
+                            combined[1].writeheader()
+                        file_name = Path(self.file_paths[next_index]).name
+                        for result in results:
+                            combined[1].writerow(_output_row(result, file_name))
+                        combined[0].flush()
+                        self.written = True
+                    next_index += 1
+        except BaseException as e:
+            self._error = e
+            # 残りの結果を受け取り続けて、翻訳ステージが止まらないようにする
+            while self._queue.get() is not None:
+                pass
+        finally:
+            if combined is not None:
+                combined[0].close()
+
+
+def _pipeline_multiple_files(
+    file_paths: List[str],
+    read_words: Callable[[str], List[str]],
+    use_processes: bool,
+    column_index: int,
+    output_file: Path,
+    intermediate_lang: str,
+    result_data: Dict,
+    journal_file: Optional[str] = None,
+    resume: bool = False,
+    engine: Optional[AsyncTranslationEngine] = None,
+    per_file_dir: Optional[Path] = None,
+    workers: int = PARSE_WORKERS
+) -> bool:
+    """
+    複数ファイルを「読み込み → 翻訳 → 書き出し」のパイプラインで処理
+
+    読み込みはプロセス/スレッドプールで並列に行い、翻訳ステージは読み込み済みのファイルを
+    まとめて取り出して（ファイル間で重複除去して）翻訳する。翻訳中も次のファイルの読み込みと
+    前のファイルの書き出しは進むため、全体の時間はおおよそ最も遅いステージの時間になる。
+    文字数の上限（TRANSLATION_CHAR_BUDGET）に達した場合は、それまでに翻訳したファイルを書き出して
+    残りのファイルを処理せずに終了する（残りのファイルはエラーとして記録する）。
+
+    Args:
+        file_paths (List[str]): 入力ファイルパスのリスト
+        read_words (Callable): ファイルパスを受け取り単語リストを返す関数
+        use_processes (bool): Trueの場合はプロセスプールで読み込む
+        column_index (int): 翻訳する列のインデックス（メッセージ用）
+        output_file (Path): まとめた出力CSVのパス
+        intermediate_lang (str): 中間言語コード
+        result_data (Dict): 更新する処理結果
+        journal_file (str): 完了したチャンクを記録するジャーナルのパス（省略時は記録しない）
+        resume (bool): Trueの場合はジャーナルの完了済みチャンクを再利用して再開
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン
+        per_file_dir (Path): ファイルごとの出力CSVのフォルダ（Noneの場合は書き出さない）
+        workers (int): 同時に読み込むファイル数
+
+    Returns:
+        bool: まとめた出力CSVを書き出したか
+    """
+    if journal_file:
+        journal = RunJournal(journal_file, resume=resume)
+        if engine is None:
+            engine = AsyncTranslationEngine()
+        engine.journal = journal
+        if resume:
+            print(f"[INFO] ジャーナルから再開: 完了済み {journal.chunk_count}チャンク（{journal_file}）")
+
+    if per_file_dir is not None:
+        per_file_dir.mkdir(parents=True, exist_ok=True)
+
+    # 読み込みステージ: 読み込みが終わったファイルをキューに入れる
+    parsed: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def parse_stage():
+        try:
+            for item in _parse_files(file_paths, read_words, use_processes, workers):
+                if stop.is_set():
+                    break
+                parsed.put(item)
+        except BaseException as e:
+            # プールの起動に失敗した場合など、未読み込みのファイルはすべてエラーにする
+            parsed.put(e)
+        finally:
+            parsed.put(None)
+
+    print(f"\n[INFO] {len(file_paths)}件のファイルを読み込み・翻訳中...")
+    parser = threading.Thread(target=parse_stage, daemon=True)
+    parser.start()
+    writer = _MultiFileWriter(file_paths, output_file, per_file_dir)
+    writer.start()
+
+    # 翻訳ステージ: 読み込み済みのファイルをまとめて取り出して翻訳し、書き出しステージに渡す
+    received = set()
+    finished = False
+    while not finished:
+        items = [parsed.get()]
+        while True:
+            try:
+                items.append(parsed.get_nowait())
+            except queue.Empty:
+                break
+
+        group = []
+        for item in items:
+            if item is None:
+                finished = True
+                continue
+            if isinstance(item, BaseException):
+                for index, file_path in enumerate(file_paths):
+                    if index not in received:
+                        received.add(index)
+                        _accept_parsed(index, file_path, item, len(file_paths), column_index, result_data)
+                        writer.put(index, None)
+                continue
+            index, file_path, outcome = item
+            received.add(index)
+            words = _accept_parsed(index, file_path, outcome, len(file_paths), column_index, result_data)
+            if words is None:
+                writer.put(index, None)
+            else:
+                group.append((index, file_path, words))
+
+        if group:
+            try:
+                results_per_file = _round_trip_loaded_files(
+                    [(file_path, words) for _, file_path, words in group], intermediate_lang, result_data, engine
+                )
+            except BudgetExceededError as e:
+                # 文字数の上限: 読み込みを止め、未処理のファイルをエラーとして記録して終了
+                stop.set()
+                for index, _, _ in group:
+                    writer.put(index, None)
+                for index, file_path in enumerate(file_paths):
+                    if index not in received:
+                        received.add(index)
+                        result_data["error_count"] += 1
+                        result_data["errors"].append({"file": file_path, "error": str(e)})
+                        writer.put(index, None)
+                print(f"[INFO] 文字数の上限に達したため、残りのファイルは処理しません")
+                break
+            for (index, _, _), results in zip(group, results_per_file):
+                writer.put(index, results)
+
+    writer.close()
+    parser.join()
+    result_data["per_file_outputs"] = writer.per_file_outputs
+    return writer.written
+
+
+def _finish_multiple(result_data: Dict, output_file: Path, written: bool) -> Dict:
+    """
+    複数ファイル翻訳の完全一致率・キャッシュ統計・計測値を集計して結果を表示
+
+    Args:
+        result_data (Dict): 更新する処理結果
+        output_file (Path): 出力CSVファイルのパス
+        written (bool): 出力ファイルを書き出したか
+
+    Returns:
+        Dict: 更新した処理結果
+    """
+    # 完全一致率を計算
+    if result_data["total_count"] > 0:
+        result_data["perfect_match_rate"] = (
+            result_data["perfect_match_count"] / result_data["total_count"] * 100
+        )
+
+    if written:
+        print(f"\n[INFO] 出力完了: {output_file}")
+        print(f"  総件数: {result_data['total_count']}件")
+        print(f"  完全一致率: {result_data['perfect_match_rate']:.1f}%")
+    if result_data.get("per_file_outputs"):
+        print(f"  ファイルごとの出力: {len(result_data['per_file_outputs'])}件（{Path(result_data['per_file_outputs'][0]).parent}）")
+
+    # キャッシュ統計
+    result_data["cache_stats"] = get_cache_stats()
+    if result_data["cache_stats"]:
+        stats = result_data["cache_stats"]
+        print(f"  キャッシュ: ヒット {stats['hits']}件 / ミス {stats['misses']}件（ヒット率 {stats['hit_rate']:.1f}%）")
+
+    # 言語ペアごとのリクエスト数・応答時間・再試行など（書き出しは呼び出し側の実行の最後に行う）
+    telemetry = get_default_telemetry()
+    result_data["telemetry"] = telemetry.summary() if telemetry is not None else None
+
+    return result_data
 
-    # CSV出力
+
+def _estimate_loaded_files(
+    loaded_files: List[tuple],
+    intermediate_lang: str,
+    result_data: Dict,
+    engine: Optional[AsyncTranslationEngine] = None
+) -> Dict:
+    """
+    読み込み済みの全ファイルの往復翻訳を見積もる（ドライラン、APIには接続しない）
+
+    Args:
+        loaded_files (List[tuple]): (ファイルパス, 単語リスト) のリスト
+        intermediate_lang (str): 中間言語コード
+        result_data (Dict): 更新する処理結果
+        engine (AsyncTranslationEngine): 実行時に使う翻訳エンジン（レート制限の設定を見積もりに使う）
+
+    Returns:
+        Dict: 見積もり結果を "estimate" に追加した処理結果
+    """
+    all_words = [word for _, words in loaded_files for word in words]
+    report = estimate_round_trip(all_words, intermediate_lang, engine)
+    print_estimate(report)
+
+    result_data["output_file"] = None
+    result_data["total_count"] = len(all_words)
+    result_data["success_count"] = len(loaded_files)
+    result_data["cache_stats"] = get_cache_stats()
+    result_data["estimate"] = report
+    return result_data
+
+
+def _stream_multiple_files(
+    file_paths: List[str],
+    iter_words,
+    output_file: Path,
+    intermediate_lang: str,
+    result_data: Dict,
+    window_size: int
+) -> None:
+    """
+    複数ファイルを1件ずつストリーミング翻訳し、1つの出力CSVに逐次書き出す
+
+    ファイル間の重複除去は行わない（重複した単語は翻訳キャッシュで再利用される）。
+
+    Args:
+        file_paths (List[str]): 入力ファイルパスのリスト
+        iter_words (Callable): ファイルパスを受け取り単語のイテレーターを返す関数
+        output_file (Path): 出力CSVファイルのパス
+        intermediate_lang (str): 中間言語コード
+        result_data (Dict): 更新する処理結果
+        window_size (int): 1回に翻訳する件数
+    """
+    print(f"\n[INFO] ストリーミング翻訳実行中: 日本語 → {intermediate_lang} → 日本語（{window_size}件ずつ）")
     with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-        fieldnames = [
-            "元の日本語",
-            "中間言語",
-            "中間言語の翻訳",
-            "日本語への逆翻訳",
-            "完全一致"
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=["ファイル名"] + OUTPUT_FIELDNAMES)
         writer.writeheader()
 
-        for result in results:
-            writer.writerow({
-                "元の日本語": result["original"],
-                "中間言語": result["intermediate_lang"],
-                "中間言語の翻訳": result["intermediate_text"],
-                "日本語への逆翻訳": result["back_translation"],
-                "完全一致": result["is_perfect_match"]
-            })
+        for i, file_path in enumerate(file_paths, 1):
+            file_name = Path(file_path).name
+            print(f"\n[{i}/{len(file_paths)}] {file_name}")
+            try:
+                total_count, perfect_matches = _stream_round_trip(
+                    iter_words(file_path), f, writer, intermediate_lang, window_size, file_name
+                )
+            except Exception as e:
+                result_data["error_count"] += 1
+                result_data["errors"].append({"file": file_path, "error": str(e)})
+                print(f"  [ERROR] {e}")
+                continue
 
-    return {
-        "input_file": str(input_path),
-        "output_file": str(output_file),
-        "total_count": total_count,
-        "perfect_match_count": perfect_match_count,
-        "perfect_match_rate": perfect_match_rate
-    }
+            if total_count == 0:
+                print(f"  [WARNING] データが見つかりません")
+                continue
+
+            result_data["total_count"] += total_count
+            result_data["perfect_match_count"] += perfect_matches
+            result_data["success_count"] += 1
+            print(f"  {file_name}: {total_count}件翻訳、完全一致率 {perfect_matches / total_count * 100:.1f}%")
 
 
 def translate_from_multiple_csv(
@@ -418,11 +1002,22 @@ def translate_from_multiple_csv(
     column_index: int = 0,
     intermediate_lang: str = "en",
     encoding: str = "utf-8-sig",
-    check_structure: bool = True
+    check_structure: bool = True,
+    journal_file: Optional[str] = None,
+    resume: bool = False,
+    engine: Optional[AsyncTranslationEngine] = None,
+    stream: bool = False,
+    window_size: int = STREAM_WINDOW_SIZE,
+    dry_run: bool = False,
+    per_file_outputs: bool = True,
+    parse_workers: int = PARSE_WORKERS
 ) -> Dict:
     """
     複数のCSVファイルを一括で翻訳し、1つのCSVファイルにまとめて出力
 
+    ファイルの読み込み・翻訳・書き出しは並行して進む（読み込み済みのファイルから翻訳を始め、
+    翻訳が終わったファイルから書き出す）。まとめた出力CSVの行は入力ファイルの順になる。
+
     Args:
         file_paths (List[str]): 入力CSVファイルパスのリスト
         output_file (str): 出力CSVファイルのパス（省略時は自動生成）
@@ -430,6 +1025,17 @@ def translate_from_multiple_csv(
         intermediate_lang (str): 中間言語コード（デフォルト: "en"）
         encoding (str): 入力ファイルのエンコーディング（デフォルト: "utf-8-sig"）
         check_structure (bool): 列構造チェックを実行するか（デフォルト: True）
+        journal_file (str): 完了したチャンクを記録するジャーナルのパス（省略時は記録しない）
+        resume (bool): Trueの場合はジャーナルの完了済みチャンクを再利用し、残りだけを翻訳
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン（省略時はデフォルト設定）
+        stream (bool): Trueの場合はファイルを1件ずつ読み込み、window_size件ずつ翻訳して逐次書き出す
+            （メモリ使用量が一定になる代わりに、ファイル間の重複除去・ジャーナルは使用しない）
+        window_size (int): ストリーミングモードで1回に翻訳する件数（デフォルト: 1000）
+        dry_run (bool): Trueの場合は翻訳せず、課金文字数・リクエスト数・所要時間の見積もりだけを行う
+            （APIには接続しない、出力ファイルも作成しない）
+        per_file_outputs (bool): Trueの場合はまとめた出力に加えて、ファイルごとの出力CSVを
+            「出力ファイル名のフォルダ/入力ファイル名_translated.csv」に書き出す（デフォルト: True）
+        parse_workers (int): 同時に読み込むファイル数（デフォルト: CPU数、最大4）
 
     Returns:
         dict: 処理結果
@@ -442,7 +1048,12 @@ def translate_from_multiple_csv(
                 "perfect_match_rate": 完全一致率,
                 "success_count": 成功ファイル数,
                 "error_count": エラーファイル数,
-                "errors": エラー情報のリスト
+                "errors": エラー情報のリスト,
+                "dedup_report": 重複除去の集計（往路・復路ごと）,
+                "cache_stats": 翻訳キャッシュの統計（キャッシュ無効時はNone）,
+                "telemetry": 言語ペアごとの計測値（translation_telemetry、無効時はNone）,
+                "per_file_outputs": ファイルごとの出力CSVのパスのリスト（per_file_outputs=Trueの場合）,
+                "estimate": 見積もり結果（dry_run=Trueの場合のみ）
             }
 
     Raises:
@@ -460,7 +1071,8 @@ def translate_from_multiple_csv(
         "perfect_match_rate": 0.0,
         "success_count": 0,
         "error_count": 0,
-        "errors": []
+        "errors": [],
+        "dedup_report": None
     }
 
     # 列構造チェック
@@ -495,90 +1107,26 @@ def translate_from_multiple_csv(
 
     result_data["output_file"] = str(output_file)
 
-    # 全翻訳結果を収集
-    all_results = []
-
-    # 各ファイルを翻訳
-    print(f"\n[INFO] {len(file_paths)}件のファイルを翻訳中...")
-    for i, file_path in enumerate(file_paths, 1):
-        print(f"\n[{i}/{len(file_paths)}] {Path(file_path).name}")
-        try:
-            # ファイルから単語を読み込み
-            file = Path(file_path)
-            words = []
-            with open(file, 'r', encoding=encoding, newline='') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) > column_index and row[column_index].strip():
-                        words.append(row[column_index].strip())
-
-            if not words:
-                print(f"  [WARNING] 列インデックス {column_index} にデータが見つかりません")
-                continue
-
-            print(f"  読み込み: {len(words)}件")
-            print(f"  翻訳実行中: 日本語 → {intermediate_lang} → 日本語")
-
-            # 往復翻訳を実行
-            results = round_trip_translate_batch(words, intermediate_lang)
-
-            # ファイル名を追加
-            for result in results:
-                result["file_name"] = file.name
-                all_results.append(result)
-
-            # 統計情報を更新
-            perfect_matches = sum(1 for r in results if r["is_perfect_match"])
-            result_data["total_count"] += len(results)
-            result_data["perfect_match_count"] += perfect_matches
-            result_data["success_count"] += 1
-
-            print(f"  完了: {len(results)}件翻訳、完全一致率 {perfect_matches / len(results) * 100:.1f}%")
-
-        except Exception as e:
-            result_data["error_count"] += 1
-            error_info = {
-                "file": file_path,
-                "error": str(e)
-            }
-            result_data["errors"].append(error_info)
-            print(f"  [ERROR] {e}")
-
-    # 完全一致率を計算
-    if result_data["total_count"] > 0:
-        result_data["perfect_match_rate"] = (
-            result_data["perfect_match_count"] / result_data["total_count"] * 100
+    if stream and not dry_run:
+        _stream_multiple_files(
+            file_paths,
+            lambda path: _iter_csv_words(Path(path), column_index, encoding),
+            output_file, intermediate_lang, result_data, window_size
         )
+        return _finish_multiple(result_data, output_file, written=True)
 
-    # 1つのCSVファイルに出力
-    if all_results:
-        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-            fieldnames = [
-                "ファイル名",
-                "元の日本語",
-                "中間言語",
-                "中間言語の翻訳",
-                "日本語への逆翻訳",
-                "完全一致"
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for result in all_results:
-                writer.writerow({
-                    "ファイル名": result["file_name"],
-                    "元の日本語": result["original"],
-                    "中間言語": result["intermediate_lang"],
-                    "中間言語の翻訳": result["intermediate_text"],
-                    "日本語への逆翻訳": result["back_translation"],
-                    "完全一致": result["is_perfect_match"]
-                })
-
-        print(f"\n[INFO] 出力完了: {output_file}")
-        print(f"  総件数: {result_data['total_count']}件")
-        print(f"  完全一致率: {result_data['perfect_match_rate']:.1f}%")
+    # 読み込み → 翻訳 → 書き出しのパイプラインで処理
+    read_words = partial(_read_csv_words, column_index=column_index, encoding=encoding)
+    if dry_run:
+        loaded_files = _load_files(file_paths, read_words, False, column_index, result_data, parse_workers)
+        return _estimate_loaded_files(loaded_files, intermediate_lang, result_data, engine)
 
-    return result_data
+    per_file_dir = output_file.parent / output_file.stem if per_file_outputs else None
+    written = _pipeline_multiple_files(
+        file_paths, read_words, False, column_index, output_file, intermediate_lang, result_data,
+        journal_file, resume, engine, per_file_dir, parse_workers
+    )
+    return _finish_multiple(result_data, output_file, written=written)
 
 
 def translate_from_multiple_excel(
@@ -587,11 +1135,22 @@ def translate_from_multiple_excel(
     column_index: int = 0,
     intermediate_lang: str = "en",
     sheet_name: Optional[str] = None,
-    check_structure: bool = True
+    check_structure: bool = True,
+    journal_file: Optional[str] = None,
+    resume: bool = False,
+    engine: Optional[AsyncTranslationEngine] = None,
+    stream: bool = False,
+    window_size: int = STREAM_WINDOW_SIZE,
+    dry_run: bool = False,
+    per_file_outputs: bool = True,
+    parse_workers: int = PARSE_WORKERS,
+    parse_processes: bool = True
 ) -> Dict:
     """
     複数のExcelファイルを一括で翻訳し、1つのCSVファイルにまとめて出力
 
+    ファイルの読み込み（プロセスプール）・翻訳・書き出しは並行して進む。
+
     Args:
         file_paths (List[str]): 入力Excelファイルパスのリスト
         output_file (str): 出力CSVファイルのパス（省略時は自動生成）
@@ -599,15 +1158,27 @@ def translate_from_multiple_excel(
         intermediate_lang (str): 中間言語コード（デフォルト: "en"）
         sheet_name (str): シート名（省略時は最初のシート）
         check_structure (bool): 列構造チェックを実行するか（デフォルト: True）
+        journal_file (str): 完了したチャンクを記録するジャーナルのパス（省略時は記録しない）
+        resume (bool): Trueの場合はジャーナルの完了済みチャンクを再利用し、残りだけを翻訳
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン（省略時はデフォルト設定）
+        stream (bool): Trueの場合はファイルを1件ずつ読み込み、window_size件ずつ翻訳して逐次書き出す
+            （メモリ使用量が一定になる代わりに、ファイル間の重複除去・ジャーナルは使用しない）
+        window_size (int): ストリーミングモードで1回に翻訳する件数（デフォルト: 1000）
+        dry_run (bool): Trueの場合は翻訳せず、課金文字数・リクエスト数・所要時間の見積もりだけを行う
+            （APIには接続しない、出力ファイルも作成しない）
+        per_file_outputs (bool): Trueの場合はまとめた出力に加えて、ファイルごとの出力CSVを
+            「出力ファイル名のフォルダ/入力ファイル名_translated.csv」に書き出す（デフォルト: True）
+        parse_workers (int): 同時に読み込むファイル数（デフォルト: CPU数、最大4）
+        parse_processes (bool): Trueの場合はプロセスプールで読み込む（openpyxlの解析はCPU処理のため、デフォルト: True）
 
     Returns:
-        dict: 処理結果（translate_from_multiple_csvと同じ形式）
+        dict: 処理結果（translate_from_multiple_csvと同じ形式、dry_run=Trueの場合は "estimate" を含む）
 
     Raises:
         ValueError: ファイルリストが空、または構造チェックで不一致が検出された場合
     """
     try:
-        from openpyxl import load_workbook
+        import openpyxl  # noqa: F401
     except ImportError:
         raise ImportError("openpyxlがインストールされていません。'pip install openpyxl'を実行してください。")
 
@@ -623,7 +1194,8 @@ def translate_from_multiple_excel(
         "perfect_match_rate": 0.0,
         "success_count": 0,
         "error_count": 0,
-        "errors": []
+        "errors": [],
+        "dedup_report": None
     }
 
     # 列構造チェック
@@ -658,100 +1230,26 @@ def translate_from_multiple_excel(
 
     result_data["output_file"] = str(output_file)
 
-    # 全翻訳結果を収集
-    all_results = []
-
-    # 各ファイルを翻訳
-    print(f"\n[INFO] {len(file_paths)}件のファイルを翻訳中...")
-    for i, file_path in enumerate(file_paths, 1):
-        print(f"\n[{i}/{len(file_paths)}] {Path(file_path).name}")
-        try:
-            # ファイルから単語を読み込み
-            file = Path(file_path)
-            wb = load_workbook(file, read_only=True, data_only=True)
-            if sheet_name:
-                if sheet_name not in wb.sheetnames:
-                    raise ValueError(f"シート '{sheet_name}' が見つかりません。利用可能なシート: {wb.sheetnames}")
-                ws = wb[sheet_name]
-            else:
-                ws = wb.active
-
-            words = []
-            for row in ws.iter_rows(values_only=True):
-                if row and len(row) > column_index and row[column_index]:
-                    word = str(row[column_index]).strip()
-                    if word:
-                        words.append(word)
-
-            wb.close()
-
-            if not words:
-                print(f"  [WARNING] 列インデックス {column_index} にデータが見つかりません")
-                continue
-
-            print(f"  読み込み: {len(words)}件")
-            print(f"  翻訳実行中: 日本語 → {intermediate_lang} → 日本語")
-
-            # 往復翻訳を実行
-            results = round_trip_translate_batch(words, intermediate_lang)
-
-            # ファイル名を追加
-            for result in results:
-                result["file_name"] = file.name
-                all_results.append(result)
-
-            # 統計情報を更新
-            perfect_matches = sum(1 for r in results if r["is_perfect_match"])
-            result_data["total_count"] += len(results)
-            result_data["perfect_match_count"] += perfect_matches
-            result_data["success_count"] += 1
-
-            print(f"  完了: {len(results)}件翻訳、完全一致率 {perfect_matches / len(results) * 100:.1f}%")
-
-        except Exception as e:
-            result_data["error_count"] += 1
-            error_info = {
-                "file": file_path,
-                "error": str(e)
-            }
-            result_data["errors"].append(error_info)
-            print(f"  [ERROR] {e}")
-
-    # 完全一致率を計算
-    if result_data["total_count"] > 0:
-        result_data["perfect_match_rate"] = (
-            result_data["perfect_match_count"] / result_data["total_count"] * 100
+    if stream and not dry_run:
+        _stream_multiple_files(
+            file_paths,
+            lambda path: _iter_excel_words(Path(path), column_index, sheet_name),
+            output_file, intermediate_lang, result_data, window_size
         )
+        return _finish_multiple(result_data, output_file, written=True)
 
-    # 1つのCSVファイルに出力
-    if all_results:
-        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-            fieldnames = [
-                "ファイル名",
-                "元の日本語",
-                "中間言語",
-                "中間言語の翻訳",
-                "日本語への逆翻訳",
-                "完全一致"
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+    # 読み込み → 翻訳 → 書き出しのパイプラインで処理
+    read_words = partial(_read_excel_words, column_index=column_index, sheet_name=sheet_name)
+    if dry_run:
+        loaded_files = _load_files(file_paths, read_words, parse_processes, column_index, result_data, parse_workers)
+        return _estimate_loaded_files(loaded_files, intermediate_lang, result_data, engine)
 
-            for result in all_results:
-                writer.writerow({
-                    "ファイル名": result["file_name"],
-                    "元の日本語": result["original"],
-                    "中間言語": result["intermediate_lang"],
-                    "中間言語の翻訳": result["intermediate_text"],
-                    "日本語への逆翻訳": result["back_translation"],
-                    "完全一致": result["is_perfect_match"]
-                })
-
-        print(f"\n[INFO] 出力完了: {output_file}")
-        print(f"  総件数: {result_data['total_count']}件")
-        print(f"  完全一致率: {result_data['perfect_match_rate']:.1f}%")
-
-    return result_data
+    per_file_dir = output_file.parent / output_file.stem if per_file_outputs else None
+    written = _pipeline_multiple_files(
+        file_paths, read_words, parse_processes, column_index, output_file, intermediate_lang, result_data,
+        journal_file, resume, engine, per_file_dir, parse_workers
+    )
+    return _finish_multiple(result_data, output_file, written=written)
 
 
 if __name__ == "__main__":
@@ -773,6 +1271,12 @@ if __name__ == "__main__":
     print("  print(f\"出力: {result['output_file']}\")")
     print("  print(f\"総件数: {result['total_count']}件\")")
     print("")
+    print("  # 大きなファイル（ストリーミング: 1000件ずつ翻訳して逐次書き出し）")
+    print("  result = translate_from_csv('large.csv', stream=True, window_size=1000)")
+    print("")
+    print("  # 見積もりのみ（APIに接続せず、課金文字数・リクエスト数・所要時間を表示）")
+    print("  result = translate_from_multiple_csv(files, dry_run=True)")
+    print("")
     print("  # 列構造チェックのみ")
     print("  check = check_csv_structure(files)")
     print("  print(f\"一致: {check['is_valid']}\")")
@@ -0,0 +1,268 @@
+"""
+一括翻訳（batch_translator）のスループット計測スクリプト
+合成した単語リスト（1k〜100k行）をローカル代替サーバーに対して翻訳し、
+リクエスト数/秒・文字数/秒・レイテンシ（p50/p95）・ピークメモリをJSONで出力する
+
+使い方:
+    python benchmark_translation.py [出力JSONファイル]
+
+設定（環境変数）:
+    BENCH_SIZES: 計測する行数（カンマ区切り、デフォルト: 1000,10000）
+    BENCH_FILE_COUNTS: 複数ファイル計測のファイル数（デフォルト: 1,5）
+    BENCH_CONCURRENCY: 同時実行数（デフォルト: 1,8）
+    BENCH_CACHE_HIT_RATIOS: キャッシュヒット率（デフォルト: 0,0.9）
+    BENCH_LATENCY_MS: 代替サーバーの応答遅延（ミリ秒、デフォルト: 20）
+"""
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from stub_translation_server import StubConfig, start_stub_server
+from translation_telemetry import percentile
+
+
+# 合成データの元になる単語（create_multiple_test_files.pyと同じ系統の語彙）
+_BASE_WORDS = [
+    "喜び", "悲しみ", "怒り", "恐怖", "驚き", "太陽", "月", "星", "海", "山",
+    "赤", "青", "緑", "黄", "白", "犬", "猫", "鳥", "魚", "馬",
+    "安全帯", "足場", "型枠", "鉄筋", "生コン", "墜落", "保護具", "重機", "玉掛け", "朝礼"
+]
+
+
+def _env_list(name: str, default: str, cast=float) -> list:
+    """カンマ区切りの環境変数をリストに変換"""
+    return [cast(v) for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+def create_synthetic_csv_files(
+    output_dir: Path,
+    total_rows: int,
+    file_count: int = 1,
+    duplicate_ratio: float = 0.0
+) -> list[str]:
+    """
+    合成した単語リストのCSVファイルを作成（1列目が日本語、ヘッダー付き）
+
+    Args:
+        output_dir (Path): 出力フォルダ
+        total_rows (int): 全ファイルの合計行数
+        file_count (int): ファイル数
+        duplicate_ratio (float): ファイル間で重複させる行の割合（0〜1）
+
+    Returns:
+        list[str]: 作成したCSVファイルのパスのリスト
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rows_per_file = max(1, total_rows // file_count)
+    shared_rows = int(rows_per_file * duplicate_ratio)
+
+    file_paths = []
+    serial = 0
+    for file_idx in range(file_count):
+        path = output_dir / f"bench_{total_rows}_{file_idx + 1}.csv"
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["日本語"])
+            for row_idx in range(rows_per_file):
+                if row_idx < shared_rows:
+                    # 全ファイル共通の行（重複除去の効果を測るため）
+                    word = f"{_BASE_WORDS[row_idx % len(_BASE_WORDS)]}{row_idx}"
+                else:
+                    serial += 1
+                    word = f"{_BASE_WORDS[serial % len(_BASE_WORDS)]}_{file_idx}_{serial}"
+                writer.writerow([word])
+        file_paths.append(str(path))
+    return file_paths
+
+
+def _read_words(file_paths: list[str]) -> list[str]:
+    """CSVファイルの1列目を読み込む（ヘッダーを含む、batch_translatorと同じ読み方）"""
+    words = []
+    for path in file_paths:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            words.extend(row[0].strip() for row in csv.reader(f) if row and row[0].strip())
+    return words
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """このプロセスのピークメモリ使用量（MB）を取得（取得できない環境ではNone）"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # LinuxはKB単位、macOSはバイト単位
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _run_scenario(scenario: dict, work_dir: str, queue) -> None:
+    """
+    1シナリオを子プロセスで実行（ピークメモリをシナリオごとに測るため）
+
+    結果のdictをqueueに入れる。
+    """
+    os.environ["TRANSLATION_CACHE_PATH"] = str(Path(work_dir) / f"cache_{scenario['name']}.sqlite3")
+    import translator
+    from async_translator import AsyncTranslationEngine
+    from batch_translator import translate_from_csv, translate_from_multiple_csv
+
+    file_paths = create_synthetic_csv_files(
+        Path(work_dir) / scenario["name"],
+        scenario["rows"],
+        scenario["files"],
+        scenario.get("duplicate_ratio", 0.0)
+    )
+
+    # キャッシュヒット率のシナリオでは、指定割合の単語を事前にキャッシュしておく
+    if scenario["cache_hit_ratio"] > 0:
+        words = list(dict.fromkeys(_read_words(file_paths)))
+        warm = words[:int(len(words) * scenario["cache_hit_ratio"])]
+        intermediates = translator.translate_words(warm, "ja", "en")
+        translator.translate_words(intermediates, "en", "ja")
+        translator.get_default_cache().hits = 0
+        translator.get_default_cache().misses = 0
+
+    # 1チャンクごとのレイテンシ・セグメント数・文字数を記録
+    latencies = []
+    counters = {"requests": 0, "segments": 0, "characters": 0}
+    original_request_chunk = translator._request_chunk
+
+    def timed_request_chunk(words, source_lang, target_lang):
+        start = time.perf_counter()
+        result = original_request_chunk(words, source_lang, target_lang)
+        latencies.append((time.perf_counter() - start) * 1000)
+        counters["requests"] += 1
+        counters["segments"] += len(words)
+        counters["characters"] += sum(len(w) for w in words)
+        return result
+
+    translator._request_chunk = timed_request_chunk
+
+    output_file = str(Path(work_dir) / f"{scenario['name']}_out.csv")
+    start = time.perf_counter()
+    if scenario["mode"] == "single":
+        translate_from_csv(file_paths[0], output_file=output_file)
+    else:
+        engine = AsyncTranslationEngine(
+            max_concurrency=scenario["concurrency"],
+            requests_per_second=None
+        )
+        translate_from_multiple_csv(file_paths, output_file=output_file, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    cache_stats = translator.get_cache_stats()
+    queue.put({
+        **scenario,
+        "wall_time_sec": round(elapsed, 3),
+        "requests": counters["requests"],
+        "segments": counters["segments"],
+        "characters": counters["characters"],
+        "requests_per_sec": round(counters["requests"] / elapsed, 2) if elapsed else None,
+        "chars_per_sec": round(counters["characters"] / elapsed, 1) if elapsed else None,
+        "rows_per_sec": round(scenario["rows"] / elapsed, 1) if elapsed else None,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "cache_hit_rate": cache_stats["hit_rate"] if cache_stats else None,
+        "peak_rss_mb": _peak_rss_mb()
+    })
+
+
+def build_scenarios() -> list[dict]:
+    """環境変数の設定から計測シナリオの一覧を作成"""
+    sizes = _env_list("BENCH_SIZES", "1000,10000", int)
+    file_counts = _env_list("BENCH_FILE_COUNTS", "1,5", int)
+    concurrencies = _env_list("BENCH_CONCURRENCY", "1,8", int)
+    hit_ratios = _env_list("BENCH_CACHE_HIT_RATIOS", "0,0.9", float)
+
+    scenarios = []
+    for rows in sizes:
+        # 単一ファイル（同期版 translate_from_csv）
+        scenarios.append({
+            "name": f"single_{rows}", "mode": "single", "rows": rows, "files": 1,
+            "concurrency": 1, "cache_hit_ratio": 0.0
+        })
+        # 複数ファイル × 同時実行数 × キャッシュヒット率
+        for files in file_counts:
+            for concurrency in concurrencies:
+                for ratio in hit_ratios:
+                    scenarios.append({
+                        "name": f"multi_{rows}_f{files}_c{concurrency}_h{int(ratio * 100)}",
+                        "mode": "multi", "rows": rows, "files": files,
+                        "concurrency": concurrency, "cache_hit_ratio": ratio,
+                        "duplicate_ratio": 0.2 if files > 1 else 0.0
+                    })
+    return scenarios
+
+
+def run_benchmark(output_json: Optional[str] = None) -> dict:
+    """
+    全シナリオを計測してJSONに保存
+
+    Args:
+        output_json (str): 出力JSONファイルのパス（省略時は output/benchmark_日時.json）
+
+    Returns:
+        dict: 計測結果
+    """
+    latency_ms = float(os.getenv("BENCH_LATENCY_MS", "20"))
+    server, base_url = start_stub_server(config=StubConfig(latency_ms=latency_ms, seed=0))
+    # 子プロセスはこの環境変数を引き継いで代替サーバーに接続する
+    os.environ["TRANSLATION_API_BASE_URL"] = base_url
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stub_latency_ms": latency_ms,
+        "scenarios": []
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scenario in build_scenarios():
+            print(f"[計測中] {scenario['name']}")
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_run_scenario, args=(scenario, work_dir, queue))
+            process.start()
+            process.join()
+            if queue.empty():
+                print(f"  [ERROR] 計測に失敗しました（終了コード: {process.exitcode}）")
+                results["scenarios"].append({**scenario, "error": f"exitcode {process.exitcode}"})
+                continue
+            result = queue.get()
+            results["scenarios"].append(result)
+            print(f"  {result['wall_time_sec']}秒, {result['requests_per_sec']} req/s, "
+                  f"p50 {result['latency_p50_ms']:.1f}ms, p95 {result['latency_p95_ms']:.1f}ms"
+                  if result["requests"] else f"  {result['wall_time_sec']}秒（APIリクエストなし）")
+
+    server.shutdown()
+
+    if output_json is None:
+        output_dir = Path(__file__).parent.parent / "output"
+        output_dir.mkdir(exist_ok=True)
+        output_json = output_dir / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_json, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n[INFO] 計測結果を保存しました: {output_json}")
+
+    return results
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("一括翻訳スループット計測")
+    print("=" * 70)
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,216 @@
+"""
+セルごとの内容ハッシュによる差分翻訳
+(行キー, 列) ごとに翻訳元テキストのハッシュと翻訳結果を出力ファイルの隣のJSONに保存し、
+次回の実行では内容が変わったセル・新しいセルだけを翻訳する（変わっていないセルは前回の結果を引き継ぐ）
+
+例:
+    manifest = CellHashManifest.load(default_manifest_path(input_csv, output_excel))
+    plan = manifest.plan(df, ["en", "th"], {"en": "en", "th": "th"}, "ja")
+    for column, texts in plan.pending.items():
+        translated = ...  # textsだけを翻訳
+        manifest.update(plan, column, dict(zip(texts, translated)))
+    manifest.save()
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".cell_hashes.json"
+
+
+def content_hash(text: str, source_lang: Optional[str], target_lang: str) -> str:
+    """
+    セルの内容ハッシュ（テキスト・言語ペアのどれかが変われば別の値）
+
+    Args:
+        text (str): 翻訳元のテキスト
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+
+    Returns:
+        str: ハッシュ値（16進数16文字）
+    """
+    payload = f"{source_lang or 'auto'}\x1f{target_lang}\x1f{text}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def row_keys(df: pd.DataFrame, key_column: str = "ja") -> list[str]:
+    """
+    行を識別するキーのリスト（行の挿入・削除で行番号がずれても同じ行を指す）
+
+    key_columnの値をキーにし、同じ値が複数ある場合は2件目から "#2", "#3" を付ける。
+    key_columnがない・空の行は行番号をキーにする。
+
+    Args:
+        df (pd.DataFrame): 入力データ
+        key_column (str): キーにする列名
+
+    Returns:
+        list[str]: dfの行順のキーのリスト
+    """
+    keys = []
+    seen: dict[str, int] = {}
+    has_key_column = key_column in df.columns
+    for position, value in enumerate(df[key_column] if has_key_column else [None] * len(df)):
+        if value is None or pd.isna(value) or str(value).strip() == "":
+            keys.append(f"#row{position + 2}")
+            continue
+        key = str(value).strip()
+        seen[key] = seen.get(key, 0) + 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+
+def default_manifest_path(input_csv: str, output_excel: str) -> Path:
+    """
+    ハッシュファイルのデフォルトのパス（出力Excelと同じフォルダ、入力CSVのファイル名ごと）
+
+    出力ファイル名に日時が付く場合でも前回のハッシュを使えるように、入力CSVの名前から決める。
+
+    Args:
+        input_csv (str): 入力CSVのパス
+        output_excel (str): 出力Excelのパス
+
+    Returns:
+        Path: ハッシュファイルのパス
+    """
+    return Path(output_excel).parent / f"{Path(input_csv).stem}_逆翻訳{MANIFEST_SUFFIX}"
+
+
+class IncrementalPlan:
+    """CellHashManifest.plan() の結果（列ごとの翻訳が必要なテキストと引き継ぐ結果）"""
+
+    def __init__(self):
+        # 列 -> 翻訳が必要なテキスト（重複除去済み）
+        self.pending: dict[str, list[str]] = {}
+        # 列 -> {翻訳元テキスト: 前回の翻訳結果}（変わっていないセル）
+        self.reused: dict[str, dict[str, str]] = {}
+        # 列 -> [(行キー, ハッシュ, テキスト)]（翻訳が必要なセル、結果の記録用）
+        self._pending_cells: dict[str, list[tuple[str, str, str]]] = {}
+        self.reused_cells = 0
+        self.pending_cells = 0
+
+
+class CellHashManifest:
+    """
+    (行キー, 列) ごとの内容ハッシュと翻訳結果を保存するファイル
+
+    保存時は今回の入力にあるセルだけを書き出す（削除された行・列は残らない）。
+    翻訳に失敗したセルは記録しないため、次回も翻訳対象になる。
+    """
+
+    def __init__(self, path: Path, entries: Optional[dict] = None):
+        """
+        Args:
+            path (Path): ハッシュファイルのパス
+            entries (dict): 読み込み済みの記録 {列: {行キー: [ハッシュ, 翻訳結果]}}
+        """
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, list[str]]] = entries or {}
+        self._next: dict[str, dict[str, list[str]]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "CellHashManifest":
+        """
+        ハッシュファイルを読み込む（ファイルがない・壊れている場合は空の状態で開始）
+
+        Args:
+            path (Path): ハッシュファイルのパス
+
+        Returns:
+            CellHashManifest: 読み込んだ記録
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] ハッシュファイルを読み込めないため全セルを翻訳します: {path}（{e}）")
+            return cls(path)
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, data.get("columns", {}))
+
+    def plan(
+        self,
+        df: pd.DataFrame,
+        columns: list[str],
+        source_langs: dict[str, Optional[str]],
+        target_lang: str,
+        key_column: str = "ja"
+    ) -> IncrementalPlan:
+        """
+        各セルのハッシュを前回の記録と比べ、翻訳が必要なテキストと引き継ぐ結果に分ける
+
+        Args:
+            df (pd.DataFrame): 入力データ
+            columns (list[str]): 翻訳する列名のリスト（dfにない列は無視）
+            source_langs (dict): {列名: ソース言語コード}
+            target_lang (str): ターゲット言語コード
+            key_column (str): 行キーにする列名
+
+        Returns:
+            IncrementalPlan: 差分翻訳の計画
+        """
+        plan = IncrementalPlan()
+        keys = row_keys(df, key_column)
+        self._next = {}
+
+        for column in columns:
+            if column not in df.columns:
+                continue
+            previous = self.entries.get(column, {})
+            kept = self._next.setdefault(column, {})
+            reused = plan.reused.setdefault(column, {})
+            cells = plan._pending_cells.setdefault(column, [])
+
+            for key, value in zip(keys, df[column]):
+                if not isinstance(value, str) or value.strip() == "":
+                    continue
+                text_hash = content_hash(value, source_langs.get(column), target_lang)
+                entry = previous.get(key)
+                if entry and entry[0] == text_hash:
+                    kept[key] = entry
+                    reused[value] = entry[1]
+                    plan.reused_cells += 1
+                else:
+                    cells.append((key, text_hash, value))
+                    plan.pending_cells += 1
+
+            plan.pending[column] = list(dict.fromkeys(
+                text for _, _, text in cells if text not in reused
+            ))
+        return plan
+
+    def update(self, plan: IncrementalPlan, column: str, translations: dict[str, Optional[str]]) -> None:
+        """
+        翻訳したセルの結果を記録（結果がNone・見つからないセルは記録しない）
+
+        Args:
+            plan (IncrementalPlan): plan()の結果
+            column (str): 列名
+            translations (dict): {翻訳元テキスト: 翻訳結果}
+        """
+        kept = self._next.setdefault(column, {})
+        reused = plan.reused.get(column, {})
+        for key, text_hash, text in plan._pending_cells.get(column, []):
+            result = translations.get(text, reused.get(text))
+            if result is not None:
+                kept[key] = [text_hash, result]
+
+    def save(self) -> None:
+        """今回の入力のセルの記録をハッシュファイルに書き出す（一時ファイル経由で置き換え）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "columns": self._next}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.entries = self._next
@@ -0,0 +1,87 @@
+"""
+翻訳APIに送る文字数の上限（課金額の上限）
+上限を超えるリクエストは送信前に止め、それまでに完了した分はキャッシュ・ジャーナルに残す
+"""
+import os
+import threading
+from typing import Optional
+
+
+class BudgetExceededError(Exception):
+    """文字数の上限を超えるため翻訳リクエストを送信しなかった"""
+
+
+class CharacterBudget:
+    """
+    送信文字数の上限を管理する（並列翻訳から呼ばれても安全）
+
+    例:
+        budget = CharacterBudget(500000)
+        budget.consume(1200)     # 上限を超える場合はBudgetExceededError
+        print(budget.remaining)
+    """
+
+    def __init__(self, max_chars: int):
+        """
+        Args:
+            max_chars (int): 送信できる文字数の上限
+        """
+        self.max_chars = max_chars
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """残りの文字数"""
+        return max(0, self.max_chars - self.used)
+
+    def consume(self, chars: int) -> None:
+        """
+        文字数を消費（上限を超える場合は消費せずに例外）
+
+        Args:
+            chars (int): 送信する文字数
+
+        Raises:
+            BudgetExceededError: 上限を超える場合
+        """
+        with self._lock:
+            if self.used + chars > self.max_chars:
+                raise BudgetExceededError(
+                    f"文字数の上限を超えるため翻訳を中止しました"
+                    f"（上限 {self.max_chars:,}文字、送信済み {self.used:,}文字、今回 {chars:,}文字）"
+                )
+            self.used += chars
+
+
+_default_budget: Optional[CharacterBudget] = None
+_default_loaded = False
+
+
+def set_default_budget(max_chars: Optional[int]) -> Optional[CharacterBudget]:
+    """
+    すべての翻訳リクエストに適用する文字数の上限を設定
+
+    Args:
+        max_chars (int): 文字数の上限（Noneの場合は上限なし）
+
+    Returns:
+        CharacterBudget: 設定した上限（上限なしの場合はNone）
+    """
+    global _default_budget, _default_loaded
+    _default_budget = CharacterBudget(max_chars) if max_chars is not None else None
+    _default_loaded = True
+    return _default_budget
+
+
+def get_default_budget() -> Optional[CharacterBudget]:
+    """
+    文字数の上限を取得（未設定の場合は環境変数 TRANSLATION_CHAR_BUDGET から作成）
+
+    Returns:
+        CharacterBudget: 文字数の上限（上限なしの場合はNone）
+    """
+    if not _default_loaded:
+        value = os.getenv("TRANSLATION_CHAR_BUDGET")
+        set_default_budget(int(value) if value else None)
+    return _default_budget
@@ -0,0 +1,251 @@
+"""
+翻訳の事前見積もり（ドライラン）
+重複除去・用語集・キャッシュ・翻訳メモリの検索だけを行い（APIには接続しない）、
+言語ペアごとの課金文字数・リクエスト数・所要時間の目安・概算費用を集計する
+
+例:
+    from cost_estimator import estimate_jobs, print_estimate
+    report = estimate_jobs([("en", ["犬", "猫"], "ja", "en"), ("th", ["犬"], "ja", "th")])
+    print_estimate(report)
+"""
+import math
+from typing import Optional
+
+import translator
+from char_budget import CharacterBudget, get_default_budget
+
+
+# Cloud Translation API（Basic）の料金（100万文字あたりのUSD、無料枠は考慮しない）
+PRICE_PER_MILLION_CHARS = 20.0
+
+# 1リクエストの平均応答時間（秒、同時実行数で割った時間の目安に使う）
+DEFAULT_REQUEST_LATENCY_SEC = 0.5
+
+# AsyncTranslationEngineのデフォルト設定と同じレート制限
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+
+# 往復翻訳の復路の文字数比を既知の訳から求めるのに必要な件数（少ない場合は1倍とする）
+MIN_RATIO_SAMPLES = 20
+
+
+def estimate_pair(
+    texts: list[str],
+    source_lang: Optional[str],
+    target_lang: str,
+    use_glossary: bool = True,
+    use_cache: bool = True,
+    max_segments: int = translator.MAX_SEGMENTS_PER_REQUEST
+) -> dict:
+    """
+    1つの言語ペアの翻訳を見積もる（APIには接続しない）
+
+    Args:
+        texts (list[str]): 翻訳するテキストのリスト（重複・空文字を含んでよい）
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+        use_glossary (bool): 用語集を使うか
+        use_cache (bool): 翻訳キャッシュを使うか
+        max_segments (int): 1リクエストの最大セグメント数（1件ずつ送る処理は1）
+
+    Returns:
+        dict: 見積もり結果
+            {
+                "source_lang", "target_lang",
+                "segments": 入力件数,
+                "unique_segments": 重複除去後の件数,
+                "glossary_hits" / "cache_hits" / "memory_hits": ローカルで見つかった件数,
+                "billable_segments": APIに送る件数,
+                "billable_chars": APIに送る文字数（課金対象）,
+                "requests": チャンク分割後のリクエスト数,
+                "misses": APIに送るテキストのリスト
+            }
+    """
+    unique = list(dict.fromkeys(t for t in texts if t))
+    results, provenance = translator.lookup_local(unique, source_lang, target_lang, use_glossary, use_cache)
+    misses = [text for text, result in zip(unique, results) if result is None]
+
+    return {
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "segments": len(texts),
+        "unique_segments": len(unique),
+        "glossary_hits": provenance.count("glossary"),
+        "cache_hits": provenance.count("cache"),
+        "memory_hits": provenance.count("memory"),
+        "billable_segments": len(misses),
+        "billable_chars": sum(len(t) for t in misses),
+        "requests": len(translator.chunk_segments(misses, max_segments=max_segments)),
+        "misses": misses
+    }
+
+
+def _summarize(
+    pairs: list[dict],
+    engine=None,
+    request_latency_sec: float = DEFAULT_REQUEST_LATENCY_SEC,
+    budget: Optional[CharacterBudget] = None
+) -> dict:
+    """言語ペアごとの見積もりを合計し、所要時間・費用・文字数上限の判定を追加"""
+    max_concurrency = engine.max_concurrency if engine else DEFAULT_MAX_CONCURRENCY
+    requests_per_second = engine.requests_per_second if engine else DEFAULT_REQUESTS_PER_SECOND
+    chars_per_minute = engine.chars_per_minute if engine else None
+
+    total_requests = sum(p["requests"] for p in pairs)
+    total_chars = sum(p["billable_chars"] for p in pairs)
+
+    # 最も厳しい制約（リクエスト数/秒・文字数/分・同時実行数×応答時間）で所要時間が決まる
+    estimated_seconds = max(
+        total_requests / requests_per_second if requests_per_second else 0.0,
+        total_chars / (chars_per_minute / 60) if chars_per_minute else 0.0,
+        math.ceil(total_requests / max_concurrency) * request_latency_sec if total_requests else 0.0
+    )
+
+    if budget is None:
+        budget = get_default_budget()
+
+    return {
+        "pairs": [{k: v for k, v in p.items() if k != "misses"} for p in pairs],
+        "total_segments": sum(p["segments"] for p in pairs),
+        "total_unique_segments": sum(p["unique_segments"] for p in pairs),
+        "total_local_hits": sum(p["glossary_hits"] + p["cache_hits"] + p["memory_hits"] for p in pairs),
+        "total_billable_segments": sum(p["billable_segments"] for p in pairs),
+        "total_billable_chars": total_chars,
+        "total_requests": total_requests,
+        "estimated_seconds": round(estimated_seconds, 1),
+        "estimated_cost_usd": round(total_chars / 1_000_000 * PRICE_PER_MILLION_CHARS, 2),
+        "rate_limits": {
+            "max_concurrency": max_concurrency,
+            "requests_per_second": requests_per_second,
+            "chars_per_minute": chars_per_minute
+        },
+        "char_budget": budget.remaining if budget else None,
+        "within_budget": total_chars <= budget.remaining if budget else True
+    }
+
+
+def estimate_jobs(
+    jobs: list[tuple[str, list[str], Optional[str], str]],
+    engine=None,
+    use_glossary: bool = True,
+    use_cache: bool = True,
+    request_latency_sec: float = DEFAULT_REQUEST_LATENCY_SEC,
+    budget: Optional[CharacterBudget] = None,
+    max_segments: int = translator.MAX_SEGMENTS_PER_REQUEST
+) -> dict:
+    """
+    複数の翻訳（列・言語ごと）をまとめて見積もる（APIには接続しない）
+
+    Args:
+        jobs (list[tuple]): (名前, テキストのリスト, ソース言語, ターゲット言語) のリスト
+        engine (AsyncTranslationEngine): 実行時に使うエンジン（レート制限の設定を使う、省略時はデフォルト設定）
+        use_glossary (bool): 用語集を使うか
+        use_cache (bool): 翻訳キャッシュを使うか
+        request_latency_sec (float): 1リクエストの平均応答時間（秒）
+        budget (CharacterBudget): 文字数の上限（省略時は TRANSLATION_CHAR_BUDGET）
+        max_segments (int): 1リクエストの最大セグメント数（1件ずつ送る処理は1）
+
+    Returns:
+        dict: 見積もり結果（pairsに各言語ペアの結果、total_*に合計、
+            estimated_seconds・estimated_cost_usd・within_budgetを含む）
+    """
+    pairs = []
+    for name, texts, source_lang, target_lang in jobs:
+        pair = estimate_pair(texts, source_lang, target_lang, use_glossary, use_cache, max_segments)
+        pair["name"] = name
+        pairs.append(pair)
+    return _summarize(pairs, engine, request_latency_sec, budget)
+
+
+def estimate_round_trip(
+    texts: list[str],
+    intermediate_lang: str = "en",
+    engine=None,
+    use_glossary: bool = True,
+    use_cache: bool = True,
+    request_latency_sec: float = DEFAULT_REQUEST_LATENCY_SEC,
+    budget: Optional[CharacterBudget] = None
+) -> dict:
+    """
+    往復翻訳（日本語 → 中間言語 → 日本語）を見積もる（APIには接続しない）
+
+    往路は正確に集計する。復路はローカルで見つかった中間言語訳だけ検索でき、
+    APIで翻訳される分の中間言語訳は未知のため、既知の訳の文字数比（既知の訳が少ない場合は1倍）で推定する。
+
+    Args:
+        texts (list[str]): 日本語テキストのリスト
+        intermediate_lang (str): 中間言語コード
+        engine (AsyncTranslationEngine): 実行時に使うエンジン（レート制限の設定を使う）
+        use_glossary (bool): 用語集を使うか
+        use_cache (bool): 翻訳キャッシュを使うか
+        request_latency_sec (float): 1リクエストの平均応答時間（秒）
+        budget (CharacterBudget): 文字数の上限（省略時は TRANSLATION_CHAR_BUDGET）
+
+    Returns:
+        dict: estimate_jobs()と同じ形式（復路のペアは "estimated": True）
+    """
+    forward = estimate_pair(texts, "ja", intermediate_lang, use_glossary, use_cache)
+    forward["name"] = f"ja→{intermediate_lang}"
+
+    unique = list(dict.fromkeys(t for t in texts if t))
+    known, _ = translator.lookup_local(unique, "ja", intermediate_lang, use_glossary, use_cache)
+    known_pairs = [(text, result) for text, result in zip(unique, known) if result is not None]
+    known_intermediates = [result for _, result in known_pairs]
+    backward = estimate_pair(known_intermediates, intermediate_lang, "ja", use_glossary, use_cache)
+
+    # 未翻訳分の中間言語訳の文字数を推定
+    source_chars = sum(len(text) for text, _ in known_pairs)
+    ratio = 1.0
+    if len(known_pairs) >= MIN_RATIO_SAMPLES and source_chars:
+        ratio = sum(len(r) for r in known_intermediates) / source_chars
+    unknown_chars = [max(1, round(len(text) * ratio)) for text in forward["misses"]]
+
+    backward["segments"] += len(forward["misses"])
+    backward["unique_segments"] += len(forward["misses"])
+    backward["billable_segments"] += len(unknown_chars)
+    backward["billable_chars"] += sum(unknown_chars)
+    backward["requests"] = len(translator.chunk_segments(
+        backward["misses"] + ["x" * n for n in unknown_chars]
+    ))
+    backward["name"] = f"{intermediate_lang}→ja"
+    backward["estimated"] = bool(unknown_chars)
+
+    return _summarize([forward, backward], engine, request_latency_sec, budget)
+
+
+def print_estimate(report: dict) -> None:
+    """
+    見積もり結果を表示
+
+    Args:
+        report (dict): estimate_jobs() / estimate_round_trip() の戻り値
+    """
+    print("=" * 70)
+    print("翻訳の見積もり（ドライラン、APIには接続していません）")
+    print("=" * 70)
+    print(f"{'名前':<12} {'言語ペア':<12} {'件数':>8} {'重複除去後':>10} {'ローカル':>8} "
+          f"{'課金件数':>8} {'課金文字数':>10} {'リクエスト':>10}")
+    for pair in report["pairs"]:
+        local = pair["glossary_hits"] + pair["cache_hits"] + pair["memory_hits"]
+        mark = "（推定）" if pair.get("estimated") else ""
+        print(f"{pair['name']:<12} {(pair['source_lang'] or 'auto') + '→' + pair['target_lang']:<12} "
+              f"{pair['segments']:>8,} {pair['unique_segments']:>10,} {local:>8,} "
+              f"{pair['billable_segments']:>8,} {pair['billable_chars']:>10,} {pair['requests']:>10,}{mark}")
+    print("-" * 70)
+    print(f"ローカルで翻訳済み: {report['total_local_hits']:,}件（用語集・キャッシュ・翻訳メモリ）")
+    print(f"課金文字数: {report['total_billable_chars']:,}文字（{report['total_billable_segments']:,}件）")
+    print(f"リクエスト数: {report['total_requests']:,}件")
+
+    limits = report["rate_limits"]
+    print(f"所要時間の目安: 約{report['estimated_seconds']:,}秒"
+          f"（同時実行数 {limits['max_concurrency']}、"
+          f"{limits['requests_per_second'] or '無制限'} req/s、"
+          f"{limits['chars_per_minute'] or '無制限'} 文字/分）")
+    print(f"概算費用: ${report['estimated_cost_usd']:,}（{PRICE_PER_MILLION_CHARS}USD/100万文字、無料枠は考慮しない）")
+
+    if report["char_budget"] is not None:
+        if report["within_budget"]:
+            print(f"[INFO] 文字数の上限内です（残り {report['char_budget']:,}文字）")
+        else:
+            print(f"[WARNING] 文字数の上限を超えます（残り {report['char_budget']:,}文字）。"
+                  f"上限に達した時点で翻訳を中止します")
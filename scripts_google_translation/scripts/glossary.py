@@ -0,0 +1,263 @@
+"""
+公開済みの多言語用語集（テンプレートCSV・PDF抽出CSV）による翻訳
+用語集にある日本語の単語はAPIを呼ばずに用語集の訳語を返す
+
+読み込むファイル（先に読んだものが優先）:
+    1. core_files/output_csv_template_utf8bom.csv（ja列 + 各言語列）
+    2. output/intermediate/*_pdfplumber_抽出_最終版.csv（言語, 単語, 翻訳）
+"""
+import csv
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+from language_codes import to_api_lang
+
+
+# リポジトリのルート（scripts_google_translation/scripts から2つ上）
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_TEMPLATE_PATH = _REPO_ROOT / "core_files" / "output_csv_template_utf8bom.csv"
+DEFAULT_PDF_GLOB = "output/intermediate/*_pdfplumber_抽出_最終版.csv"
+
+# PDF抽出CSVの言語名 → テンプレートの言語コード
+PDF_LANGUAGE_CODES = {
+    "英語": "en",
+    "タガログ語": "fil-PH",
+    "中国語": "zh",
+    "タイ語": "th",
+    "ベトナム語": "vi",
+    "ミャンマー語": "my",
+    "インドネシア語": "id",
+    "カンボジア語": "km",
+}
+
+# テンプレートの言語列ではない列
+_NON_LANGUAGE_COLUMNS = {"ja", "翻訳言語数"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# PDF抽出で文字化けしたセルのCIDコード（"(cid:123)"、hybrid_extractor.CID_PATTERN と同じ）
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+
+def normalize_key(text: str) -> str:
+    """
+    用語集の検索キー用にテキストを正規化（NFKC + 空白除去 + 小文字化）
+
+    全角・半角の括弧や英数字、前後・途中の空白の違いを吸収する。
+
+    Args:
+        text (str): 元のテキスト
+
+    Returns:
+        str: 正規化後のテキスト
+    """
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text)).casefold()
+
+
+class Glossary:
+    """
+    日本語 → 各言語の用語集（完全一致・正規化キーの2段階でO(1)検索）
+
+    例:
+        glossary = Glossary.from_files()
+        print(glossary.lookup("工場", "ja", "en"))   # ("Factory; plant", "output_csv_template_utf8bom.csv")
+        print(glossary.get_many(["工場", "犬"], "ja", "tl"))   # ["Pabrika", None]
+    """
+
+    def __init__(self):
+        # (ソース言語, ターゲット言語, テキスト) -> (訳語, 出典ファイル名)
+        self._exact: dict[tuple[str, str, str], tuple[str, str]] = {}
+        self._normalized: dict[tuple[str, str, str], tuple[str, str]] = {}
+        self.sources: list[str] = []
+        self.hits = 0
+        self.misses = 0
+        # CIDコードを含むため登録しなかった訳語の数
+        self.skipped_cid = 0
+
+    def add(self, text: str, translation: str, source_lang: str, target_lang: str, origin: str) -> bool:
+        """
+        用語を登録（同じキーが登録済みの場合は先に登録したものを優先）
+
+        CIDコード（PDF抽出の文字化け）を含む訳語は登録せず、その単語はAPIで翻訳する。
+
+        Args:
+            text (str): 日本語の単語
+            translation (str): 訳語
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード（テンプレートの言語コード）
+            origin (str): 出典（ファイル名）
+
+        Returns:
+            bool: 登録した場合はTrue（空・CIDコードを含む場合はFalse）
+        """
+        text = text.strip()
+        translation = translation.strip()
+        if not text or not translation:
+            return False
+        if CID_PATTERN.search(translation):
+            self.skipped_cid += 1
+            return False
+        entry = (translation, origin)
+        # テンプレートの言語コードとAPIの言語コード（fil-PH → tl など）の両方で引けるようにする
+        for target in dict.fromkeys([target_lang, to_api_lang(target_lang)]):
+            self._exact.setdefault((source_lang, target, text), entry)
+            self._normalized.setdefault((source_lang, target, normalize_key(text)), entry)
+        return True
+
+    def load_template(self, path: Path) -> int:
+        """
+        テンプレートCSV（ja列 + 言語コード列）を読み込む
+
+        Args:
+            path (Path): テンプレートCSVのパス
+
+        Returns:
+            int: 登録した訳語の数（CIDコードを含む訳語は数えない）
+        """
+        count = 0
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            languages = [c for c in (reader.fieldnames or []) if c not in _NON_LANGUAGE_COLUMNS]
+            rows = list(reader)
+        # 列順（pt → pt-BR など）に登録するため、APIの言語コードが同じ場合は基本の言語の列が優先される
+        for lang in languages:
+            for row in rows:
+                if row.get("ja") and row.get(lang):
+                    count += self.add(row["ja"], row[lang], "ja", lang, path.name)
+        self.sources.append(str(path))
+        return count
+
+    def load_pdf_extraction(self, path: Path) -> int:
+        """
+        PDF抽出CSV（言語, 単語, 翻訳 の列）を読み込む
+
+        Args:
+            path (Path): PDF抽出CSVのパス
+
+        Returns:
+            int: 登録した訳語の数（言語名が不明な行・CIDコードを含む訳語は読み飛ばす）
+        """
+        count = 0
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                lang = PDF_LANGUAGE_CODES.get((row.get("言語") or "").strip())
+                if lang and row.get("単語") and row.get("翻訳"):
+                    count += self.add(row["単語"], row["翻訳"], "ja", lang, path.name)
+        self.sources.append(str(path))
+        return count
+
+    @classmethod
+    def from_files(
+        cls,
+        template_path: Optional[str] = None,
+        pdf_paths: Optional[list[str]] = None
+    ) -> "Glossary":
+        """
+        テンプレートCSVとPDF抽出CSVから用語集を作成（存在しないファイルは読み飛ばす）
+
+        Args:
+            template_path (str): テンプレートCSVのパス（省略時は DEFAULT_TEMPLATE_PATH）
+            pdf_paths (list[str]): PDF抽出CSVのパスのリスト（省略時は DEFAULT_PDF_GLOB に一致するファイル）
+
+        Returns:
+            Glossary: 用語集
+        """
+        glossary = cls()
+        template = Path(template_path) if template_path else DEFAULT_TEMPLATE_PATH
+        if template.exists():
+            glossary.load_template(template)
+        if pdf_paths is None:
+            pdf_paths = sorted(_REPO_ROOT.glob(DEFAULT_PDF_GLOB))
+        for pdf_path in pdf_paths:
+            if Path(pdf_path).exists():
+                glossary.load_pdf_extraction(Path(pdf_path))
+        if glossary.skipped_cid:
+            print(f"[INFO] 用語集: CIDコードを含む訳語 {glossary.skipped_cid}件を読み飛ばしました（APIで翻訳します）")
+        return glossary
+
+    def lookup(self, text: str, source_lang: Optional[str], target_lang: str) -> Optional[tuple[str, str]]:
+        """
+        用語を検索（完全一致 → 正規化キーの順）
+
+        Args:
+            text (str): 検索するテキスト
+            source_lang (str): ソース言語コード（Noneの場合は検索しない）
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            tuple: (訳語, 出典ファイル名)、見つからない場合はNone
+        """
+        if source_lang is None:
+            return None
+        entry = self._exact.get((source_lang, target_lang, text.strip()))
+        if entry is None:
+            entry = self._normalized.get((source_lang, target_lang, normalize_key(text)))
+        return entry
+
+    def get_many(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[Optional[str]]:
+        """
+        複数の用語を入力順に検索
+
+        Args:
+            texts (list[str]): 検索するテキストのリスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            list[Optional[str]]: 訳語のリスト（見つからないものはNone）
+        """
+        results = []
+        for text in texts:
+            entry = self.lookup(text, source_lang, target_lang)
+            results.append(entry[0] if entry else None)
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(results) - found
+        return results
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+
+_default_glossary: Optional[Glossary] = None
+_default_lock = threading.Lock()
+
+
+def get_default_glossary() -> Optional[Glossary]:
+    """
+    環境変数の設定に従って共有の用語集を取得（初回呼び出し時に1回だけ読み込む）
+
+    環境変数:
+        TRANSLATION_GLOSSARY_DISABLED: "1" の場合は用語集を使わない
+        TRANSLATION_GLOSSARY_TEMPLATE: テンプレートCSVのパス
+
+    Returns:
+        Glossary: 用語集（無効化されている場合はNone）
+    """
+    global _default_glossary
+
+    if os.getenv("TRANSLATION_GLOSSARY_DISABLED") == "1":
+        return None
+
+    with _default_lock:
+        if _default_glossary is None:
+            _default_glossary = Glossary.from_files(os.getenv("TRANSLATION_GLOSSARY_TEMPLATE"))
+    return _default_glossary
+
+
+if __name__ == "__main__":
+    glossary = Glossary.from_files()
+    print("=" * 60)
+    print("用語集")
+    print("=" * 60)
+    for source in glossary.sources:
+        print(f"  {source}")
+    print(f"登録数: {len(glossary)}件（言語コードの別名を含む）")
+    print(f"CIDコードで読み飛ばした訳語: {glossary.skipped_cid}件")
+    for word in ["工場", "安全", "技能実習生"]:
+        print(f"  {word} → en: {glossary.lookup(word, 'ja', 'en')}")
@@ -0,0 +1,155 @@
+"""
+Translation API用の共通HTTPクライアント
+コネクションプール付きのrequests.Sessionを共有し（keep-alive）、
+429/5xx・通信エラー時はジッター付き指数バックオフで再試行する
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from translation_telemetry import get_default_telemetry
+
+
+# 再試行するHTTPステータスコード
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 再試行の設定
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 0.5    # 秒
+DEFAULT_BACKOFF_MAX = 30.0    # 秒
+DEFAULT_TIMEOUT = 30.0        # 秒
+
+# コネクションプールのサイズ（並列翻訳の同時実行数より大きくする）
+POOL_MAXSIZE = 32
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    共有のrequests.Sessionを取得（初回呼び出し時に作成）
+
+    Returns:
+        requests.Session: コネクションプール付きのセッション
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Retry-Afterヘッダーの待機秒数を取得（秒数・HTTP日付の両形式に対応）
+
+    Args:
+        response (requests.Response): レスポンス
+
+    Returns:
+        float: 待機秒数（ヘッダーがない場合はNone）
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, maximum: float = DEFAULT_BACKOFF_MAX) -> float:
+    """
+    ジッター付き指数バックオフの待機秒数（full jitter）
+
+    Args:
+        attempt (int): 再試行回数（0始まり）
+        base (float): 基準秒数
+        maximum (float): 最大秒数
+
+    Returns:
+        float: 待機秒数
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def request_with_retry(
+    method: str,
+    url: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_base: float = DEFAULT_BACKOFF_BASE,
+    backoff_max: float = DEFAULT_BACKOFF_MAX,
+    timeout: float = DEFAULT_TIMEOUT,
+    retry_status_codes: Optional[set[int]] = None,
+    **kwargs
+) -> requests.Response:
+    """
+    共有セッションでHTTPリクエストを送信し、一時的なエラーは再試行する
+
+    429/5xxの場合はRetry-Afterヘッダーを優先し、なければジッター付き指数バックオフで待機する。
+    再試行回数を使い切った場合は最後のレスポンスをそのまま返す（ステータスの判定は呼び出し側）。
+
+    Args:
+        method (str): HTTPメソッド（"GET", "POST"）
+        url (str): リクエストURL
+        max_retries (int): 最大再試行回数（デフォルト: 5）
+        backoff_base (float): バックオフの基準秒数
+        backoff_max (float): バックオフの最大秒数
+        timeout (float): タイムアウト秒数
+        retry_status_codes (set[int]): 再試行するステータスコード（省略時は RETRY_STATUS_CODES）
+        **kwargs: requests.Session.requestに渡す引数（params, jsonなど）
+
+    Returns:
+        requests.Response: レスポンス
+
+    Raises:
+        requests.exceptions.RequestException: 再試行しても通信エラーが解消しない場合
+
+    例:
+        response = request_with_retry("POST", BASE_URL, params={"key": API_KEY}, json=body)
+    """
+    if retry_status_codes is None:
+        retry_status_codes = RETRY_STATUS_CODES
+    session = get_session()
+    telemetry = get_default_telemetry()
+    attempt = 0
+    while True:
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt >= max_retries:
+                raise
+            if telemetry is not None:
+                telemetry.record_retry()
+            time.sleep(backoff_delay(attempt, backoff_base, backoff_max))
+            attempt += 1
+            continue
+
+        if telemetry is not None and response.status_code == 429:
+            telemetry.record_throttled()
+        if response.status_code not in retry_status_codes or attempt >= max_retries:
+            return response
+
+        if telemetry is not None:
+            telemetry.record_retry(response.status_code)
+
+        delay = retry_after_seconds(response)
+        if delay is None:
+            delay = backoff_delay(attempt, backoff_base, backoff_max)
+        print(f"  [RETRY] ステータスコード {response.status_code}: {delay:.1f}秒後に再試行します（{attempt + 1}/{max_retries}）")
+        time.sleep(min(delay, backoff_max))
+        attempt += 1
@@ -0,0 +1,135 @@
+"""
+言語コードの共通定義
+テンプレート（core_files/language_codes_41.json）の言語コードと
+Translation APIの言語コード・日本語の言語名（core_files/language_code_mapping.json）の対応をまとめる
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+# 41言語の言語コードリスト（テンプレートの列順）
+LANGUAGE_CODES_FILE = Path(__file__).parent.parent.parent / "core_files" / "language_codes_41.json"
+
+# 言語コード → 日本語の言語名
+LANGUAGE_MAPPING_FILE = Path(__file__).parent.parent.parent / "core_files" / "language_code_mapping.json"
+
+# テンプレートの言語コード → Translation APIの言語コード（記載のないものはそのまま）
+API_LANG_CODES = {
+    "zh": "zh-CN",
+    "fil-PH": "tl",
+    "pt-BR": "pt",
+    "es-MX": "es",
+    "ar-AE": "ar",
+    "ar-EG": "ar",
+    "fr-CA": "fr",
+}
+
+
+def to_api_lang(code: str) -> str:
+    """
+    テンプレートの言語コードをTranslation APIの言語コードに変換
+
+    Args:
+        code (str): テンプレートの言語コード（"fil-PH"など）
+
+    Returns:
+        str: APIの言語コード（"tl"など）
+    """
+    return API_LANG_CODES.get(code, code)
+
+
+def load_template_languages(path: Optional[str] = None) -> list[str]:
+    """
+    テンプレートの言語コード（日本語を除く）を列順に読み込む
+
+    Args:
+        path (str): 言語コードリストのJSONファイル（省略時は core_files/language_codes_41.json）
+
+    Returns:
+        list[str]: 言語コードのリスト
+    """
+    with open(path or LANGUAGE_CODES_FILE, "r", encoding="utf-8") as f:
+        codes = json.load(f)["language_codes"]
+    return [code for code in codes if code != "ja"]
+
+
+class LanguageRegistry:
+    """
+    言語コードの一覧（日本語の言語名・APIの言語コード・テンプレートの列順）
+
+    各スクリプトで別々に持っていた lang_mapping / api_lang_codes の代わりに使う。
+
+    例:
+        registry = get_language_registry()
+        registry.name("fil-PH")       # "タガログ語（フィリピン）"
+        registry.api_code("fil-PH")   # "tl"
+        "km" in registry              # True
+    """
+
+    def __init__(self, names: dict[str, str], template_codes: Optional[list[str]] = None):
+        """
+        Args:
+            names (dict): {言語コード: 日本語の言語名}
+            template_codes (list[str]): テンプレートの言語コード（列順、日本語を除く）
+        """
+        self.names = names
+        self.template_codes = template_codes or []
+
+    @classmethod
+    def load(cls, mapping_path: Optional[str] = None, codes_path: Optional[str] = None) -> "LanguageRegistry":
+        """
+        言語名のJSONと言語コードリストのJSONから作成
+
+        Args:
+            mapping_path (str): 言語名のJSON（省略時は core_files/language_code_mapping.json）
+            codes_path (str): 言語コードリストのJSON（省略時は core_files/language_codes_41.json）
+
+        Returns:
+            LanguageRegistry: 言語コードの一覧
+        """
+        with open(mapping_path or LANGUAGE_MAPPING_FILE, "r", encoding="utf-8") as f:
+            names = json.load(f)
+        return cls(names, load_template_languages(codes_path))
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.names
+
+    def name(self, code: str) -> str:
+        """日本語の言語名（登録されていない場合は言語コード）"""
+        return self.names.get(code, code)
+
+    def api_code(self, code: str) -> str:
+        """Translation APIの言語コード"""
+        return to_api_lang(code)
+
+    def translatable_columns(self, columns) -> list[str]:
+        """
+        列名のうち翻訳対象の言語コード（日本語以外で登録されているもの）を列順に返す
+
+        Args:
+            columns: 列名のリスト（DataFrame.columnsなど）
+
+        Returns:
+            list[str]: 言語コードのリスト
+        """
+        return [col for col in columns if col != "ja" and col in self.names]
+
+
+_registry: Optional[LanguageRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_language_registry() -> LanguageRegistry:
+    """
+    共有の言語コード一覧を取得（初回呼び出し時に読み込む）
+
+    Returns:
+        LanguageRegistry: 言語コードの一覧
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LanguageRegistry.load()
+    return _registry
@@ -5,16 +5,15 @@ import os
 from pathlib import Path
 
 
-def load_google_api_key():
+def _read_env_values() -> dict:
     """
-    .envファイルからGOOGLE_API_KEYを読み込む
+    .envファイルのKEY=VALUEを読み込む
 
     Returns:
-        str: Google API Key
+        dict: {キー: 値}（値のクォートは除去済み）
 
     Raises:
         FileNotFoundError: .envファイルが見つからない場合
-        ValueError: GOOGLE_API_KEYが.envファイルに存在しない場合
     """
     # プロジェクトルートディレクトリのパスを取得（scriptsフォルダの親）
     project_root = Path(__file__).parent.parent
@@ -24,6 +23,7 @@ def load_google_api_key():
     if not env_path.exists():
         raise FileNotFoundError(f".envファイルが見つかりません: {env_path}")
 
+    values = {}
     # .envファイルを読み込む
     with open(env_path, "r", encoding="utf-8") as f:
         for line in f:
@@ -39,25 +39,63 @@ def load_google_api_key():
                 key = key.strip()
                 value = value.strip()
 
-                # GOOGLE_API_KEYを探す
-                if key == "GOOGLE_API_KEY":
-                    # クォートを除去（もしあれば）
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
+                # クォートを除去（もしあれば）
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                elif value.startswith("'") and value.endswith("'"):
+                    value = value[1:-1]
+
+                values.setdefault(key, value)
+    return values
+
+
+def load_google_api_key():
+    """
+    .envファイルからGOOGLE_API_KEYを読み込む
 
-                    return value
+    Returns:
+        str: Google API Key
+
+    Raises:
+        FileNotFoundError: .envファイルが見つからない場合
+        ValueError: GOOGLE_API_KEYが.envファイルに存在しない場合
+    """
+    values = _read_env_values()
+    if "GOOGLE_API_KEY" in values:
+        return values["GOOGLE_API_KEY"]
 
     # GOOGLE_API_KEYが見つからなかった場合
     raise ValueError(".envファイルにGOOGLE_API_KEYが定義されていません")
 
 
+def load_google_api_keys():
+    """
+    .envファイルからAPIキーの一覧（キープール用）を読み込む
+
+    GOOGLE_API_KEYS（カンマ区切り）があればその一覧、なければGOOGLE_API_KEYの1件を返す。
+
+    Returns:
+        list[str]: APIキーのリスト
+
+    Raises:
+        FileNotFoundError: .envファイルが見つからない場合
+        ValueError: どちらも.envファイルに存在しない場合
+    """
+    values = _read_env_values()
+    keys = [k.strip() for k in values.get("GOOGLE_API_KEYS", "").split(",") if k.strip()]
+    if keys:
+        return keys
+    if values.get("GOOGLE_API_KEY"):
+        return [values["GOOGLE_API_KEY"]]
+    raise ValueError(".envファイルにGOOGLE_API_KEYSまたはGOOGLE_API_KEYが定義されていません")
+
+
 if __name__ == "__main__":
     # テスト実行
     try:
         GOOGLE_API_KEY = load_google_api_key()
         print("[OK] GOOGLE_API_KEYを読み込みました")
         print(f"APIキーの長さ: {len(GOOGLE_API_KEY)} 文字")
+        print(f"キープール: {len(load_google_api_keys())}件")
     except Exception as e:
         print(f"[ERROR] {e}")
@@ -0,0 +1,149 @@
+"""
+翻訳実行のジャーナル（再開用チェックポイント）
+完了したチャンクを1行ずつJSONLに追記し、途中で停止しても
+--resume で完了済みのチャンクを再利用して残りだけを翻訳できるようにする
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def chunk_hash(texts: list[str], source_lang: Optional[str], target_lang: str) -> str:
+    """
+    チャンクの入力ハッシュ（SHA-256）を計算
+
+    Args:
+        texts (list[str]): チャンクのテキストリスト
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+
+    Returns:
+        str: 16進数のハッシュ値
+    """
+    payload = json.dumps([source_lang or "auto", target_lang, texts], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RunJournal:
+    """
+    完了したチャンクを記録する追記型ジャーナル
+
+    例:
+        journal = RunJournal("output/run_journal.jsonl", resume=True)
+        cached = journal.get_many(["dog", "cat"], "en", "ja")   # 完了済みなら翻訳結果
+        journal.record(["dog"], ["犬"], "en", "ja")
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path (str): ジャーナルファイル（JSONL）のパス
+            resume (bool): Trueの場合は既存のジャーナルを読み込んで再開、
+                Falseの場合は新しいジャーナルを作成（既存の内容は破棄）
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.replayed = 0
+        self._lock = threading.Lock()
+        # (テキスト, ソース言語, ターゲット言語) -> 翻訳結果
+        self._entries: dict[tuple[str, str, str], str] = {}
+        self.chunk_count = 0
+
+        if resume and self.path.exists():
+            self._load()
+        else:
+            self.path.write_text("", encoding="utf-8")
+
+    def _load(self) -> None:
+        """
+        既存のジャーナルを読み込む
+
+        停止時に書き込み途中だった最終行（マルチバイト文字の途中で切れた行を含む）は読み飛ばし、
+        ファイルを最後の完全な行の終わりまで切り詰める（次のrecord()が壊れた行の続きに書かれないように）。
+        """
+        complete_end = 0
+        missing_newline = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 改行のない最終行: JSONとして完全なら改行を補い、途中で切れていれば捨てる
+                    if self._load_line(line):
+                        complete_end = f.tell()
+                        missing_newline = True
+                    break
+                self._load_line(line)
+                complete_end = f.tell()
+            size = f.tell()
+
+        if complete_end < size:
+            with open(self.path, "r+b") as f:
+                f.truncate(complete_end)
+        elif missing_newline:
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+
+    def _load_line(self, line: bytes) -> bool:
+        """
+        ジャーナルの1行を読み込む
+
+        Returns:
+            bool: 読み込めた場合はTrue（書き込み途中・文字化けの行はFalse）
+        """
+        try:
+            record = json.loads(line.decode("utf-8"))
+            entries = [
+                ((text, record["source"], record["target"]), output)
+                for text, output in zip(record["inputs"], record["outputs"])
+            ]
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError):
+            return False
+        self._entries.update(entries)
+        self.chunk_count += 1
+        return True
+
+    def get_many(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[Optional[str]]:
+        """
+        完了済みの翻訳結果を入力順に取得
+
+        Args:
+            texts (list[str]): テキストのリスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            list[Optional[str]]: 翻訳結果のリスト（未完了はNone）
+        """
+        source = source_lang or "auto"
+        results = [self._entries.get((text, source, target_lang)) for text in texts]
+        self.replayed += sum(1 for r in results if r is not None)
+        return results
+
+    def record(self, texts: list[str], outputs: list[str], source_lang: Optional[str], target_lang: str) -> None:
+        """
+        完了したチャンクを追記（すぐにディスクへ書き出す）
+
+        Args:
+            texts (list[str]): チャンクのテキストリスト
+            outputs (list[str]): 翻訳結果のリスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+        """
+        source = source_lang or "auto"
+        line = json.dumps({
+            "hash": chunk_hash(texts, source_lang, target_lang),
+            "source": source,
+            "target": target_lang,
+            "inputs": texts,
+            "outputs": outputs
+        }, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for text, output in zip(texts, outputs):
+                self._entries[(text, source, target_lang)] = output
+            self.chunk_count += 1
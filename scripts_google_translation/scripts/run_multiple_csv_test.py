@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from batch_translator import translate_from_multiple_csv
+from translation_telemetry import write_run_summary
 
 
 if __name__ == "__main__":
@@ -53,6 +54,9 @@ if __name__ == "__main__":
 
         print("=" * 70)
 
+        # 言語ペアごとのリクエスト数・応答時間・再試行などを書き出す
+        write_run_summary()
+
     except Exception as e:
         print(f"\n[ERROR] {e}")
         import traceback
@@ -0,0 +1,104 @@
+"""
+Unicode文字種（スクリプト）によるオフラインの言語判定
+1つの言語でしか使われない文字（タイ文字・クメール文字・ミャンマー文字・ハングルなど）だけで
+書かれたテキストは、言語検出APIを呼ばずに言語を決める
+
+判定する文字種（テンプレートの言語の中でその文字を使う言語が1つだけのもの）:
+    タイ文字 → th、ラオ文字 → lo、クメール文字 → km、ミャンマー文字 → my、
+    ハングル → ko、シンハラ文字 → si、タミル文字 → ta、ひらがな・カタカナ（+漢字） → ja
+
+漢字だけ（ja/zh）、アラビア文字（ar/fa/ur）、キリル文字、デーヴァナーガリー（hi/ne）、
+ラテン文字だけのテキストは判定せずNoneを返す（APIで検出する）。
+"""
+import unicodedata
+from typing import Optional
+
+
+# (開始, 終了, 言語コード)
+_SCRIPT_RANGES = [
+    (0x0B80, 0x0BFF, "ta"),
+    (0x0D80, 0x0DFF, "si"),
+    (0x0E00, 0x0E7F, "th"),
+    (0x0E80, 0x0EFF, "lo"),
+    (0x1000, 0x109F, "my"),
+    (0x1100, 0x11FF, "ko"),
+    (0x1780, 0x17FF, "km"),
+    (0x19E0, 0x19FF, "km"),
+    (0x3040, 0x309F, "ja"),
+    (0x30A0, 0x30FF, "ja"),
+    (0x3130, 0x318F, "ko"),
+    (0x31F0, 0x31FF, "ja"),
+    (0xA960, 0xA97F, "ko"),
+    (0xA9E0, 0xA9FF, "my"),
+    (0xAA60, 0xAA7F, "my"),
+    (0xAC00, 0xD7AF, "ko"),
+    (0xD7B0, 0xD7FF, "ko"),
+]
+
+# 漢字（日本語のかなと一緒に使われる場合は日本語として扱う）
+_HAN_RANGES = [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)]
+
+# 判定に必要な文字種の割合（文字のうち、この割合以上が同じ言語の文字なら判定する）
+DEFAULT_MIN_SHARE = 0.8
+
+
+def _script_of(char: str) -> Optional[str]:
+    """1文字の言語コード（判定する文字種の場合）、"han"（漢字）、"latin"、"other"、None（文字でない）"""
+    if not unicodedata.category(char).startswith(("L", "M")):
+        return None
+    code = ord(char)
+    for start, end, lang in _SCRIPT_RANGES:
+        if start <= code <= end:
+            return lang
+    for start, end in _HAN_RANGES:
+        if start <= code <= end:
+            return "han"
+    if code < 0x0250 or 0x1E00 <= code <= 0x1EFF:
+        # ラテン文字（ベトナム語の拡張を含む）
+        return "latin"
+    return "other"
+
+
+def classify_script(text: str, min_share: float = DEFAULT_MIN_SHARE) -> Optional[str]:
+    """
+    文字種からテキストの言語を判定（判定できない場合はNone）
+
+    文字（記号・数字・空白を除く）のうちmin_share以上が1つの言語の文字で、
+    残りがラテン文字（略語・単位など）だけの場合に判定する。
+    かなを含み、残りが漢字・ラテン文字だけの場合は日本語とする。
+
+    Args:
+        text (str): 判定するテキスト
+        min_share (float): 判定に必要な文字の割合（0〜1）
+
+    Returns:
+        str: 言語コード（"th", "km", "my", "ko" など）、判定できない場合はNone
+
+    例:
+        classify_script("ความปลอดภัย")   # "th"
+        classify_script("安全第一")       # None（日本語・中国語のどちらか分からない）
+    """
+    counts: dict[str, int] = {}
+    for char in text:
+        script = _script_of(char)
+        if script is not None:
+            counts[script] = counts.get(script, 0) + 1
+
+    total = sum(counts.values())
+    if not total:
+        return None
+    if counts.get("other"):
+        return None
+
+    languages = {k: v for k, v in counts.items() if k not in ("han", "latin")}
+    if len(languages) != 1:
+        return None
+    lang, count = next(iter(languages.items()))
+
+    if lang == "ja":
+        # かな + 漢字で書かれた日本語
+        count += counts.get("han", 0)
+    elif counts.get("han"):
+        return None
+
+    return lang if count / total >= min_share else None
@@ -0,0 +1,334 @@
+"""
+Translation API v2 のローカル代替サーバー（オフラインのベンチマーク・テスト用）
+/language/translate/v2, /detect, /languages を模倣し、決定的な偽の翻訳を返す
+
+使い方:
+    python stub_translation_server.py [ポート番号]
+
+    # 別のターミナルで（.envに書いてもよい）
+    set TRANSLATION_API_BASE_URL=http://127.0.0.1:8765/language/translate/v2
+
+設定（環境変数）:
+    STUB_LATENCY_MS: 1リクエストの応答遅延（ミリ秒、デフォルト: 0）
+    STUB_LATENCY_JITTER_MS: 遅延のばらつき（ミリ秒、デフォルト: 0）
+    STUB_ERROR_RATE: 500エラーを返す確率（0〜1、デフォルト: 0）
+    STUB_RATE_429: 429エラーを返す確率（0〜1、デフォルト: 0）
+    STUB_RETRY_AFTER: 429のRetry-Afterヘッダー（秒、デフォルト: 1）
+    STUB_MAX_SEGMENTS: 1リクエストの最大セグメント数（デフォルト: 128）
+    STUB_MAX_CHARS: 1リクエストの最大文字数（デフォルト: 30000）
+    STUB_REJECTED_KEYS: 403エラーを返すAPIキー（カンマ区切り、キープールのテスト用）
+    STUB_SEED: 乱数シード（省略時はランダム）
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+API_PATH = "/language/translate/v2"
+
+# 偽の翻訳に付ける言語タグ（"[en] 犬" のような形式）
+_TAG_PATTERN = re.compile(r"^\[[A-Za-z-]+\] ")
+
+# 言語検出用の簡易判定（文字種 → 言語コード）
+_SCRIPT_RANGES = [
+    ("\u3040", "\u30ff", "ja"),     # ひらがな・カタカナ
+    ("\u0e00", "\u0e7f", "th"),     # タイ文字
+    ("\u1780", "\u17ff", "km"),     # クメール文字
+    ("\u1000", "\u109f", "my"),     # ミャンマー文字
+    ("\uac00", "\ud7af", "ko"),     # ハングル
+    ("\u4e00", "\u9fff", "zh-CN"),  # 漢字（かなを含まない場合）
+]
+
+_LANGUAGES = [
+    "ja", "en", "zh-CN", "vi", "tl", "ne", "pt", "es", "th", "id", "my", "ko", "mn",
+    "ar", "fa", "tr", "ru", "hi", "ur", "bn", "si", "ta", "km", "lo", "ms", "de",
+    "hu", "cs", "pl", "nl", "da", "fi", "sv", "lb", "af", "fr", "it", "uk"
+]
+
+
+def fake_translate(text: str, target_lang: str) -> str:
+    """
+    決定的な偽の翻訳（既存の言語タグを外してターゲット言語のタグを付ける）
+
+    Args:
+        text (str): 翻訳元テキスト
+        target_lang (str): ターゲット言語コード
+
+    Returns:
+        str: "[ターゲット言語] テキスト" 形式の文字列
+    """
+    return f"[{target_lang}] {_TAG_PATTERN.sub('', text)}"
+
+
+def fake_detect(text: str) -> str:
+    """
+    文字種から言語を簡易判定（判定できない場合は "en"）
+
+    Args:
+        text (str): 判定するテキスト
+
+    Returns:
+        str: 言語コード
+    """
+    match = _TAG_PATTERN.match(text)
+    if match:
+        return match.group(0)[1:-2]
+    for char in text:
+        for start, end, lang in _SCRIPT_RANGES:
+            if start <= char <= end:
+                return lang
+    return "en"
+
+
+class StubConfig:
+    """代替サーバーの動作設定"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        latency_jitter_ms: float = 0,
+        error_rate: float = 0,
+        rate_429: float = 0,
+        retry_after: float = 1,
+        max_segments: int = 128,
+        max_chars: int = 30000,
+        rejected_keys: Optional[set[str]] = None,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.max_segments = max_segments
+        self.max_chars = max_chars
+        self.rejected_keys = set(rejected_keys or ())
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        # 受信したリクエストの統計
+        self.request_count = 0
+        self.segment_count = 0
+        self.char_count = 0
+        self.error_count = 0
+        self.throttled_count = 0
+        self.rejected_count = 0
+        # APIキーごとの受信リクエスト数
+        self.key_counts: dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "StubConfig":
+        """環境変数から設定を読み込む"""
+        seed = os.getenv("STUB_SEED")
+        return cls(
+            latency_ms=float(os.getenv("STUB_LATENCY_MS", "0")),
+            latency_jitter_ms=float(os.getenv("STUB_LATENCY_JITTER_MS", "0")),
+            error_rate=float(os.getenv("STUB_ERROR_RATE", "0")),
+            rate_429=float(os.getenv("STUB_RATE_429", "0")),
+            retry_after=float(os.getenv("STUB_RETRY_AFTER", "1")),
+            max_segments=int(os.getenv("STUB_MAX_SEGMENTS", "128")),
+            max_chars=int(os.getenv("STUB_MAX_CHARS", "30000")),
+            rejected_keys={k.strip() for k in os.getenv("STUB_REJECTED_KEYS", "").split(",") if k.strip()},
+            seed=int(seed) if seed else None
+        )
+
+    def stats(self) -> dict:
+        """受信したリクエストの統計を取得"""
+        with self.lock:
+            return {
+                "requests": self.request_count,
+                "segments": self.segment_count,
+                "characters": self.char_count,
+                "errors": self.error_count,
+                "throttled": self.throttled_count,
+                "rejected": self.rejected_count,
+                "keys": dict(self.key_counts)
+            }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Translation API v2 の模倣ハンドラー"""
+
+    # keep-aliveを有効にする（本物のAPIと同じくコネクションを再利用できるように）
+    protocol_version = "HTTP/1.1"
+    # ヘッダーと本文を別々に送るため、Nagleアルゴリズムによる遅延（約40ms）を無効にする
+    disable_nagle_algorithm = True
+    config: StubConfig = None
+
+    def log_message(self, format, *args):
+        # アクセスログは出力しない
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+        self._send_json(status, {"error": {"code": status, "message": message}}, headers)
+
+    def _read_params(self) -> dict:
+        """クエリ・フォーム・JSONボディのパラメータを1つのdictにまとめる（qは常にリスト）"""
+        parsed = urlparse(self.path)
+        params = {key: values for key, values in parse_qs(parsed.query).items()}
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length).decode("utf-8")
+            if "json" in (self.headers.get("Content-Type") or ""):
+                for key, value in json.loads(raw).items():
+                    params[key] = value if isinstance(value, list) else [value]
+            else:
+                for key, values in parse_qs(raw).items():
+                    params.setdefault(key, []).extend(values)
+
+        result = {key: values[0] for key, values in params.items() if key != "q"}
+        result["q"] = params.get("q", [])
+        return result
+
+    def _inject_faults(self, segments: list[str], key: Optional[str] = None) -> bool:
+        """遅延・403（拒否するキー）・エラー・429・上限チェックを適用（エラー応答を返した場合はTrue）"""
+        config = self.config
+        with config.lock:
+            config.request_count += 1
+            config.key_counts[key] = config.key_counts.get(key, 0) + 1
+            roll = config.random.random()
+            jitter = config.random.uniform(-1, 1) * config.latency_jitter_ms
+
+        delay = max(0.0, config.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+
+        if key in config.rejected_keys:
+            with config.lock:
+                config.rejected_count += 1
+            self._send_error(403, "Daily Limit Exceeded (stub)")
+            return True
+        if roll < config.rate_429:
+            with config.lock:
+                config.throttled_count += 1
+            self._send_error(429, "Rate Limit Exceeded", {"Retry-After": str(config.retry_after)})
+            return True
+        if roll < config.rate_429 + config.error_rate:
+            with config.lock:
+                config.error_count += 1
+            self._send_error(500, "Internal error (stub)")
+            return True
+        if len(segments) > config.max_segments:
+            self._send_error(400, f"Too many text segments (max {config.max_segments})")
+            return True
+        if sum(len(s) for s in segments) > config.max_chars:
+            self._send_error(400, f"Text too long (max {config.max_chars} characters)")
+            return True
+
+        with config.lock:
+            config.segment_count += len(segments)
+            config.char_count += sum(len(s) for s in segments)
+        return False
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        params = self._read_params()
+        segments = params["q"]
+
+        if path == API_PATH:
+            if not params.get("target"):
+                self._send_error(400, "Required Text/Target is missing")
+                return
+            if self._inject_faults(segments, params.get("key")):
+                return
+            translations = []
+            for text in segments:
+                item = {"translatedText": fake_translate(text, params["target"])}
+                if not params.get("source"):
+                    item["detectedSourceLanguage"] = fake_detect(text)
+                translations.append(item)
+            self._send_json(200, {"data": {"translations": translations}})
+        elif path == API_PATH + "/detect":
+            if self._inject_faults(segments, params.get("key")):
+                return
+            detections = [[{"language": fake_detect(text), "confidence": 1.0, "isReliable": False}] for text in segments]
+            self._send_json(200, {"data": {"detections": detections}})
+        else:
+            self._send_error(404, f"Not found: {path}")
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if path == API_PATH + "/languages":
+            if self._inject_faults([]):
+                return
+            params = self._read_params()
+            languages = [
+                {"language": code, "name": code} if params.get("target") else {"language": code}
+                for code in _LANGUAGES
+            ]
+            self._send_json(200, {"data": {"languages": languages}})
+        else:
+            self._send_error(404, f"Not found: {path}")
+
+
+def start_stub_server(
+    port: int = 0,
+    config: Optional[StubConfig] = None,
+    host: str = "127.0.0.1"
+) -> tuple[ThreadingHTTPServer, str]:
+    """
+    代替サーバーをバックグラウンドスレッドで起動
+
+    Args:
+        port (int): ポート番号（0の場合は空いているポートを自動選択）
+        config (StubConfig): 動作設定（省略時は環境変数から読み込み）
+        host (str): 待ち受けアドレス
+
+    Returns:
+        tuple: (サーバー, ベースURL)
+            ベースURLはTRANSLATION_API_BASE_URLにそのまま設定できる形式
+            停止するときは server.shutdown() を呼ぶ
+
+    例:
+        server, base_url = start_stub_server(config=StubConfig(latency_ms=50, rate_429=0.1))
+        os.environ["TRANSLATION_API_BASE_URL"] = base_url
+    """
+    handler = type("StubHandler", (_StubHandler,), {"config": config or StubConfig.from_env()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_port}{API_PATH}"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    config = StubConfig.from_env()
+    server, base_url = start_stub_server(port, config)
+
+    print("=" * 60)
+    print("Translation API 代替サーバー（ローカル）")
+    print("=" * 60)
+    print(f"ベースURL: {base_url}")
+    print(f"遅延: {config.latency_ms}ms（±{config.latency_jitter_ms}ms）")
+    print(f"エラー率: {config.error_rate}、429率: {config.rate_429}")
+    print(f"上限: {config.max_segments}セグメント / {config.max_chars}文字")
+    print()
+    print("翻訳スクリプト側で以下を設定してください:")
+    print(f"  TRANSLATION_API_BASE_URL={base_url}")
+    print("\n停止: Ctrl+C")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n[INFO] 停止しました: {config.stats()}")
@@ -0,0 +1,223 @@
+"""
+ローカル代替サーバー（stub_translation_server.py）を使ったオフラインテスト
+APIキーなしで、チャンク分割・キャッシュ（正規化キー）・重複除去・ジャーナルからの再開・キープールの切り替え
+（とテレメトリのパーセンタイル計算）を確認する
+
+使い方:
+    python test_offline_stub.py
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from stub_translation_server import StubConfig, start_stub_server, fake_translate
+
+# translatorはimport時に接続先を読み込むため、先に代替サーバーを起動して環境変数を設定する
+# （.envの値より優先される）
+_TEMP_DIR = Path(tempfile.mkdtemp(prefix="translation_offline_test_"))
+CONFIG = StubConfig(max_segments=128, max_chars=5000, seed=0)
+SERVER, BASE_URL = start_stub_server(config=CONFIG)
+os.environ.update({
+    "TRANSLATION_API_BASE_URL": BASE_URL,
+    "GOOGLE_API_KEY": "",
+    "GOOGLE_API_KEYS": "testkey",
+    "GOOGLE_APPLICATION_CREDENTIALS_POOL": "",
+    "TRANSLATION_KEY_COOLDOWN_SEC": "0.5",
+    "TRANSLATION_CACHE_DISABLED": "0",
+    "TRANSLATION_CACHE_PATH": str(_TEMP_DIR / "translation_cache.db"),
+    "TRANSLATION_GLOSSARY_DISABLED": "1",
+    "TRANSLATION_MEMORY_ENABLED": "0",
+    "TRANSLATION_MEMORY_REUSE_THRESHOLD": "",
+    "TRANSLATION_CHAR_BUDGET": "",
+    "TRANSLATION_TELEMETRY_DISABLED": "1",
+})
+
+import api_key_pool
+import translator
+from api_key_pool import KeyRejectedError
+from async_translator import AsyncTranslationEngine
+from run_journal import RunJournal
+from translation_planner import TranslationPlanner
+from translation_telemetry import percentile
+
+
+def use_keys(keys: str) -> None:
+    """キープールの設定（GOOGLE_API_KEYS）を切り替える"""
+    os.environ["GOOGLE_API_KEYS"] = keys
+    api_key_pool._default_pools.clear()
+
+
+def engine_translate(engine, words):
+    """AsyncTranslationEngineで ja → en を翻訳（失敗したチャンクはNone）"""
+    return asyncio.run(engine.translate(words, "ja", "en", raise_on_error=False))
+
+
+def test_chunking():
+    """チャンク分割: セグメント数・文字数の上限ごとに分けて送信し、入力順に戻す"""
+    words = [f"単語{i}" for i in range(300)]
+    before = CONFIG.stats()
+    results = translator.translate_words(words, "ja", "en", use_cache=False, use_glossary=False)
+    after = CONFIG.stats()
+    assert results == [fake_translate(w, "en") for w in words], "翻訳結果の順番が入力と違います"
+    assert after["requests"] - before["requests"] == 3, f"300件は3リクエスト（128件ずつ）のはず: {after['requests'] - before['requests']}"
+
+    # 1件3000文字の単語は5000文字の上限で1件ずつ送る
+    long_words = [c * 3000 for c in "あいう"]
+    before = CONFIG.stats()
+    results = translator.translate_words(long_words, "ja", "en", use_cache=False, use_glossary=False)
+    after = CONFIG.stats()
+    assert results == [fake_translate(w, "en") for w in long_words]
+    assert after["requests"] - before["requests"] == 3, "文字数の上限で3リクエストに分かれるはず"
+
+
+def test_cache_normalization():
+    """キャッシュ: 正規化キーが同じ単語は1回だけ送信し、2回目はAPIを呼ばない"""
+    before = CONFIG.stats()
+    results = translator.translate_words(["犬", " 犬 ", "犬"], "ja", "en", use_glossary=False)
+    after = CONFIG.stats()
+    assert after["segments"] - before["segments"] == 1, f"送信は1件のはず: {after['segments'] - before['segments']}"
+    assert results == ["[en] 犬"] * 3, f"同じキーの単語は同じ翻訳になるはず: {results}"
+
+    before = CONFIG.stats()
+    results = translator.translate_words_with_provenance(["犬", " 犬 "], "ja", "en", use_glossary=False)
+    after = CONFIG.stats()
+    assert after["requests"] == before["requests"], "キャッシュにある単語でAPIを呼んでいます"
+    assert results == [("[en] 犬", "cache")] * 2, f"キャッシュの内容が上書きされています: {results}"
+
+
+def test_dedup_planner():
+    """重複除去: 複数ファイルに同じテキストがあっても1回だけ送信する"""
+    planner = TranslationPlanner()
+    planner.add(["りんご", "みかん"], "ja", "en")   # ファイル1
+    planner.add(["みかん", "ぶどう"], "ja", "en")   # ファイル2（"みかん"は重複）
+    before = CONFIG.stats()
+    planner.execute()
+    after = CONFIG.stats()
+    assert after["segments"] - before["segments"] == 3, "ユニークな3件だけを送信するはず"
+    assert planner.get("みかん", "ja", "en") == "[en] みかん"
+    report = planner.report()
+    assert report["saved_segments"] == 1, f"削減できたテキスト数が違います: {report}"
+
+
+def test_journal_resume():
+    """ジャーナル: 失敗したチャンクだけを再開時に送信する"""
+    words = [f"再開{i}" for i in range(200)]   # 128件 + 72件の2チャンク
+    journal_path = _TEMP_DIR / "run_journal.jsonl"
+
+    def fail_second_chunk(chunk, source_lang, target_lang):
+        if words[-1] in chunk:
+            raise RuntimeError("途中停止（テスト）")
+        return translator._request_chunk(chunk, source_lang, target_lang)
+
+    engine = AsyncTranslationEngine(
+        requests_per_second=None, use_cache=False, use_glossary=False,
+        request_func=fail_second_chunk, journal=RunJournal(str(journal_path))
+    )
+    first = engine_translate(engine, words)
+    assert first[:128] == [fake_translate(w, "en") for w in words[:128]]
+    assert all(r is None for r in first[128:]), "失敗したチャンクの結果はNoneのはず"
+
+    journal = RunJournal(str(journal_path), resume=True)
+    engine = AsyncTranslationEngine(requests_per_second=None, use_cache=False, use_glossary=False, journal=journal)
+    before = CONFIG.stats()
+    second = engine_translate(engine, words)
+    after = CONFIG.stats()
+    assert second == [fake_translate(w, "en") for w in words]
+    assert after["requests"] - before["requests"] == 1, "再開時は失敗したチャンクだけを送信するはず"
+    assert journal.replayed == 128, f"ジャーナルから再利用した件数が違います: {journal.replayed}"
+
+
+def test_journal_torn_line():
+    """ジャーナル: 書き込み途中で切れた最終行を読み飛ばし、その後の記録を失わない"""
+    journal_path = _TEMP_DIR / "torn_journal.jsonl"
+    RunJournal(str(journal_path)).record(["犬"], ["[en] 犬"], "ja", "en")
+
+    # 停止で途切れた最終行（1件目は改行なし、2件目はマルチバイト文字の途中で切れた行）
+    for torn in ['{"inputs": ["ca'.encode("utf-8"), '{"inputs": ["猫'.encode("utf-8")[:-1]]:
+        with open(journal_path, "ab") as f:
+            f.write(torn)
+        journal = RunJournal(str(journal_path), resume=True)
+        journal.record(["鳥"], ["[en] 鳥"], "ja", "en")
+
+    results = RunJournal(str(journal_path), resume=True).get_many(["犬", "鳥"], "ja", "en")
+    assert results == ["[en] 犬", "[en] 鳥"], f"途切れた行の後の記録が失われています: {results}"
+
+
+def test_percentile():
+    """テレメトリ: パーセンタイル（最近傍法）がceil(P/100 * N)番目の値になる"""
+    assert percentile(list(range(1, 11)), 50) == 5, percentile(list(range(1, 11)), 50)
+    assert percentile(list(range(1, 11)), 90) == 9, percentile(list(range(1, 11)), 90)
+    assert percentile(list(range(1, 5)), 50) == 2, percentile(list(range(1, 5)), 50)
+    assert percentile(list(range(1, 11)), 100) == 10
+    assert percentile([], 50) is None
+
+
+def test_key_pool_failover():
+    """キープール: 403のキーから別のキーに切り替え、他にキーがなければすぐにエラーにする"""
+    CONFIG.rejected_keys = {"badkey"}
+    try:
+        use_keys("badkey,goodkey")
+        results = translator.translate_words(["切替"], "ja", "en", use_cache=False, use_glossary=False)
+        assert results == ["[en] 切替"]
+        assert CONFIG.stats()["keys"].get("goodkey", 0) >= 1, "403の後に別のキーで送信するはず"
+
+        use_keys("badkey")
+        before = CONFIG.stats()["keys"].get("badkey", 0)
+        start = time.perf_counter()
+        try:
+            translator.translate_words(["拒否"], "ja", "en", use_cache=False, use_glossary=False)
+        except KeyRejectedError as e:
+            assert e.status_code == 403
+        else:
+            raise AssertionError("403のキーしかない場合はKeyRejectedErrorになるはず")
+        elapsed = time.perf_counter() - start
+        attempts = CONFIG.stats()["keys"].get("badkey", 0) - before
+        assert attempts == 1, f"403を返したキーで再試行しています: {attempts}回"
+        assert elapsed < 0.5, f"クールダウンを待っています: {elapsed:.2f}秒"
+    finally:
+        CONFIG.rejected_keys = set()
+        use_keys("testkey")
+
+
+if __name__ == "__main__":
+    start_time = datetime.now()
+
+    print("\n" + "=" * 70)
+    print("オフラインテスト（ローカル代替サーバー）")
+    print("=" * 70)
+    print(f"ベースURL: {BASE_URL}")
+    print(f"作業フォルダ: {_TEMP_DIR}")
+
+    tests = [
+        test_chunking,
+        test_cache_normalization,
+        test_dedup_planner,
+        test_journal_resume,
+        test_journal_torn_line,
+        test_key_pool_failover,
+        test_percentile,
+    ]
+    failed = 0
+    for test in tests:
+        print(f"\n[{test.__name__}] {test.__doc__}")
+        try:
+            test()
+            print("  [OK]")
+        except Exception as e:
+            failed += 1
+            print(f"  [NG] {type(e).__name__}: {e}")
+
+    SERVER.shutdown()
+    shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+    elapsed = datetime.now() - start_time
+
+    print("\n" + "=" * 70)
+    print(f"結果: {len(tests) - failed}/{len(tests)} 成功（{elapsed.total_seconds():.1f}秒）")
+    print(f"代替サーバーの統計: {CONFIG.stats()}")
+    print("=" * 70)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,337 @@
+"""
+翻訳結果の永続キャッシュ（SQLite版）
+同じ単語を何度もAPIに送らないように、翻訳結果をディスクに保存する
+
+キー: (正規化テキスト, ソース言語, ターゲット言語, format, APIバージョン)
+"""
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+
+# デフォルトの保存先（scripts_google_translation/cache/translation_cache.sqlite3）
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "cache" / "translation_cache.sqlite3"
+
+# SQLiteの変数上限（999）を超えないように分割して検索する
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def normalize_text(text: str) -> str:
+    """
+    キャッシュキー用にテキストを正規化（NFC + 前後の空白除去）
+
+    Args:
+        text (str): 元のテキスト
+
+    Returns:
+        str: 正規化後のテキスト
+    """
+    return unicodedata.normalize("NFC", text).strip()
+
+
+class TranslationCache:
+    """
+    翻訳結果の永続キャッシュ
+
+    例:
+        cache = TranslationCache()
+        cached = cache.get_many(["犬", "猫"], "ja", "en")   # [None, "cat"] など
+        cache.put_many(["犬"], ["dog"], "ja", "en")
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
+        """
+        Args:
+            db_path (str): SQLiteファイルのパス（省略時はDEFAULT_CACHE_PATH）
+            max_entries (int): 保持する最大件数（超過分は最終参照が古い順に削除）
+            max_age_days (float): 保持期間（日数）。これより古いエントリは削除
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+        # 並列翻訳から呼ばれても安全なようにロックで保護
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                text TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                format TEXT NOT NULL,
+                api_version TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (text, source_lang, target_lang, format, api_version)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+        )
+        self._conn.commit()
+
+        # 起動時に期限切れ・件数超過のエントリを削除
+        self.evict()
+
+    def get_many(
+        self,
+        texts: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        fmt: str = "text",
+        api_version: str = "v2"
+    ) -> list[Optional[str]]:
+        """
+        複数テキストのキャッシュをまとめて検索
+
+        Args:
+            texts (list[str]): 検索するテキストのリスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出扱い）
+            target_lang (str): ターゲット言語コード
+            fmt (str): "text" または "html"
+            api_version (str): APIバージョン
+
+        Returns:
+            list[Optional[str]]: 入力と同じ順番の翻訳結果（未キャッシュはNone）
+        """
+        source = source_lang or "auto"
+        keys = [normalize_text(t) for t in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(unique_keys), _LOOKUP_CHUNK_SIZE):
+                chunk = unique_keys[start:start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"""
+                    SELECT text, translated FROM translations
+                    WHERE source_lang = ? AND target_lang = ? AND format = ? AND api_version = ?
+                      AND text IN ({placeholders})
+                    """,
+                    [source, target_lang, fmt, api_version, *chunk]
+                ).fetchall()
+                found.update(rows)
+
+            # ヒットしたエントリの最終参照日時を更新（LRU削除用）
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    """
+                    UPDATE translations SET last_used = ?
+                    WHERE text = ? AND source_lang = ? AND target_lang = ? AND format = ? AND api_version = ?
+                    """,
+                    [(now, key, source, target_lang, fmt, api_version) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hit_count = sum(1 for r in results if r is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+
+        return results
+
+    def put_many(
+        self,
+        texts: list[str],
+        translations: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        fmt: str = "text",
+        api_version: str = "v2"
+    ) -> None:
+        """
+        複数の翻訳結果をまとめて保存
+
+        Args:
+            texts (list[str]): 翻訳元テキストのリスト
+            translations (list[str]): 翻訳結果のリスト（textsと同じ順番）
+            source_lang (str): ソース言語コード（Noneの場合は自動検出扱い）
+            target_lang (str): ターゲット言語コード
+            fmt (str): "text" または "html"
+            api_version (str): APIバージョン
+        """
+        if len(texts) != len(translations):
+            raise ValueError("textsとtranslationsの件数が一致しません")
+        if not texts:
+            return
+
+        source = source_lang or "auto"
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO translations
+                    (text, source_lang, target_lang, format, api_version, translated, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (normalize_text(text), source, target_lang, fmt, api_version, translated, now, now)
+                    for text, translated in zip(texts, translations)
+                ]
+            )
+            self._conn.commit()
+
+        if self.max_entries is not None:
+            self.evict()
+
+    def list_entries(
+        self,
+        min_length: int = 0,
+        fmt: str = "text",
+        api_version: str = "v2"
+    ) -> list[tuple[str, str, str, str]]:
+        """
+        保存されている翻訳結果を取得（翻訳メモリの作成用）
+
+        Args:
+            min_length (int): この文字数以上のテキストだけを取得
+            fmt (str): "text" または "html"
+            api_version (str): APIバージョン
+
+        Returns:
+            list[tuple]: (テキスト, ソース言語, ターゲット言語, 翻訳結果) のリスト
+                ソース言語が自動検出の場合は "auto"
+        """
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT text, source_lang, target_lang, translated FROM translations
+                WHERE format = ? AND api_version = ? AND length(text) >= ?
+                """,
+                (fmt, api_version, min_length)
+            ).fetchall()
+
+    def evict(self) -> int:
+        """
+        期限切れ・件数超過のエントリを削除
+
+        Returns:
+            int: 削除した件数
+        """
+        removed = 0
+        with self._lock:
+            if self.max_age_days is not None:
+                threshold = time.time() - self.max_age_days * 86400
+                cursor = self._conn.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (threshold,)
+                )
+                removed += cursor.rowcount
+
+            if self.max_entries is not None:
+                count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                overflow = count - self.max_entries
+                if overflow > 0:
+                    cursor = self._conn.execute(
+                        """
+                        DELETE FROM translations WHERE rowid IN (
+                            SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?
+                        )
+                        """,
+                        (overflow,)
+                    )
+                    removed += cursor.rowcount
+
+            self._conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        """キャッシュを全削除"""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        ヒット/ミス件数などの統計情報を取得
+
+        Returns:
+            dict: 統計情報
+                {
+                    "hits": ヒット件数,
+                    "misses": ミス件数,
+                    "hit_rate": ヒット率（%）,
+                    "entries": 保存件数,
+                    "db_path": SQLiteファイルのパス
+                }
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total * 100) if total > 0 else 0.0,
+            "entries": entries,
+            "db_path": str(self.db_path)
+        }
+
+    def close(self) -> None:
+        """SQLite接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[TranslationCache] = None
+
+
+def get_default_cache() -> Optional[TranslationCache]:
+    """
+    環境変数の設定に従って共有キャッシュを取得
+
+    環境変数:
+        TRANSLATION_CACHE_DISABLED: "1" の場合はキャッシュを使わない
+        TRANSLATION_CACHE_PATH: SQLiteファイルのパス
+        TRANSLATION_CACHE_MAX_ENTRIES: 最大件数
+        TRANSLATION_CACHE_MAX_AGE_DAYS: 保持期間（日数）
+
+    Returns:
+        TranslationCache: キャッシュ（無効化されている場合はNone）
+    """
+    global _default_cache
+
+    if os.getenv("TRANSLATION_CACHE_DISABLED") == "1":
+        return None
+
+    if _default_cache is None:
+        max_entries = os.getenv("TRANSLATION_CACHE_MAX_ENTRIES")
+        max_age_days = os.getenv("TRANSLATION_CACHE_MAX_AGE_DAYS")
+        _default_cache = TranslationCache(
+            db_path=os.getenv("TRANSLATION_CACHE_PATH"),
+            max_entries=int(max_entries) if max_entries else None,
+            max_age_days=float(max_age_days) if max_age_days else None
+        )
+    return _default_cache
+
+
+if __name__ == "__main__":
+    # キャッシュの状態を表示
+    cache = get_default_cache()
+    if cache is None:
+        print("[INFO] キャッシュは無効化されています（TRANSLATION_CACHE_DISABLED=1）")
+    else:
+        stats = cache.stats()
+        print("=" * 50)
+        print("翻訳キャッシュ")
+        print("=" * 50)
+        print(f"保存先: {stats['db_path']}")
+        print(f"保存件数: {stats['entries']}件")
@@ -0,0 +1,29 @@
+"""
+共通の翻訳クライアント
+翻訳先（バックエンド）を差し替えられる TranslationClient の上に、
+用語集・キャッシュ・翻訳メモリ・チャンク分割・並列送信・レート制限・利用統計をまとめる
+
+例:
+    from translation_client import TranslationClient
+    client = TranslationClient()                       # 環境変数 TRANSLATION_BACKEND（デフォルト: REST API）
+    print(client.translate(["犬", "猫"], "ja", "en"))   # ["dog", "cat"]
+"""
+from translation_client.backends import (
+    TranslationBackend,
+    GoogleRestBackend,
+    GoogleClientLibraryBackend,
+    GlossaryBackend,
+    StubBackend,
+    get_backend,
+)
+from translation_client.client import TranslationClient
+
+__all__ = [
+    "TranslationBackend",
+    "GoogleRestBackend",
+    "GoogleClientLibraryBackend",
+    "GlossaryBackend",
+    "StubBackend",
+    "get_backend",
+    "TranslationClient",
+]
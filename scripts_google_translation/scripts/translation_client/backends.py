@@ -0,0 +1,184 @@
+"""
+翻訳バックエンド（1チャンク分のテキストを実際に翻訳する部分）
+TranslationClientはバックエンドの違いを意識せず、用語集・キャッシュ・並列送信を共通で行う
+
+バックエンド:
+    GoogleRestBackend: Cloud Translation API（REST、APIキー）
+    GoogleClientLibraryBackend: Cloud Translation API（google-cloud-translate、サービスアカウント）
+    GlossaryBackend: 用語集だけで翻訳（見つからないものは別のバックエンドに任せるかエラー）
+    StubBackend: 決定的な偽の翻訳（APIに接続しない、テスト・ベンチマーク用）
+"""
+import html
+import os
+from typing import Optional
+
+import translator
+from api_key_pool import get_default_pool
+from char_budget import get_default_budget
+from glossary import Glossary, get_default_glossary
+from stub_translation_server import fake_translate
+from translation_telemetry import get_default_telemetry, measure_request
+
+
+class TranslationBackend:
+    """
+    翻訳バックエンドの基底クラス
+
+    サブクラスはtranslate_chunk()を実装する。入力はAPIの上限以内
+    （MAX_SEGMENTS_PER_REQUEST件・MAX_CHARS_PER_REQUEST文字）に分割済み。
+    """
+
+    # 表示用の名前
+    name = "base"
+    # 結果を翻訳キャッシュ・翻訳メモリに保存してよいか（偽の翻訳はFalse）
+    cacheable = True
+
+    def translate_chunk(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        """
+        1チャンク分のテキストを翻訳
+
+        Args:
+            texts (list[str]): 翻訳するテキストのリスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出）
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            list[str]: 入力と同じ順番の翻訳結果（HTMLエスケープは解除済み）
+
+        Raises:
+            Exception: 翻訳に失敗した場合
+        """
+        raise NotImplementedError
+
+
+class GoogleRestBackend(TranslationBackend):
+    """Cloud Translation API（REST）で翻訳（APIキーのプール・再試行・文字数上限・HTML実体参照の変換はtranslatorと共通）"""
+
+    name = "rest"
+
+    def translate_chunk(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        return translator._request_chunk(texts, source_lang, target_lang)
+
+
+class GoogleClientLibraryBackend(TranslationBackend):
+    """
+    google-cloud-translate（translate_v2.Client）で翻訳
+
+    GOOGLE_APPLICATION_CREDENTIALS_POOL が設定されている場合はサービスアカウントのプールを使い、
+    なければ GOOGLE_APPLICATION_CREDENTIALS のデフォルト認証で1つのクライアントを使う。
+    """
+
+    name = "client_library"
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client (translate_v2.Client): 作成済みのクライアント（省略時はデフォルト認証で作成）
+        """
+        self._client = client
+
+    def _default_client(self):
+        """デフォルト認証のクライアント（初回呼び出し時に作成）"""
+        if self._client is None:
+            from google.cloud import translate_v2 as translate
+            self._client = translate.Client()
+        return self._client
+
+    def translate_chunk(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        chars = sum(len(t) for t in texts)
+        budget = get_default_budget()
+        if budget is not None:
+            budget.consume(chars)
+
+        def send(client):
+            try:
+                return client.translate(
+                    texts, source_language=source_lang, target_language=target_lang, format_="text"
+                )
+            except Exception as e:
+                telemetry = get_default_telemetry()
+                if telemetry is not None and getattr(e, "code", None) == 429:
+                    telemetry.record_throttled()
+                raise
+
+        # 応答時間・再試行・429を言語ペアごとに記録
+        with measure_request(source_lang, target_lang, len(texts), chars):
+            pool = get_default_pool("service_account")
+            if pool is None:
+                results = send(self._default_client())
+            else:
+                results = pool.execute(chars, lambda credential: send(credential.client))
+        return [html.unescape(r["translatedText"]) for r in results]
+
+
+class GlossaryBackend(TranslationBackend):
+    """
+    用語集（テンプレート・PDF抽出の訳語）だけで翻訳
+
+    用語集にないテキストはfallbackのバックエンドで翻訳する。fallbackがない場合はLookupErrorを送出する。
+    """
+
+    name = "glossary"
+
+    def __init__(self, glossary: Optional[Glossary] = None, fallback: Optional[TranslationBackend] = None):
+        """
+        Args:
+            glossary (Glossary): 用語集（省略時は共有の用語集）
+            fallback (TranslationBackend): 用語集にないテキストを翻訳するバックエンド
+        """
+        self.glossary = glossary if glossary is not None else get_default_glossary()
+        self.fallback = fallback
+        # 用語集の訳語はキャッシュしなくてよいが、fallbackの結果は保存する
+        self.cacheable = bool(fallback and fallback.cacheable)
+
+    def translate_chunk(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        results = (
+            self.glossary.get_many(texts, source_lang, target_lang)
+            if self.glossary is not None else [None] * len(texts)
+        )
+        misses = [t for t, r in zip(texts, results) if r is None]
+        if not misses:
+            return results
+        if self.fallback is None:
+            raise LookupError(f"用語集に訳語がありません: {len(misses)}件（例: {misses[0]}）")
+
+        translated = dict(zip(misses, self.fallback.translate_chunk(misses, source_lang, target_lang)))
+        return [r if r is not None else translated[t] for t, r in zip(texts, results)]
+
+
+class StubBackend(TranslationBackend):
+    """APIに接続しない決定的な偽の翻訳（"[ターゲット言語] テキスト"、stub_translation_serverと同じ）"""
+
+    name = "stub"
+    cacheable = False
+
+    def translate_chunk(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        return [fake_translate(t, target_lang) for t in texts]
+
+
+_BACKENDS = {
+    "rest": GoogleRestBackend,
+    "client_library": GoogleClientLibraryBackend,
+    "glossary": GlossaryBackend,
+    "stub": StubBackend,
+}
+
+
+def get_backend(name: Optional[str] = None) -> TranslationBackend:
+    """
+    名前からバックエンドを作成
+
+    Args:
+        name (str): "rest" / "client_library" / "glossary" / "stub"
+            （省略時は環境変数 TRANSLATION_BACKEND、未設定の場合は "rest"）
+
+    Returns:
+        TranslationBackend: バックエンド
+
+    Raises:
+        ValueError: 不明な名前の場合
+    """
+    name = name or os.getenv("TRANSLATION_BACKEND") or "rest"
+    if name not in _BACKENDS:
+        raise ValueError(f"不明な翻訳バックエンドです: {name}（{', '.join(_BACKENDS)} のいずれか）")
+    return _BACKENDS[name]()
@@ -0,0 +1,181 @@
+"""
+共通の翻訳クライアント
+バックエンドの上に、用語集・キャッシュ・翻訳メモリの検索、チャンク分割、
+並列送信・レート制限（AsyncTranslationEngine）と利用統計をまとめる
+"""
+import asyncio
+import threading
+import time
+from typing import Hashable, Optional
+
+from async_translator import AsyncTranslationEngine
+from run_journal import RunJournal
+from translation_client.backends import TranslationBackend, get_backend
+
+
+class TranslationClient:
+    """
+    翻訳クライアント（スクリプトごとの翻訳処理の代わりに使う）
+
+    例:
+        client = TranslationClient()                          # 環境変数 TRANSLATION_BACKEND のバックエンド
+        client = TranslationClient(backend=StubBackend())     # APIに接続しない
+        results = client.translate(["犬", "猫"], "ja", "en")
+        print(client.stats())
+    """
+
+    def __init__(
+        self,
+        backend: Optional[TranslationBackend] = None,
+        use_cache: bool = True,
+        use_glossary: bool = True,
+        max_concurrency: int = 8,
+        requests_per_second: Optional[float] = 10.0,
+        chars_per_minute: Optional[float] = None,
+        journal: Optional[RunJournal] = None
+    ):
+        """
+        Args:
+            backend (TranslationBackend): 翻訳バックエンド（省略時は get_backend()）
+            use_cache (bool): 翻訳キャッシュ・翻訳メモリを使うか（キャッシュできないバックエンドでは常にFalse）
+            use_glossary (bool): 用語集（テンプレートの訳語）を使うか
+            max_concurrency (int): 同時に送信するリクエスト数の上限
+            requests_per_second (float): 1秒あたりのリクエスト数上限（Noneで無制限）
+            chars_per_minute (float): 1分あたりの文字数上限（Noneで無制限）
+            journal (RunJournal): 完了したチャンクを記録するジャーナル（再開用）
+        """
+        self.backend = backend or get_backend()
+        self.engine = AsyncTranslationEngine(
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            chars_per_minute=chars_per_minute,
+            use_cache=use_cache and self.backend.cacheable,
+            use_glossary=use_glossary,
+            request_func=self._send,
+            journal=journal
+        )
+        self._lock = threading.Lock()
+        self._segments = 0
+        self._requests = 0
+        self._api_segments = 0
+        self._api_chars = 0
+        self._errors = 0
+        self._latency_sec = 0.0
+
+    def _send(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+        """バックエンドで1チャンクを翻訳し、リクエスト数・文字数・応答時間を記録（スレッドから呼ばれる）"""
+        start = time.perf_counter()
+        try:
+            return self.backend.translate_chunk(texts, source_lang, target_lang)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._requests += 1
+                self._api_segments += len(texts)
+                self._api_chars += sum(len(t) for t in texts)
+                self._latency_sec += time.perf_counter() - start
+
+    async def translate_async(
+        self,
+        texts: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        raise_on_error: bool = True
+    ) -> list[Optional[str]]:
+        """translate()の非同期版（実行中のイベントループから呼ぶ場合に使う）"""
+        texts = list(texts)
+        with self._lock:
+            self._segments += len(texts)
+        return await self.engine.translate(texts, source_lang, target_lang, raise_on_error)
+
+    def translate(
+        self,
+        texts: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        raise_on_error: bool = True
+    ) -> list[Optional[str]]:
+        """
+        テキストのリストを翻訳（重複・ローカルで見つかるものはAPIに送らない）
+
+        Args:
+            texts (list[str]): 翻訳するテキストのリスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出）
+            target_lang (str): ターゲット言語コード
+            raise_on_error (bool): Falseの場合、失敗したチャンクの結果をNoneにして続行
+
+        Returns:
+            list[Optional[str]]: 入力と同じ順番の翻訳結果
+
+        Raises:
+            BudgetExceededError: 文字数の上限を超える場合（raise_on_error=Trueのとき）
+            Exception: 翻訳に失敗した場合（raise_on_error=Trueのとき）
+        """
+        return asyncio.run(self.translate_async(texts, source_lang, target_lang, raise_on_error))
+
+    def translate_text(self, text: str, source_lang: Optional[str], target_lang: str) -> str:
+        """
+        単一テキストを翻訳
+
+        Args:
+            text (str): 翻訳するテキスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出）
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            str: 翻訳結果
+        """
+        return self.translate([text], source_lang, target_lang)[0]
+
+    def translate_columns(
+        self,
+        jobs: dict[Hashable, tuple[list[str], Optional[str], str]],
+        raise_on_error: bool = True
+    ) -> dict[Hashable, list[Optional[str]]]:
+        """
+        複数の列（言語ペア）をまとめて並列に翻訳
+
+        Args:
+            jobs (dict): {キー: (テキストのリスト, ソース言語, ターゲット言語)}
+            raise_on_error (bool): Falseの場合、失敗したチャンクの結果をNoneにして続行
+
+        Returns:
+            dict: {キー: 翻訳結果のリスト（入力順）}
+        """
+        async def run():
+            keys = list(jobs.keys())
+            outcomes = await asyncio.gather(
+                *(self.translate_async(*jobs[key], raise_on_error=raise_on_error) for key in keys)
+            )
+            return dict(zip(keys, outcomes))
+
+        return asyncio.run(run())
+
+    def stats(self) -> dict:
+        """
+        利用統計を取得
+
+        Returns:
+            dict: {
+                "backend": バックエンド名,
+                "segments": 翻訳を依頼された件数,
+                "local_segments": API に送らずに済んだ件数（重複・用語集・キャッシュ・翻訳メモリ）,
+                "requests" / "api_segments" / "api_chars": APIに送ったリクエスト数・件数・文字数,
+                "errors": 失敗したリクエスト数,
+                "avg_latency_ms": 1リクエストの平均応答時間（ミリ秒）
+            }
+        """
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "segments": self._segments,
+                "local_segments": max(0, self._segments - self._api_segments),
+                "requests": self._requests,
+                "api_segments": self._api_segments,
+                "api_chars": self._api_chars,
+                "errors": self._errors,
+                "avg_latency_ms": round(self._latency_sec / self._requests * 1000, 1) if self._requests else 0.0
+            }
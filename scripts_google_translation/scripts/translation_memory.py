@@ -0,0 +1,296 @@
+"""
+あいまい一致の翻訳メモリ（文字n-gram + MinHash LSH）
+例文・備考のような長い文は1語違いの似た文が多く、完全一致のキャッシュでは
+ヒットしないため、過去に翻訳した文から類似度の高いものを高速に探す
+
+仕組み:
+    1. 文を文字n-gram（デフォルト: 3文字）の集合にする
+    2. MinHash署名（64個のハッシュの最小値）を計算する
+    3. 署名を16バンドに分けてバケットに登録し（LSH）、同じバケットに入った文だけを候補にする
+    4. 候補をdifflibの一致率で採点し、しきい値以上のものを返す
+"""
+import difflib
+import os
+import threading
+import unicodedata
+import zlib
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+# MinHashの設定（署名の長さ = バンド数 × 1バンドの行数）
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+NGRAM_SIZE = 3
+
+# ハッシュ値の範囲（2^32より大きい素数）
+_PRIME = (1 << 32) + 15
+
+# この文字数未満のテキストは登録しない（短い単語は完全一致のキャッシュで十分）
+DEFAULT_MIN_LENGTH = 8
+
+# あいまい一致として返す類似度のしきい値（0〜1）
+DEFAULT_THRESHOLD = 0.8
+
+
+class FuzzyMatch(NamedTuple):
+    """あいまい一致の結果"""
+    source: str          # 過去に翻訳した文
+    translation: str     # その翻訳結果
+    score: float         # 類似度（0〜1、1が完全一致）
+
+
+def _normalize(text: str) -> str:
+    """比較用にテキストを正規化（NFKC + 空白の統一）"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> set[str]:
+    """文字n-gramの集合（n文字未満のテキストはテキスト全体を1つのn-gramとする）"""
+    if len(text) < n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TranslationMemory:
+    """
+    あいまい一致で過去の翻訳を検索する翻訳メモリ
+
+    例:
+        memory = TranslationMemory()
+        memory.add("安全帯を必ず使用してください。", "Always use a safety harness.", "ja", "en")
+        for match in memory.match("安全帯を必ず着用してください。", "ja", "en"):
+            print(match.score, match.translation)
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_length: int = DEFAULT_MIN_LENGTH,
+        num_permutations: int = NUM_PERMUTATIONS,
+        num_bands: int = NUM_BANDS,
+        ngram_size: int = NGRAM_SIZE,
+        seed: int = 1
+    ):
+        """
+        Args:
+            threshold (float): match()で返す類似度の下限（0〜1）
+            min_length (int): 登録・検索するテキストの最小文字数
+            num_permutations (int): MinHash署名の長さ
+            num_bands (int): LSHのバンド数（num_permutationsの約数）
+            ngram_size (int): 文字n-gramの文字数
+            seed (int): ハッシュ関数の乱数シード（同じシードなら同じ署名になる）
+        """
+        if num_permutations % num_bands != 0:
+            raise ValueError("num_permutationsはnum_bandsの倍数にしてください")
+        self.threshold = threshold
+        self.min_length = min_length
+        self.num_bands = num_bands
+        self.ngram_size = ngram_size
+        self._rows_per_band = num_permutations // num_bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, num_permutations, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, 1 << 32, num_permutations, dtype=np.uint64)[:, None]
+
+        self._lock = threading.Lock()
+        # 登録済みの文: (正規化テキスト, 元のテキスト, 翻訳結果)
+        self._entries: list[tuple[str, str, str]] = []
+        # (ソース言語, ターゲット言語, 正規化テキスト) -> 登録番号
+        self._index: dict[tuple[str, str, str], int] = {}
+        # (ソース言語, ターゲット言語, バンド番号, 署名の一部) -> 登録番号のリスト
+        self._buckets: dict[tuple, list[int]] = {}
+
+    def _signature(self, normalized: str) -> np.ndarray:
+        """MinHash署名を計算"""
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) for gram in _ngrams(normalized, self.ngram_size)),
+            dtype=np.uint64
+        )
+        return ((self._a * hashes[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray, source_lang: str, target_lang: str) -> list[tuple]:
+        """署名をバンドに分けたバケットのキー"""
+        r = self._rows_per_band
+        return [
+            (source_lang, target_lang, band, signature[band * r:(band + 1) * r].tobytes())
+            for band in range(self.num_bands)
+        ]
+
+    def add(self, text: str, translation: str, source_lang: Optional[str], target_lang: str) -> None:
+        """
+        翻訳結果を登録（min_length未満のテキストは登録しない）
+
+        Args:
+            text (str): 翻訳元のテキスト
+            translation (str): 翻訳結果
+            source_lang (str): ソース言語コード（Noneの場合は "auto"）
+            target_lang (str): ターゲット言語コード
+        """
+        normalized = _normalize(text)
+        if len(normalized) < self.min_length or translation is None:
+            return
+        source = source_lang or "auto"
+        key = (source, target_lang, normalized)
+
+        with self._lock:
+            if key in self._index:
+                # 登録済みの文は翻訳結果だけを更新
+                self._entries[self._index[key]] = (normalized, text, translation)
+                return
+            entry_id = len(self._entries)
+            self._entries.append((normalized, text, translation))
+            self._index[key] = entry_id
+            for band_key in self._band_keys(self._signature(normalized), source, target_lang):
+                self._buckets.setdefault(band_key, []).append(entry_id)
+
+    def add_many(
+        self,
+        texts: list[str],
+        translations: list[str],
+        source_lang: Optional[str],
+        target_lang: str
+    ) -> None:
+        """
+        複数の翻訳結果を登録
+
+        Args:
+            texts (list[str]): 翻訳元テキストのリスト
+            translations (list[str]): 翻訳結果のリスト（textsと同じ順番）
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+        """
+        for text, translation in zip(texts, translations):
+            self.add(text, translation, source_lang, target_lang)
+
+    def match(
+        self,
+        text: str,
+        source_lang: Optional[str],
+        target_lang: str,
+        threshold: Optional[float] = None,
+        limit: int = 3
+    ) -> list[FuzzyMatch]:
+        """
+        類似度の高い過去の翻訳を検索
+
+        Args:
+            text (str): 検索するテキスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+            threshold (float): 類似度の下限（省略時はインスタンスのthreshold）
+            limit (int): 返す件数の上限
+
+        Returns:
+            list[FuzzyMatch]: 類似度の高い順の一致結果（しきい値未満・短いテキストは空リスト）
+        """
+        threshold = self.threshold if threshold is None else threshold
+        normalized = _normalize(text)
+        if len(normalized) < self.min_length or not self._entries:
+            return []
+        source = source_lang or "auto"
+
+        with self._lock:
+            exact = self._index.get((source, target_lang, normalized))
+            if exact is not None:
+                _, original, translation = self._entries[exact]
+                return [FuzzyMatch(original, translation, 1.0)]
+
+            candidates = set()
+            for band_key in self._band_keys(self._signature(normalized), source, target_lang):
+                candidates.update(self._buckets.get(band_key, ()))
+            entries = [self._entries[i] for i in candidates]
+
+        matches = []
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(normalized)
+        for candidate, original, translation in entries:
+            # 長さが大きく違うものは一致率の上限がしきい値に届かないので飛ばす
+            if 2 * min(len(candidate), len(normalized)) / (len(candidate) + len(normalized)) < threshold:
+                continue
+            matcher.set_seq1(candidate)
+            if matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                matches.append(FuzzyMatch(original, translation, score))
+
+        matches.sort(key=lambda m: m.score, reverse=True)
+        return matches[:limit]
+
+    def best_many(
+        self,
+        texts: list[str],
+        source_lang: Optional[str],
+        target_lang: str,
+        threshold: Optional[float] = None
+    ) -> list[Optional[FuzzyMatch]]:
+        """
+        複数テキストの最も類似度の高い一致を入力順に取得
+
+        Args:
+            texts (list[str]): 検索するテキストのリスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+            threshold (float): 類似度の下限（省略時はインスタンスのthreshold）
+
+        Returns:
+            list[Optional[FuzzyMatch]]: 一致結果のリスト（一致なしはNone）
+        """
+        results = []
+        for text in texts:
+            matches = self.match(text, source_lang, target_lang, threshold, limit=1)
+            results.append(matches[0] if matches else None)
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_memory: Optional[TranslationMemory] = None
+_default_lock = threading.Lock()
+
+
+def get_reuse_threshold() -> Optional[float]:
+    """
+    あいまい一致の翻訳を再利用する類似度のしきい値を取得
+
+    環境変数:
+        TRANSLATION_MEMORY_REUSE_THRESHOLD: 類似度がこの値以上なら過去の翻訳を再利用（例: 0.95）
+            未設定の場合は再利用しない（一致の確認・報告にだけ使う）
+
+    Returns:
+        float: しきい値（再利用しない場合はNone）
+    """
+    value = os.getenv("TRANSLATION_MEMORY_REUSE_THRESHOLD")
+    return float(value) if value else None
+
+
+def get_default_memory() -> Optional[TranslationMemory]:
+    """
+    共有の翻訳メモリを取得（初回呼び出し時に翻訳キャッシュの長い文から作成）
+
+    環境変数:
+        TRANSLATION_MEMORY_ENABLED: "1" の場合に翻訳メモリを使う
+            （TRANSLATION_MEMORY_REUSE_THRESHOLDを設定した場合も有効）
+
+    Returns:
+        TranslationMemory: 翻訳メモリ（有効化されていない場合はNone）
+    """
+    global _default_memory
+
+    if os.getenv("TRANSLATION_MEMORY_ENABLED") != "1" and get_reuse_threshold() is None:
+        return None
+
+    with _default_lock:
+        if _default_memory is None:
+            from translation_cache import get_default_cache
+
+            memory = TranslationMemory()
+            cache = get_default_cache()
+            if cache is not None:
+                for text, source, target, translated in cache.list_entries(min_length=memory.min_length):
+                    memory.add(text, translated, source, target)
+            _default_memory = memory
+    return _default_memory
@@ -0,0 +1,357 @@
+"""
+翻訳ジョブの重複除去プランナー
+実行全体の (テキスト, ソース言語, ターゲット言語) を先に集めてから、
+ユニークなジョブだけを1回ずつAPIに送り、結果を各ファイル・行・列に戻す
+"""
+import asyncio
+from typing import Optional
+
+from translator import chunk_segments
+from language_codes import load_template_languages, to_api_lang
+from async_translator import AsyncTranslationEngine, translate_columns
+
+
+class TranslationPlanner:
+    """
+    翻訳ジョブを集めて重複を除いてから一括実行する
+
+    例:
+        planner = TranslationPlanner()
+        planner.add(["犬", "猫"], "ja", "en")     # ファイル1
+        planner.add(["猫", "鳥"], "ja", "en")     # ファイル2（"猫"は重複）
+        planner.execute()
+        print(planner.get("猫", "ja", "en"))
+        print(planner.report())
+    """
+
+    def __init__(self):
+        # (ソース言語, ターゲット言語) -> ユニークなテキスト（登録順）
+        self._jobs: dict[tuple[Optional[str], str], dict[str, None]] = {}
+        self._results: dict[tuple[str, Optional[str], str], Optional[str]] = {}
+        self.requested_segments = 0
+        self.requested_calls = 0
+
+    def add(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> None:
+        """
+        翻訳ジョブを登録（まだ送信しない）
+
+        Args:
+            texts (list[str]): 翻訳するテキストのリスト
+            source_lang (str): ソース言語コード（Noneの場合は自動検出）
+            target_lang (str): ターゲット言語コード
+        """
+        if not texts:
+            return
+        self.requested_segments += len(texts)
+        # 重複除去しなかった場合のリクエスト数（呼び出しごとにチャンク分割した場合）
+        self.requested_calls += len(chunk_segments(texts))
+        pending = self._jobs.setdefault((source_lang, target_lang), {})
+        for text in texts:
+            if (text, source_lang, target_lang) not in self._results:
+                pending[text] = None
+
+    def execute(
+        self,
+        engine: Optional[AsyncTranslationEngine] = None,
+        raise_on_error: bool = True
+    ) -> None:
+        """
+        登録済みのユニークなジョブを言語ペアごとにまとめて並列に翻訳
+
+        Args:
+            engine (AsyncTranslationEngine): 使用する翻訳エンジン（省略時はデフォルト設定）
+            raise_on_error (bool): Falseの場合、失敗したジョブの結果をNoneにして続行
+        """
+        jobs = {
+            pair: (list(texts), pair[0], pair[1])
+            for pair, texts in self._jobs.items() if texts
+        }
+        if not jobs:
+            return
+
+        if engine is None:
+            outcomes = translate_columns(jobs, raise_on_error=raise_on_error)
+        else:
+            outcomes = asyncio.run(engine.translate_columns(jobs, raise_on_error=raise_on_error))
+
+        for (source_lang, target_lang), (texts, _, _) in jobs.items():
+            for text, translated in zip(texts, outcomes[(source_lang, target_lang)]):
+                self._results[(text, source_lang, target_lang)] = translated
+        self._jobs.clear()
+
+    def get(self, text: str, source_lang: Optional[str], target_lang: str) -> Optional[str]:
+        """
+        翻訳結果を取得
+
+        Args:
+            text (str): 翻訳元テキスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            str: 翻訳結果（未実行・失敗時はNone）
+        """
+        return self._results.get((text, source_lang, target_lang))
+
+    def get_many(self, texts: list[str], source_lang: Optional[str], target_lang: str) -> list[Optional[str]]:
+        """
+        複数の翻訳結果を入力順に取得
+
+        Args:
+            texts (list[str]): 翻訳元テキストのリスト
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+
+        Returns:
+            list[Optional[str]]: 翻訳結果のリスト
+        """
+        return [self.get(text, source_lang, target_lang) for text in texts]
+
+    def report(self) -> dict:
+        """
+        重複除去でどれだけ削減できたかを集計
+
+        Returns:
+            dict: 集計結果
+                {
+                    "requested_segments": 登録されたテキスト数（重複含む）,
+                    "unique_segments": 実際に翻訳したユニークなテキスト数,
+                    "saved_segments": 削減できたテキスト数,
+                    "requested_calls": 重複除去しなかった場合のリクエスト数,
+                    "planned_calls": 重複除去後のリクエスト数,
+                    "saved_calls": 削減できたリクエスト数
+                }
+        """
+        groups: dict[tuple[Optional[str], str], list[str]] = {}
+        for (text, source_lang, target_lang) in self._results:
+            groups.setdefault((source_lang, target_lang), []).append(text)
+        for pair, texts in self._jobs.items():
+            groups.setdefault(pair, []).extend(texts)
+
+        unique_segments = sum(len(texts) for texts in groups.values())
+        planned_calls = sum(len(chunk_segments(texts)) for texts in groups.values())
+        return {
+            "requested_segments": self.requested_segments,
+            "unique_segments": unique_segments,
+            "saved_segments": self.requested_segments - unique_segments,
+            "requested_calls": self.requested_calls,
+            "planned_calls": planned_calls,
+            "saved_calls": self.requested_calls - planned_calls
+        }
+
+
+def round_trip_translate_planned(
+    word_lists: list[list[str]],
+    intermediate_lang: str = "en",
+    engine: Optional[AsyncTranslationEngine] = None,
+    raise_on_error: bool = True
+) -> tuple[list[list[dict]], dict]:
+    """
+    複数のテキストリスト（ファイルごとなど）の往復翻訳を重複除去して実行
+
+    往路（日本語→中間言語）・復路（中間言語→日本語）それぞれで全リストのジョブを集め、
+    ユニークなものだけを送信する。
+
+    Args:
+        word_lists (list[list[str]]): 日本語テキストのリストのリスト
+        intermediate_lang (str): 中間言語コード（デフォルト: "en"）
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン（省略時はデフォルト設定）
+        raise_on_error (bool): Falseの場合、失敗したチャンクのテキストは
+            intermediate_text / back_translation をNoneにして続行
+
+    Returns:
+        tuple: (結果, 集計)
+            結果: word_listsと同じ形のリスト（各要素はround_trip_translate_batchと同じdict）
+            集計: {"forward": 往路のreport(), "backward": 復路のreport()}
+
+    Raises:
+        BudgetExceededError: 文字数の上限を超える場合（raise_on_errorに関係なく送出）
+        Exception: 翻訳APIエラー（raise_on_error=Trueの場合）
+    """
+    forward = TranslationPlanner()
+    for words in word_lists:
+        forward.add(words, "ja", intermediate_lang)
+    forward.execute(engine, raise_on_error=raise_on_error)
+
+    intermediate_lists = [forward.get_many(words, "ja", intermediate_lang) for words in word_lists]
+
+    backward = TranslationPlanner()
+    for intermediates in intermediate_lists:
+        # 往路で失敗したテキストは復路に送らない
+        backward.add([t for t in intermediates if t is not None], intermediate_lang, "ja")
+    backward.execute(engine, raise_on_error=raise_on_error)
+
+    all_results = []
+    for words, intermediates in zip(word_lists, intermediate_lists):
+        results = []
+        for original, intermediate in zip(words, intermediates):
+            back = backward.get(intermediate, intermediate_lang, "ja") if intermediate is not None else None
+            results.append({
+                "original": original,
+                "intermediate_lang": intermediate_lang,
+                "intermediate_text": intermediate,
+                "back_translation": back,
+                "is_perfect_match": (original == back)
+            })
+        all_results.append(results)
+
+    return all_results, {"forward": forward.report(), "backward": backward.report()}
+
+
+class RoundTripMatrix:
+    """
+    日本語テキスト × 言語の往復翻訳結果の行列
+
+    結果はユニークなテキストごとに1行だけ保持し、入力の行順（重複を含む）は
+    行番号の配列で表す。
+
+    例:
+        matrix = round_trip_translate_matrix(["犬", "猫"], ["en", "vi"])
+        print(matrix.back_translation("犬", "vi"))
+        print(matrix.match_rates())
+        df = matrix.to_dataframe("back_translation")
+    """
+
+    def __init__(
+        self,
+        texts: list[str],
+        langs: list[str],
+        intermediate: dict[str, list[Optional[str]]],
+        back: dict[str, list[Optional[str]]]
+    ):
+        """
+        Args:
+            texts (list[str]): 入力の日本語テキスト（入力順、重複を含む）
+            langs (list[str]): 言語コード（列順）
+            intermediate (dict): {言語コード: ユニークなテキストごとの中間言語の翻訳}
+            back (dict): {言語コード: ユニークなテキストごとの日本語への逆翻訳}
+        """
+        self.unique_texts = list(dict.fromkeys(texts))
+        self._row = {text: i for i, text in enumerate(self.unique_texts)}
+        self.rows = [self._row[text] for text in texts]
+        self.langs = list(langs)
+        self.intermediate = intermediate
+        self.back = back
+
+    @property
+    def texts(self) -> list[str]:
+        """入力の日本語テキスト（入力順）"""
+        return [self.unique_texts[row] for row in self.rows]
+
+    def intermediate_text(self, text: str, lang: str) -> Optional[str]:
+        """中間言語の翻訳を取得（失敗した場合はNone）"""
+        return self.intermediate[lang][self._row[text]]
+
+    def back_translation(self, text: str, lang: str) -> Optional[str]:
+        """日本語への逆翻訳を取得（失敗した場合はNone）"""
+        return self.back[lang][self._row[text]]
+
+    def is_perfect_match(self, text: str, lang: str) -> bool:
+        """逆翻訳が元の日本語と完全一致するか"""
+        return self.back_translation(text, lang) == text
+
+    def match_rates(self) -> dict[str, float]:
+        """
+        言語ごとの完全一致率（%、入力の行数で集計）
+
+        Returns:
+            dict: {言語コード: 完全一致率}
+        """
+        rates = {}
+        for lang in self.langs:
+            back = self.back[lang]
+            matches = sum(1 for row in self.rows if back[row] == self.unique_texts[row])
+            rates[lang] = (matches / len(self.rows) * 100) if self.rows else 0.0
+        return rates
+
+    def to_dataframe(self, kind: str = "back_translation"):
+        """
+        pandas.DataFrame（行: 入力の日本語、列: 言語コード）に変換
+
+        Args:
+            kind (str): "back_translation"（逆翻訳）、"intermediate"（中間言語の翻訳）、
+                "is_perfect_match"（完全一致）のいずれか
+
+        Returns:
+            pandas.DataFrame: 結果の表（インデックスは元の日本語）
+        """
+        import pandas as pd
+
+        if kind == "intermediate":
+            columns = self.intermediate
+        elif kind == "back_translation":
+            columns = self.back
+        elif kind == "is_perfect_match":
+            columns = {
+                lang: [back == text for text, back in zip(self.unique_texts, self.back[lang])]
+                for lang in self.langs
+            }
+        else:
+            raise ValueError(f"kindが不正です: {kind}")
+
+        return pd.DataFrame(
+            {lang: [columns[lang][row] for row in self.rows] for lang in self.langs},
+            index=pd.Index(self.texts, name="日本語")
+        )
+
+
+def round_trip_translate_matrix(
+    texts: list[str],
+    langs: Optional[list[str]] = None,
+    engine: Optional[AsyncTranslationEngine] = None,
+    raise_on_error: bool = False
+) -> RoundTripMatrix:
+    """
+    日本語テキストを全言語で往復翻訳（日本語→各言語→日本語）し、結果を1つの行列にまとめる
+
+    全言語の往路・復路を1つのイベントループで並列に実行し、言語ごとに往路が終わり次第
+    復路を開始する。同じAPI言語コードになる言語（pt と pt-BR など）は往路・復路を共有し、
+    重複したテキストは1回だけ翻訳する。同時実行数・レート制限はengineの設定に従う。
+
+    Args:
+        texts (list[str]): 翻訳する日本語テキストのリスト
+        langs (list[str]): 言語コードのリスト（省略時は language_codes_41.json の日本語以外の40言語）
+        engine (AsyncTranslationEngine): 使用する翻訳エンジン（省略時はデフォルト設定）
+        raise_on_error (bool): Trueの場合は翻訳エラーで中止、Falseの場合は失敗した結果をNoneにして続行
+
+    Returns:
+        RoundTripMatrix: 日本語 × 言語の往復翻訳結果
+
+    Raises:
+        Exception: 翻訳APIエラー（raise_on_error=Trueの場合）
+
+    例:
+        matrix = round_trip_translate_matrix(["安全帯", "足場"])
+        print(matrix.match_rates())
+        matrix.to_dataframe("back_translation").to_csv("round_trip.csv", encoding="utf-8-sig")
+    """
+    if langs is None:
+        langs = load_template_languages()
+    if engine is None:
+        engine = AsyncTranslationEngine()
+
+    unique_texts = list(dict.fromkeys(texts))
+    api_langs = list(dict.fromkeys(to_api_lang(lang) for lang in langs))
+
+    async def round_trip(api_lang: str) -> tuple[list[Optional[str]], list[Optional[str]]]:
+        forward = await engine.translate(unique_texts, "ja", api_lang, raise_on_error=raise_on_error)
+        pending = [text for text in dict.fromkeys(forward) if text is not None]
+        backward = dict(zip(pending, await engine.translate(pending, api_lang, "ja", raise_on_error=raise_on_error)))
+        return forward, [backward.get(text) if text is not None else None for text in forward]
+
+    async def run_all() -> list:
+        return await asyncio.gather(*(round_trip(api_lang) for api_lang in api_langs))
+
+    if unique_texts and api_langs:
+        outcomes = dict(zip(api_langs, asyncio.run(run_all())))
+    else:
+        outcomes = {api_lang: ([], []) for api_lang in api_langs}
+
+    intermediate = {}
+    back = {}
+    for lang in langs:
+        forward, backward = outcomes[to_api_lang(lang)]
+        intermediate[lang] = forward
+        back[lang] = backward
+
+    return RoundTripMatrix(texts, langs, intermediate, back)
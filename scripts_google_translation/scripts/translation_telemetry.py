@@ -0,0 +1,420 @@
+"""
+翻訳処理の計測（テレメトリ）
+言語ペアごとにAPIリクエスト数・セグメント数・文字数・応答時間の分布・再試行・429（レート制限）・
+ローカルで見つかった件数（用語集・キャッシュ・翻訳メモリ）を記録し、
+実行の最後にJSONのサマリー（任意でPrometheusのテキスト形式）に書き出す
+
+設定（環境変数）:
+    TRANSLATION_TELEMETRY_DISABLED: "1" の場合は記録しない
+    TRANSLATION_TELEMETRY_FILE: JSONサマリーの出力先（省略時は output/telemetry/translation_telemetry_<日時>.json）
+    TRANSLATION_TELEMETRY_PROMETHEUS: Prometheusのテキスト形式の出力先
+        （node_exporterのtextfile collector用の .prom ファイル、省略時は出力しない）
+
+例:
+    with measure_request("ja", "en", len(chunk), chars):
+        ...  # 応答時間を記録し、この中の再試行・429は ja→en として記録される
+    write_run_summary()
+"""
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+# JSONサマリーのデフォルトの出力先フォルダ
+DEFAULT_TELEMETRY_DIR = _REPO_ROOT / "output" / "telemetry"
+
+# 応答時間のヒストグラムの区切り（秒、Prometheusのバケットと同じ）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 言語ペアが分からない処理（言語検出など）の記録先
+_UNKNOWN_PAIR = ("auto", "-")
+
+# 実行中の言語ペア（スレッド・asyncio.to_threadにも引き継がれる）
+_current_pair: contextvars.ContextVar[Optional[tuple[str, str]]] = contextvars.ContextVar(
+    "translation_telemetry_pair", default=None
+)
+
+
+def percentile(values: list[float], percent: float) -> Optional[float]:
+    """
+    パーセンタイル値（最近傍法）
+
+    Args:
+        values (list[float]): 値のリスト
+        percent (float): パーセント（0〜100）
+
+    Returns:
+        float: パーセンタイル値（値がない場合はNone）
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    # 最近傍法: 全体のpercent%以上を含む最小の順位（ceil(P/100 * N)番目）
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+class _PairStats:
+    """1つの言語ペアの計測値"""
+
+    def __init__(self):
+        self.requests = 0
+        self.segments = 0
+        self.chars = 0
+        self.errors = 0
+        self.retries = 0
+        # 再試行の原因（ステータスコード、通信エラーは "connection"）ごとの回数
+        self.retry_reasons: dict[str, int] = {}
+        self.throttled = 0
+        self.lookups = 0
+        self.local_hits = {"glossary": 0, "cache": 0, "memory": 0}
+        self.latencies: list[float] = []
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+
+    def to_dict(self) -> dict:
+        latencies_ms = [s * 1000 for s in self.latencies]
+        local = sum(self.local_hits.values())
+        return {
+            "requests": self.requests,
+            "segments": self.segments,
+            "chars": self.chars,
+            "errors": self.errors,
+            "retries": self.retries,
+            "retry_reasons": dict(self.retry_reasons),
+            "throttled_429": self.throttled,
+            "lookups": self.lookups,
+            "local_hits": dict(self.local_hits),
+            "local_hit_rate": round(local / self.lookups * 100, 1) if self.lookups else None,
+            "segments_per_request": round(self.segments / self.requests, 1) if self.requests else None,
+            "latency_ms": {
+                "mean": round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else None,
+                "p50": percentile(latencies_ms, 50),
+                "p90": percentile(latencies_ms, 90),
+                "p99": percentile(latencies_ms, 99),
+                "max": round(max(latencies_ms), 2) if latencies_ms else None
+            },
+            "latency_histogram": {
+                f"le_{bound}s": count for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts)
+            }
+        }
+
+
+class TranslationTelemetry:
+    """
+    翻訳処理の計測値（スレッドセーフ、並列翻訳から共有して使う）
+
+    例:
+        telemetry = TranslationTelemetry()
+        telemetry.record_request("ja", "en", segments=128, chars=2000, latency_sec=0.4)
+        print(telemetry.summary()["pairs"]["ja→en"]["latency_ms"])
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pairs: dict[tuple[str, str], _PairStats] = {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    def _stats(self, source_lang: Optional[str], target_lang: Optional[str]) -> _PairStats:
+        """言語ペアの計測値（ロックを取得してから呼ぶ）"""
+        key = (source_lang or "auto", target_lang or "-")
+        if key not in self._pairs:
+            self._pairs[key] = _PairStats()
+        return self._pairs[key]
+
+    @contextmanager
+    def pair(self, source_lang: Optional[str], target_lang: str):
+        """
+        この中で記録される再試行・429を指定の言語ペアに割り当てる
+
+        Args:
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+        """
+        token = _current_pair.set((source_lang or "auto", target_lang))
+        try:
+            yield
+        finally:
+            _current_pair.reset(token)
+
+    def record_request(
+        self,
+        source_lang: Optional[str],
+        target_lang: str,
+        segments: int,
+        chars: int,
+        latency_sec: float,
+        error: bool = False
+    ) -> None:
+        """
+        APIリクエスト1件（再試行を含む送信から応答まで）を記録
+
+        Args:
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+            segments (int): 送信したセグメント数
+            chars (int): 送信した文字数
+            latency_sec (float): 応答までの秒数（再試行・待機を含む）
+            error (bool): 失敗した場合はTrue
+        """
+        with self._lock:
+            stats = self._stats(source_lang, target_lang)
+            stats.requests += 1
+            stats.segments += segments
+            stats.chars += chars
+            stats.errors += int(error)
+            stats.latencies.append(latency_sec)
+            stats.latency_sum += latency_sec
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency_sec <= bound:
+                    stats.bucket_counts[i] += 1
+
+    def record_lookup(self, source_lang: Optional[str], target_lang: str, provenance: Iterable[Optional[str]]) -> None:
+        """
+        ローカル検索（用語集・キャッシュ・翻訳メモリ）の結果を記録
+
+        Args:
+            source_lang (str): ソース言語コード
+            target_lang (str): ターゲット言語コード
+            provenance (Iterable): translator.lookup_local() の出典のリスト（見つからないものはNone）
+        """
+        provenance = list(provenance)
+        with self._lock:
+            stats = self._stats(source_lang, target_lang)
+            stats.lookups += len(provenance)
+            for name in provenance:
+                if name in stats.local_hits:
+                    stats.local_hits[name] += 1
+
+    def record_retry(self, status_code: Optional[int] = None) -> None:
+        """
+        再試行1回を記録（言語ペアは pair() で設定されたもの）
+
+        Args:
+            status_code (int): 再試行の原因のステータスコード（通信エラーの場合はNone）
+        """
+        with self._lock:
+            stats = self._stats(*(_current_pair.get() or _UNKNOWN_PAIR))
+            stats.retries += 1
+            reason = str(status_code) if status_code is not None else "connection"
+            stats.retry_reasons[reason] = stats.retry_reasons.get(reason, 0) + 1
+
+    def record_throttled(self) -> None:
+        """429（レート制限）の応答1件を記録（言語ペアは pair() で設定されたもの）"""
+        with self._lock:
+            stats = self._stats(*(_current_pair.get() or _UNKNOWN_PAIR))
+            stats.throttled += 1
+
+    def summary(self) -> dict:
+        """
+        計測値のサマリーを取得
+
+        Returns:
+            dict: {
+                "started_at", "elapsed_sec",
+                "totals": 全言語ペアの合計（requests, segments, chars, errors, retries, throttled_429, local_hits）,
+                "pairs": {"ja→en": 言語ペアごとの計測値（応答時間のパーセンタイル・ヒストグラムを含む）}
+            }
+        """
+        with self._lock:
+            pairs = {f"{src}→{tgt}": stats.to_dict() for (src, tgt), stats in sorted(self._pairs.items())}
+
+        totals = {
+            key: sum(p[key] for p in pairs.values())
+            for key in ("requests", "segments", "chars", "errors", "retries", "throttled_429", "lookups")
+        }
+        totals["local_hits"] = sum(sum(p["local_hits"].values()) for p in pairs.values())
+        elapsed = time.perf_counter() - self._started
+        totals["chars_per_sec"] = round(totals["chars"] / elapsed, 1) if elapsed else None
+        return {
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_sec": round(elapsed, 2),
+            "totals": totals,
+            "pairs": pairs
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        計測値をPrometheusのテキスト形式で取得
+
+        Returns:
+            str: メトリクスのテキスト（translation_requests_total など）
+        """
+        counters = [
+            ("translation_requests_total", "APIリクエスト数", lambda s: s.requests),
+            ("translation_segments_total", "APIに送信したセグメント数", lambda s: s.segments),
+            ("translation_chars_total", "APIに送信した文字数", lambda s: s.chars),
+            ("translation_errors_total", "失敗したAPIリクエスト数", lambda s: s.errors),
+            ("translation_retries_total", "再試行の回数", lambda s: s.retries),
+            ("translation_throttled_total", "429（レート制限）の応答数", lambda s: s.throttled),
+        ]
+        lines = []
+        with self._lock:
+            items = sorted(self._pairs.items())
+            for name, help_text, value in counters:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (src, tgt), stats in items:
+                    lines.append(f'{name}{{source="{src}",target="{tgt}"}} {value(stats)}')
+
+            lines.append("# HELP translation_local_hits_total ローカル（用語集・キャッシュ・翻訳メモリ）で見つかった件数")
+            lines.append("# TYPE translation_local_hits_total counter")
+            for (src, tgt), stats in items:
+                for origin, count in stats.local_hits.items():
+                    lines.append(
+                        f'translation_local_hits_total{{source="{src}",target="{tgt}",origin="{origin}"}} {count}'
+                    )
+
+            name = "translation_request_duration_seconds"
+            lines.append(f"# HELP {name} APIリクエストの応答時間（再試行を含む）")
+            lines.append(f"# TYPE {name} histogram")
+            for (src, tgt), stats in items:
+                labels = f'source="{src}",target="{tgt}"'
+                # record_requestでバケットごとに数えているため、そのまま累積値になる
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {stats.requests}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency_sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {stats.requests}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Path) -> Path:
+        """
+        サマリーをJSONファイルに書き出す
+
+        Args:
+            path (Path): 出力先
+
+        Returns:
+            Path: 出力先
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_prometheus(self, path: Path) -> Path:
+        """
+        Prometheusのテキスト形式で書き出す（一時ファイル経由で置き換え、textfile collectorが途中の内容を読まない）
+
+        Args:
+            path (Path): 出力先（.prom）
+
+        Returns:
+            Path: 出力先
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+        return path
+
+    def has_data(self) -> bool:
+        """記録した計測値があるか"""
+        with self._lock:
+            return bool(self._pairs)
+
+
+_default_telemetry: Optional[TranslationTelemetry] = None
+_default_lock = threading.Lock()
+
+
+def get_default_telemetry() -> Optional[TranslationTelemetry]:
+    """
+    共有の計測値を取得（初回呼び出し時に作成）
+
+    Returns:
+        TranslationTelemetry: 計測値（TRANSLATION_TELEMETRY_DISABLED=1 の場合はNone）
+    """
+    global _default_telemetry
+
+    if os.getenv("TRANSLATION_TELEMETRY_DISABLED") == "1":
+        return None
+
+    with _default_lock:
+        if _default_telemetry is None:
+            _default_telemetry = TranslationTelemetry()
+    return _default_telemetry
+
+
+@contextmanager
+def measure_request(source_lang: Optional[str], target_lang: str, segments: int, chars: int):
+    """
+    with文の中の処理をAPIリクエスト1件として共有の計測値に記録（計測が無効な場合は何もしない）
+
+    中で記録される再試行・429は同じ言語ペアに割り当てる。例外で抜けた場合はエラーとして記録する。
+
+    Args:
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+        segments (int): 送信するセグメント数
+        chars (int): 送信する文字数
+
+    例:
+        with measure_request("ja", "en", len(chunk), sum(len(t) for t in chunk)):
+            response = send(chunk)
+    """
+    telemetry = get_default_telemetry()
+    if telemetry is None:
+        yield
+        return
+    start = time.perf_counter()
+    error = False
+    try:
+        with telemetry.pair(source_lang, target_lang):
+            yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        telemetry.record_request(source_lang, target_lang, segments, chars, time.perf_counter() - start, error)
+
+
+def write_run_summary(json_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> Optional[Path]:
+    """
+    実行の最後に共有の計測値を書き出し、概要を表示する
+
+    Args:
+        json_path (str): JSONサマリーの出力先（省略時は TRANSLATION_TELEMETRY_FILE、
+            未設定の場合は output/telemetry/translation_telemetry_<日時>.json）
+        prometheus_path (str): Prometheusのテキスト形式の出力先（省略時は TRANSLATION_TELEMETRY_PROMETHEUS、
+            未設定の場合は出力しない）
+
+    Returns:
+        Path: JSONサマリーの出力先（計測が無効・記録がない場合はNone）
+    """
+    telemetry = get_default_telemetry()
+    if telemetry is None or not telemetry.has_data():
+        return None
+
+    json_path = json_path or os.getenv("TRANSLATION_TELEMETRY_FILE") or (
+        DEFAULT_TELEMETRY_DIR / f"translation_telemetry_{telemetry.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    try:
+        written = telemetry.write_json(json_path)
+        prometheus_path = prometheus_path or os.getenv("TRANSLATION_TELEMETRY_PROMETHEUS")
+        if prometheus_path:
+            telemetry.write_prometheus(prometheus_path)
+    except OSError as e:
+        # 計測値の書き出しに失敗しても翻訳結果には影響させない
+        print(f"[WARNING] 計測値を書き出せませんでした: {e}")
+        return None
+
+    totals = telemetry.summary()["totals"]
+    print(f"[INFO] 計測値: APIリクエスト {totals['requests']}件、{totals['segments']}セグメント、"
+          f"{totals['chars']}文字、再試行 {totals['retries']}回、429 {totals['throttled_429']}回、"
+          f"ローカル {totals['local_hits']}件 → {written}")
+    return written
@@ -2,19 +2,253 @@
 Google Cloud Translation APIを使用した翻訳スクリプト
 REST API版（APIキー認証）
 """
+import html
+import json
 import requests
 from dotenv import load_dotenv
 import os
-from typing import Optional
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+# scripts.translator としてimportされた場合も同じフォルダのモジュールを読めるようにする
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_cache import get_default_cache, normalize_text
+from glossary import get_default_glossary
+from translation_memory import get_default_memory, get_reuse_threshold
+from http_client import request_with_retry, retry_after_seconds, RETRY_STATUS_CODES
+from api_key_pool import get_default_pool, KeyRejectedError, COOLDOWN_STATUS_CODES
+from char_budget import get_default_budget, BudgetExceededError
+from script_detector import classify_script
+from translation_telemetry import get_default_telemetry, measure_request
 
 
 # .envファイルから環境変数を読み込み
 load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-BASE_URL = "https://translation.googleapis.com/language/translate/v2"
+# キープール（GOOGLE_API_KEYS）だけを設定した場合は先頭のキーを使う（翻訳リクエストはキープールから選ぶ）
+API_KEY = os.getenv("GOOGLE_API_KEY") or (os.getenv("GOOGLE_API_KEYS") or "").split(",")[0].strip() or None
+API_VERSION = "v2"
+# 環境変数 TRANSLATION_API_BASE_URL でローカル代替サーバー（stub_translation_server.py）などに切り替え可能
+BASE_URL = os.getenv("TRANSLATION_API_BASE_URL", "https://translation.googleapis.com/language/translate/v2")
 
+# 1リクエストあたりの上限（Translation API v2: 最大128セグメント、推奨5000文字以内）
+MAX_SEGMENTS_PER_REQUEST = 128
+MAX_CHARS_PER_REQUEST = 5000
 
-def translate_words(words: list[str], source_lang: Optional[str] = None, target_lang: str = "ja") -> list[str]:
+
+def get_local_backends(
+    use_glossary: bool = True,
+    use_cache: bool = True
+) -> list[tuple[str, Callable[[list[str], Optional[str], str], list[Optional[str]]]]]:
+    """
+    APIより先に問い合わせるローカルの翻訳元を優先順に取得
+
+    用語集 → キャッシュ → 翻訳メモリ（あいまい一致、TRANSLATION_MEMORY_REUSE_THRESHOLD
+    を設定した場合のみ）の順。
+
+    Args:
+        use_glossary (bool): 用語集（glossary）を使うか
+        use_cache (bool): 翻訳キャッシュ・翻訳メモリを使うか
+
+    Returns:
+        list: (出典名, 検索関数) のリスト
+            検索関数は (単語リスト, ソース言語, ターゲット言語) を受け取り、
+            見つからないものをNoneとした入力順のリストを返す
+    """
+    backends = []
+    glossary = get_default_glossary() if use_glossary else None
+    if glossary is not None:
+        backends.append(("glossary", glossary.get_many))
+    cache = get_default_cache() if use_cache else None
+    if cache is not None:
+        backends.append((
+            "cache",
+            lambda words, source_lang, target_lang: cache.get_many(words, source_lang, target_lang, "text", API_VERSION)
+        ))
+    reuse_threshold = get_reuse_threshold()
+    memory = get_default_memory() if use_cache and reuse_threshold is not None else None
+    if memory is not None:
+        backends.append((
+            "memory",
+            lambda words, source_lang, target_lang: [
+                match.translation if match else None
+                for match in memory.best_many(words, source_lang, target_lang, reuse_threshold)
+            ]
+        ))
+    return backends
+
+
+def store_translations(
+    words: list[str],
+    translated: list[str],
+    source_lang: Optional[str],
+    target_lang: str,
+    use_cache: bool = True
+) -> None:
+    """
+    APIの翻訳結果をキャッシュ・翻訳メモリに保存
+
+    Args:
+        words (list[str]): 翻訳元の単語のリスト
+        translated (list[str]): 翻訳結果のリスト
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+        use_cache (bool): Falseの場合は何もしない
+    """
+    if not use_cache:
+        return
+    cache = get_default_cache()
+    if cache is not None:
+        cache.put_many(words, translated, source_lang, target_lang, "text", API_VERSION)
+    memory = get_default_memory()
+    if memory is not None:
+        memory.add_many(words, translated, source_lang, target_lang)
+
+
+def lookup_local(
+    words: list[str],
+    source_lang: Optional[str],
+    target_lang: str,
+    use_glossary: bool = True,
+    use_cache: bool = True
+) -> tuple[list[Optional[str]], list[Optional[str]]]:
+    """
+    ローカルの翻訳元（用語集 → キャッシュ → 翻訳メモリの順）で翻訳結果を検索
+
+    Args:
+        words (list[str]): 検索する単語のリスト
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+        use_glossary (bool): 用語集を使うか
+        use_cache (bool): 翻訳キャッシュを使うか
+
+    Returns:
+        tuple: (翻訳結果のリスト, 出典のリスト)
+            見つからなかった単語はどちらもNone
+    """
+    results: list[Optional[str]] = [None] * len(words)
+    provenance: list[Optional[str]] = [None] * len(words)
+    for name, get_many in get_local_backends(use_glossary, use_cache):
+        pending = [i for i, r in enumerate(results) if r is None]
+        if not pending:
+            break
+        found = get_many([words[i] for i in pending], source_lang, target_lang)
+        for i, value in zip(pending, found):
+            if value is not None:
+                results[i] = value
+                provenance[i] = name
+    return results, provenance
+
+
+def unique_misses(words: list[str], results: list[Optional[str]]) -> list[str]:
+    """
+    ローカルで見つからなかった単語をキャッシュキー（normalize_text）単位で重複除去
+
+    キャッシュはnormalize_textしたテキストをキーにするため、"犬" と " 犬 " のように
+    キーが同じ単語は1件だけ（最初に出てきたもの）をAPIに送る。
+    結果は normalize_text(単語) をキーにして元の単語すべてに戻す。
+
+    Args:
+        words (list[str]): 単語のリスト
+        results (list[Optional[str]]): lookup_localの翻訳結果（見つからなかったものはNone）
+
+    Returns:
+        list[str]: APIに送る単語のリスト（入力順）
+    """
+    representatives: dict[str, str] = {}
+    for word, result in zip(words, results):
+        if result is None:
+            representatives.setdefault(normalize_text(word), word)
+    return list(representatives.values())
+
+
+def translate_words_with_provenance(
+    words: list[str],
+    source_lang: Optional[str] = None,
+    target_lang: str = "ja",
+    use_cache: bool = True,
+    use_glossary: bool = True
+) -> list[tuple[str, str]]:
+    """
+    複数単語をまとめて翻訳し、各結果の出典も返す
+
+    用語集 → キャッシュ → 翻訳メモリ → APIの順に問い合わせ、ローカルで見つからない単語
+    （重複除去）だけをAPIに送る。APIの結果はキャッシュ・翻訳メモリに保存する。
+
+    Args:
+        words (list[str]): 翻訳する単語のリスト
+        source_lang (str): ソース言語コード（Noneの場合は自動検出、用語集は使わない）
+        target_lang (str): ターゲット言語コード（デフォルト: "ja"）
+        use_cache (bool): 翻訳キャッシュを使うか（デフォルト: True）
+        use_glossary (bool): 用語集を使うか（デフォルト: True）
+
+    Returns:
+        list[tuple[str, str]]: (翻訳結果, 出典) のリスト
+            出典は "glossary"（用語集）、"cache"（キャッシュ）、"memory"（翻訳メモリのあいまい一致）、
+            "api"（APIで翻訳）のいずれか
+
+    Raises:
+        Exception: 翻訳APIエラー
+
+    例:
+        for translated, source in translate_words_with_provenance(["工場", "犬"], "ja", "en"):
+            print(translated, source)   # Factory; plant glossary / dog api
+    """
+    if not words:
+        return []
+
+    results, provenance = lookup_local(words, source_lang, target_lang, use_glossary, use_cache)
+    telemetry = get_default_telemetry()
+    if telemetry is not None:
+        telemetry.record_lookup(source_lang, target_lang, provenance)
+    misses = unique_misses(words, results)
+    if misses:
+        translated = _request_translations(misses, source_lang, target_lang)
+        store_translations(misses, translated, source_lang, target_lang, use_cache)
+        translated_map = {normalize_text(w): t for w, t in zip(misses, translated)}
+        results = [r if r is not None else translated_map[normalize_text(w)] for w, r in zip(words, results)]
+        provenance = [p if p is not None else "api" for p in provenance]
+
+    return list(zip(results, provenance))
+
+
+def find_similar_translations(
+    words: list[str],
+    source_lang: Optional[str],
+    target_lang: str,
+    threshold: Optional[float] = None
+) -> list:
+    """
+    翻訳メモリから類似度の高い過去の翻訳を検索（APIを呼ぶ前の確認・報告用）
+
+    Args:
+        words (list[str]): 検索するテキストのリスト
+        source_lang (str): ソース言語コード
+        target_lang (str): ターゲット言語コード
+        threshold (float): 類似度の下限（省略時は0.8）
+
+    Returns:
+        list[Optional[FuzzyMatch]]: 入力順の最も類似した過去の翻訳（一致なし・翻訳メモリ無効時はNone）
+            FuzzyMatchは (source, translation, score) を持つ
+
+    例:
+        for text, match in zip(texts, find_similar_translations(texts, "ja", "en")):
+            if match:
+                print(f"{match.score:.0%} {text} ≒ {match.source} → {match.translation}")
+    """
+    memory = get_default_memory()
+    if memory is None:
+        return [None] * len(words)
+    return memory.best_many(words, source_lang, target_lang, threshold)
+
+
+def translate_words(
+    words: list[str],
+    source_lang: Optional[str] = None,
+    target_lang: str = "ja",
+    use_cache: bool = True,
+    use_glossary: bool = True
+) -> list[str]:
     """
     複数単語をまとめて翻訳
 
@@ -22,6 +256,10 @@ def translate_words(words: list[str], source_lang: Optional[str] = None, target_
         words (list[str]): 翻訳する単語のリスト
         source_lang (str): ソース言語コード（Noneの場合は自動検出）
         target_lang (str): ターゲット言語コード（デフォルト: "ja"）
+        use_cache (bool): 翻訳キャッシュを使うか（デフォルト: True）
+            キャッシュにない単語だけをAPIに送り、結果を入力順に戻す
+        use_glossary (bool): 用語集（テンプレートの訳語）を使うか（デフォルト: True）
+            用語集にある日本語の単語はAPIを呼ばずに用語集の訳語を返す
 
     Returns:
         list[str]: 翻訳結果のリスト
@@ -39,20 +277,153 @@ def translate_words(words: list[str], source_lang: Optional[str] = None, target_
         # 自動検出
         translate_words(["hello", "world"], target_lang="ja")
     """
-    if not words:
-        return []
+    return [
+        translated for translated, _ in
+        translate_words_with_provenance(words, source_lang, target_lang, use_cache, use_glossary)
+    ]
+
 
+def chunk_segments(
+    words: list[str],
+    max_segments: int = MAX_SEGMENTS_PER_REQUEST,
+    max_chars: int = MAX_CHARS_PER_REQUEST
+) -> list[list[str]]:
+    """
+    単語リストをAPIの上限（セグメント数・文字数）に収まるチャンクに分割
+
+    先頭から順番に詰め込み、上限を超える手前で次のチャンクに切り替える。
+    1件で文字数上限を超える単語は単独のチャンクにする。
+    チャンクを順番に連結すると元のリストに戻る。
+
+    Args:
+        words (list[str]): 分割する単語のリスト
+        max_segments (int): 1チャンクの最大セグメント数
+        max_chars (int): 1チャンクの最大文字数
+
+    Returns:
+        list[list[str]]: チャンクのリスト
+
+    例:
+        chunk_segments(["a", "b", "c"], max_segments=2)  # [["a", "b"], ["c"]]
+    """
+    chunks = []
+    current = []
+    current_chars = 0
+    for word in words:
+        length = len(word)
+        if current and (len(current) >= max_segments or current_chars + length > max_chars):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(word)
+        current_chars += length
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _request_translations(words: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+    """
+    Translation APIに翻訳リクエストを送信（キャッシュなし）
+
+    上限を超える件数はchunk_segmentsで分割して送信し、入力順に結合して返す。
+
+    Args:
+        words (list[str]): 翻訳する単語のリスト
+        source_lang (str): ソース言語コード（Noneの場合は自動検出）
+        target_lang (str): ターゲット言語コード
+
+    Returns:
+        list[str]: 翻訳結果のリスト
+
+    Raises:
+        Exception: 翻訳APIエラー
+    """
+    results = []
+    for chunk in chunk_segments(words):
+        results.extend(_request_chunk(chunk, source_lang, target_lang))
+    return results
+
+
+def _post_with_key_pool(body: dict, chars: int, url: Optional[str] = None):
+    """
+    キープールの中で余裕が最も大きいAPIキーで翻訳・言語検出リクエストを送信
+
+    403/429を返したキーはクールダウンにして別のキーで再試行する（5xxはhttp_clientが同じキーで再試行）。
+
+    Args:
+        body (dict): リクエストボディ
+        chars (int): 送信する文字数（キーごとの利用量の記録用）
+        url (str): 送信先（省略時は翻訳APIのBASE_URL）
+
+    Returns:
+        requests.Response: レスポンス
+
+    Raises:
+        KeyRejectedError: すべての試行でキーが拒否された場合
+    """
+    url = url or BASE_URL
+    pool = get_default_pool("api_key")
+    if pool is None:
+        # キー未設定（ローカル代替サーバーなど）の場合はプールを使わずに送信
+        return request_with_retry("POST", url, params={"key": API_KEY}, json=body)
+
+    def send(credential):
+        response = request_with_retry(
+            "POST", url, params={"key": credential.api_key}, json=body,
+            retry_status_codes=RETRY_STATUS_CODES - COOLDOWN_STATUS_CODES
+        )
+        if response.status_code in COOLDOWN_STATUS_CODES:
+            raise KeyRejectedError(response.status_code, retry_after_seconds(response))
+        return response
+
+    return pool.execute(chars, send)
+
+
+def _request_chunk(words: list[str], source_lang: Optional[str], target_lang: str) -> list[str]:
+    """
+    1チャンク分の翻訳リクエストを送信
+
+    テキストはURLではなくリクエストボディ（JSON）で送る（URL長エラー対策）。
+    429/5xxはhttp_clientがこのチャンクだけを再試行する。
+    結果のHTML実体参照（&#39; など）はここで戻すため、キャッシュにはどの経路からも同じ形で保存される。
+
+    Args:
+        words (list[str]): 翻訳する単語のリスト（API上限以内）
+        source_lang (str): ソース言語コード（Noneの場合は自動検出）
+        target_lang (str): ターゲット言語コード
+
+    Returns:
+        list[str]: 翻訳結果のリスト
+
+    Raises:
+        BudgetExceededError: 文字数の上限（TRANSLATION_CHAR_BUDGET）を超える場合（送信しない）
+        KeyRejectedError: キープールのすべてのキーで403/429が続いた場合
+        Exception: 翻訳APIエラー
+    """
+    chars = sum(len(w) for w in words)
+    budget = get_default_budget()
+    if budget is not None:
+        budget.consume(chars)
+
+    # 応答時間・再試行・429を言語ペアごとに記録
+    with measure_request(source_lang, target_lang, len(words), chars):
+        translated = _post_translations(words, source_lang, target_lang, chars)
+    return [html.unescape(t) for t in translated]
+
+
+def _post_translations(words: list[str], source_lang: Optional[str], target_lang: str, chars: int) -> list[str]:
+    """_request_chunkの送信部分（リクエストボディの作成・送信・レスポンスの解析）"""
     try:
-        params = {
-            "key": API_KEY,
+        body = {
             "q": words,
             "target": target_lang,
             "format": "text"
         }
         if source_lang:
-            params["source"] = source_lang
+            body["source"] = source_lang
 
-        response = requests.post(BASE_URL, params=params)
+        response = _post_with_key_pool(body, chars)
 
         if response.status_code != 200:
             error_msg = f"APIエラー: ステータスコード {response.status_code}"
@@ -69,6 +440,8 @@ def translate_words(words: list[str], source_lang: Optional[str] = None, target_
         return [t["translatedText"] for t in translations]
     except requests.exceptions.RequestException as e:
         raise Exception(f"翻訳エラー: 通信エラーが発生しました")
+    except KeyRejectedError:
+        raise
     except KeyError as e:
         raise Exception(f"翻訳エラー: レスポンスの形式が不正です")
     except Exception as e:
@@ -118,32 +491,118 @@ def detect_language(text: str) -> dict:
         text (str): 検出対象のテキスト
 
     Returns:
-        dict: 言語情報（language, confidence）
+        dict: 言語情報（language, confidence, source）
 
     Raises:
         Exception: 言語検出エラー
     """
-    if not text:
-        return {"language": None, "confidence": 0}
+    return detect_languages([text])[0]
 
-    try:
-        detect_url = f"{BASE_URL}/detect"
-        params = {
-            "key": API_KEY,
-            "q": text
-        }
-        response = requests.post(detect_url, params=params)
-        response.raise_for_status()
 
-        data = response.json()
-        detection = data["data"]["detections"][0][0]
-        return {
-            "language": detection["language"],
-            "confidence": detection["confidence"]
-        }
+def detect_languages(
+    texts: list[str],
+    use_cache: bool = True,
+    use_script: bool = True
+) -> list[dict]:
+    """
+    複数テキストの言語をまとめて検出
+
+    重複を除いたうえで、文字種による判定（タイ文字・クメール文字など1言語でしか使わない文字）→
+    キャッシュ → 言語検出API（チャンクに分割して送信）の順に調べる。APIの結果はキャッシュに保存する。
+
+    Args:
+        texts (list[str]): 検出対象のテキストのリスト
+        use_cache (bool): キャッシュを使うか（デフォルト: True）
+        use_script (bool): 文字種による判定を使うか（デフォルト: True）
+
+    Returns:
+        list[dict]: 入力と同じ順番の言語情報
+            {"language": 言語コード, "confidence": 信頼度, "source": "script" / "cache" / "api"}
+            空のテキストは {"language": None, "confidence": 0, "source": None}
+
+    Raises:
+        Exception: 言語検出エラー
+
+    例:
+        detect_languages(["ความปลอดภัย", "safety", "安全"])
+        # [{"language": "th", "confidence": 1.0, "source": "script"}, {"language": "en", ...}, ...]
+    """
+    unique = list(dict.fromkeys(t for t in texts if t))
+    found: dict[str, dict] = {}
+
+    if use_script:
+        for text in unique:
+            lang = classify_script(text)
+            if lang is not None:
+                found[text] = {"language": lang, "confidence": 1.0, "source": "script"}
+
+    pending = [t for t in unique if t not in found]
+    cache = get_default_cache() if use_cache else None
+    if cache is not None and pending:
+        for text, cached in zip(pending, cache.get_many(pending, None, "detect", fmt="detect")):
+            if cached is not None:
+                found[text] = {**json.loads(cached), "source": "cache"}
+        pending = [t for t in pending if t not in found]
+
+    try:
+        for chunk in chunk_segments(pending):
+            detections = _request_detect_chunk(chunk)
+            for text, detection in zip(chunk, detections):
+                found[text] = {**detection, "source": "api"}
+            if cache is not None:
+                cache.put_many(
+                    chunk, [json.dumps(d) for d in detections], None, "detect", fmt="detect"
+                )
+    except BudgetExceededError:
+        raise
     except Exception as e:
         raise Exception(f"言語検出エラー: {e}")
 
+    return [
+        found[t] if t else {"language": None, "confidence": 0, "source": None}
+        for t in texts
+    ]
+
+
+def _request_detect_chunk(texts: list[str]) -> list[dict]:
+    """
+    1チャンク分の言語検出リクエストを送信
+
+    Args:
+        texts (list[str]): 検出対象のテキストのリスト（API上限以内）
+
+    Returns:
+        list[dict]: 言語情報（language, confidence）のリスト
+
+    Raises:
+        BudgetExceededError: 文字数の上限（TRANSLATION_CHAR_BUDGET）を超える場合（送信しない）
+        Exception: 言語検出APIエラー
+    """
+    chars = sum(len(t) for t in texts)
+    budget = get_default_budget()
+    if budget is not None:
+        budget.consume(chars)
+
+    with measure_request(None, "detect", len(texts), chars):
+        response = _post_with_key_pool({"q": texts}, chars, f"{BASE_URL}/detect")
+        response.raise_for_status()
+    data = response.json()
+    return [
+        {"language": detection[0]["language"], "confidence": detection[0]["confidence"]}
+        for detection in data["data"]["detections"]
+    ]
+
+
+def get_cache_stats() -> Optional[dict]:
+    """
+    翻訳キャッシュのヒット/ミス件数を取得
+
+    Returns:
+        dict: TranslationCache.stats() の結果（キャッシュ無効時はNone）
+    """
+    cache = get_default_cache()
+    return cache.stats() if cache else None
+
 
 def round_trip_translate(text: str, intermediate_lang: str = "en") -> dict:
     """
@@ -275,7 +734,7 @@ def get_supported_languages(target_lang: str = "ja") -> list[dict]:
             "key": API_KEY,
             "target": target_lang
         }
-        response = requests.get(languages_url, params=params)
+        response = request_with_retry("GET", languages_url, params=params)
         response.raise_for_status()
 
         data = response.json()
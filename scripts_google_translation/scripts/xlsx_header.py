@@ -0,0 +1,203 @@
+"""
+xlsxファイルのヘッダー行（1行目）だけを高速に読み込む
+openpyxlでブックを開かず、zip内のシートXMLを直接読んで1行目で打ち切る
+（共有文字列も必要な番号までしか読まないため、大きなブックでもほぼ一定時間）
+"""
+import re
+import zipfile
+from pathlib import Path
+from typing import Optional
+from xml.etree.ElementTree import iterparse
+
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_CELL_REF = re.compile(r"^([A-Z]+)(\d+)$")
+_RANGE_REF = re.compile(r"^[A-Z]+\d+:([A-Z]+)\d+$")
+
+
+class SheetNotFoundError(ValueError):
+    """指定したシートがブックに存在しない"""
+
+
+class _FallbackRequired(Exception):
+    """XMLの直接読み込みでは扱えない（openpyxlで読み直す）"""
+
+
+def _column_index(letters: str) -> int:
+    """列記号（"A", "AB"など）を0始まりのインデックスに変換"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord("A") + 1)
+    return index - 1
+
+
+def _rich_text(elem) -> str:
+    """文字列要素（si / is）のテキストを連結（ふりがなのrPhは除外、openpyxlと同じ）"""
+    parts = []
+    for child in elem:
+        if child.tag == _NS_MAIN + "t":
+            parts.append(child.text or "")
+        elif child.tag == _NS_MAIN + "r":
+            parts.extend(t.text or "" for t in child.iter(_NS_MAIN + "t"))
+    return "".join(parts)
+
+
+def _sheet_path(archive: zipfile.ZipFile, sheet_name: Optional[str]) -> str:
+    """
+    シート名（省略時はアクティブシート）に対応するzip内のXMLパスを取得
+
+    Raises:
+        SheetNotFoundError: シートが見つからない場合
+    """
+    sheets = []
+    active_tab = 0
+    with archive.open("xl/workbook.xml") as f:
+        for _, elem in iterparse(f):
+            if elem.tag == _NS_MAIN + "sheet":
+                sheets.append((elem.get("name"), elem.get(_NS_REL + "id")))
+            elif elem.tag == _NS_MAIN + "workbookView":
+                active_tab = int(elem.get("activeTab", "0"))
+
+    if sheet_name:
+        matches = [rel_id for name, rel_id in sheets if name == sheet_name]
+        if not matches:
+            raise SheetNotFoundError(
+                f"シート '{sheet_name}' が見つかりません。利用可能なシート: {[name for name, _ in sheets]}"
+            )
+        rel_id = matches[0]
+    else:
+        if not sheets:
+            raise _FallbackRequired()
+        rel_id = sheets[min(active_tab, len(sheets) - 1)][1]
+
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        for _, elem in iterparse(f):
+            if elem.tag == _NS_PKG_REL + "Relationship" and elem.get("Id") == rel_id:
+                target = elem.get("Target")
+                return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise _FallbackRequired()
+
+
+def _shared_strings(archive: zipfile.ZipFile, indices: set[int]) -> dict[int, str]:
+    """共有文字列のうち指定番号のものだけを読み込む（最大番号まで読んだら打ち切る）"""
+    if not indices:
+        return {}
+    strings = {}
+    last = max(indices)
+    position = 0
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, elem in iterparse(f):
+            if elem.tag != _NS_MAIN + "si":
+                continue
+            if position in indices:
+                strings[position] = _rich_text(elem)
+            elem.clear()
+            position += 1
+            if position > last:
+                break
+    return strings
+
+
+def _read_header_xml(path: Path, sheet_name: Optional[str]) -> Optional[list[str]]:
+    """シートXMLから1行目を読み込む（文字列以外のセルがある場合は_FallbackRequired）"""
+    with zipfile.ZipFile(path) as archive:
+        sheet_xml = _sheet_path(archive, sheet_name)
+
+        max_column = None
+        cells: dict[int, tuple[str, str]] = {}
+        found_row = False
+        with archive.open(sheet_xml) as f:
+            for _, elem in iterparse(f):
+                if elem.tag == _NS_MAIN + "dimension":
+                    match = _RANGE_REF.match(elem.get("ref", ""))
+                    if match:
+                        max_column = _column_index(match.group(1)) + 1
+                elif elem.tag == _NS_MAIN + "row":
+                    if elem.get("r", "1") != "1":
+                        raise _FallbackRequired()
+                    for position, cell in enumerate(elem.iter(_NS_MAIN + "c")):
+                        match = _CELL_REF.match(cell.get("r", ""))
+                        column = _column_index(match.group(1)) if match else position
+                        cell_type = cell.get("t", "n")
+                        if cell_type == "inlineStr":
+                            inline = cell.find(_NS_MAIN + "is")
+                            value = _rich_text(inline) if inline is not None else ""
+                        else:
+                            value_elem = cell.find(_NS_MAIN + "v")
+                            if value_elem is None:
+                                continue
+                            value = value_elem.text or ""
+                        if cell_type not in ("s", "str", "inlineStr"):
+                            # 数値・日付・真偽値はopenpyxlの変換に任せる
+                            raise _FallbackRequired()
+                        cells[column] = (cell_type, value)
+                    found_row = True
+                    break
+                elif elem.tag == _NS_MAIN + "sheetData":
+                    # 1行もないシート
+                    break
+
+        if not found_row:
+            return None
+
+        shared = _shared_strings(archive, {int(v) for t, v in cells.values() if t == "s"})
+
+    width = max(max(cells) + 1 if cells else 0, max_column or 0)
+    header = [""] * width
+    for column, (cell_type, value) in cells.items():
+        header[column] = shared.get(int(value), "") if cell_type == "s" else value
+    return header
+
+
+def _read_header_openpyxl(path: Path, sheet_name: Optional[str]) -> Optional[list[str]]:
+    """openpyxl（read_only、1行目のみ）でヘッダー行を読み込む"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name:
+            if sheet_name not in wb.sheetnames:
+                raise SheetNotFoundError(f"シート '{sheet_name}' が見つかりません。利用可能なシート: {wb.sheetnames}")
+            ws = wb[sheet_name]
+        else:
+            ws = wb.active
+
+        for row in ws.iter_rows(values_only=True, max_row=1):
+            return [str(cell) if cell is not None else "" for cell in row]
+        return None
+    finally:
+        wb.close()
+
+
+def read_xlsx_header(path: str, sheet_name: Optional[str] = None) -> Optional[list[str]]:
+    """
+    xlsxファイルのヘッダー行（1行目）を読み込む
+
+    シートXMLを直接読んで1行目だけを取り出す。文字列以外のセルを含むなど
+    直接読み込みで扱えない場合はopenpyxl（read_only、max_row=1）で読み直す。
+
+    Args:
+        path (str): xlsxファイルのパス
+        sheet_name (str): シート名（省略時はアクティブシート）
+
+    Returns:
+        list[str]: 列名のリスト（空のセルは""、シートが空の場合はNone）
+
+    Raises:
+        FileNotFoundError: ファイルが見つからない場合
+        SheetNotFoundError: シートが見つからない場合
+
+    例:
+        columns = read_xlsx_header("input/terms.xlsx")
+        print(columns)   # ['日本語', '英語', ...]
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {path}")
+    try:
+        return _read_header_xml(path, sheet_name)
+    except (_FallbackRequired, KeyError, zipfile.BadZipFile):
+        return _read_header_openpyxl(path, sheet_name)
@@ -8,10 +8,20 @@ from google.cloud import translate_v2 as translate
 from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill
-import time
 from dotenv import load_dotenv
-import requests
-import html
+import sys
+from pathlib import Path
+
+# 翻訳モジュール（scripts_google_translation/scripts）をパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts_google_translation' / 'scripts'))
+from run_journal import RunJournal
+from char_budget import set_default_budget
+from cost_estimator import estimate_jobs, print_estimate
+from api_key_pool import get_default_pool
+from language_codes import get_language_registry
+from translation_client import TranslationClient, GoogleRestBackend, GoogleClientLibraryBackend
+from cell_hashes import CellHashManifest, default_manifest_path
+from translation_telemetry import write_run_summary
 
 # .envファイルから環境変数を読み込み
 load_dotenv()
@@ -26,55 +36,50 @@ print("=" * 80)
 print(f"実行日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
-# 翻訳関数（APIキーを使用してREST APIで翻訳）
-def translate_with_api_key(texts, source_lang, target_lang, api_key):
-    """
-    Google Translate REST APIを使って翻訳（複数テキスト対応）
+# 並列翻訳の設定（同時リクエスト数・1秒あたりのリクエスト数）
+MAX_CONCURRENCY = 8
+REQUESTS_PER_SECOND = 10
 
-    Args:
-        texts: 翻訳するテキスト（文字列またはリスト）
-        source_lang: ソース言語コード
-        target_lang: ターゲット言語コード
-        api_key: Google API キー
-
-    Returns:
-        翻訳結果（文字列またはリスト）
-    """
-    base_url = "https://translation.googleapis.com/language/translate/v2"
-
-    # 単一文字列の場合はリストに変換
-    single_input = isinstance(texts, str)
-    if single_input:
-        texts = [texts]
-
-    params = {
-        "key": api_key,
-        "q": texts,
-        "source": source_lang,
-        "target": target_lang,
-        "format": "text"
-    }
-
-    response = requests.post(base_url, params=params)
-    response.raise_for_status()
+# 再開モード（--resume: 前回の実行で完了したバッチを再利用し、残りと失敗分だけを翻訳）
+resume = '--resume' in sys.argv
+journal_file = os.path.join(output_dir, '逆翻訳_journal.jsonl')
+excel_file = os.path.join(output_dir, '逆翻訳_検証結果.xlsx')
 
-    result = response.json()
-    # HTMLエスケープをデコード
-    translations = [html.unescape(t['translatedText']) for t in result['data']['translations']]
+# 全セル翻訳（--full: 前回の結果を引き継がず、全セルを翻訳し直す）
+full = '--full' in sys.argv
 
-    # 単一入力の場合は文字列を返す
-    return translations[0] if single_input else translations
+# 見積もりモード（--dry-run: APIに接続せず、課金文字数・リクエスト数・所要時間の見積もりだけを表示）
+dry_run = '--dry-run' in sys.argv
 
+# 文字数の上限（--budget=N: 送信文字数がN文字を超える前に翻訳を中止、完了分はジャーナルに残る）
+for arg in sys.argv[1:]:
+    if arg.startswith('--budget='):
+        set_default_budget(int(arg.split('=', 1)[1]))
 
 # Google Translate クライアント初期化
-api_key = os.getenv('GOOGLE_API_KEY')
-use_api_key = bool(api_key)
+# APIキー（GOOGLE_API_KEY / GOOGLE_API_KEYS）・サービスアカウント（GOOGLE_APPLICATION_CREDENTIALS_POOL）は
+# キープールにまとめ、余裕が最も大きいキーに送る（403/429を返したキーは一定時間使わない）
+api_key_pool = get_default_pool('api_key')
+service_account_pool = get_default_pool('service_account')
+use_api_key = api_key_pool is not None
 
 if use_api_key:
+    # 1秒あたりのリクエスト数の上限はキーの数だけ増やす
+    REQUESTS_PER_SECOND *= len(api_key_pool)
+
+if dry_run:
+    print("見積もりモード: APIには接続しません")
+    translate_client = None
+elif use_api_key:
     print("Google Translate API: 初期化成功")
-    print("認証方法: APIキー（.envファイルから読み込み）")
+    print(f"認証方法: APIキー {len(api_key_pool)}件（.envファイルから読み込み）")
     print("使用方式: REST API")
     translate_client = None  # REST APIを使うのでクライアント不要
+elif service_account_pool is not None:
+    print("Google Translate API: 初期化成功")
+    print(f"認証方法: サービスアカウント {len(service_account_pool)}件（.envファイルから読み込み）")
+    print("使用方式: Python Client Library")
+    translate_client = None  # キープールの認証情報ごとにクライアントを作成
 else:
     try:
         # サービスアカウント（デフォルト認証）で認証
@@ -97,6 +102,9 @@ else:
         print(".envファイルの場所: プロジェクトルート")
         exit(1)
 
+# REST API・Client Libraryのどちらでも、用語集・キャッシュ・重複除去・並列送信は翻訳クライアントが行う
+backend = GoogleRestBackend() if use_api_key else GoogleClientLibraryBackend(client=translate_client)
+
 print()
 
 # テンプレートCSV読み込み
@@ -108,36 +116,16 @@ print(f"行数: {len(df)}行")
 print(f"列数: {len(df.columns)}列")
 print()
 
-# 言語コードと列名のマッピング
-lang_mapping = {
-    'en': '英語',
-    'fil-PH': 'タガログ語',
-    'zh': '中国語',
-    'th': 'タイ語',
-    'vi': 'ベトナム語',
-    'my': 'ミャンマー語',
-    'id': 'インドネシア語',
-    'km': 'カンボジア語'
-}
-
-# Google Translate APIの言語コードマッピング（fil-PH -> tl など）
-api_lang_codes = {
-    'en': 'en',
-    'fil-PH': 'tl',  # Tagalog
-    'zh': 'zh-CN',   # Chinese (Simplified)
-    'th': 'th',
-    'vi': 'vi',
-    'my': 'my',
-    'id': 'id',
-    'km': 'km'
-}
+# 逆翻訳する列（言語名・APIの言語コードは core_files/language_code_mapping.json の一覧から取得）
+registry = get_language_registry()
+target_columns = ['en', 'fil-PH', 'zh', 'th', 'vi', 'my', 'id', 'km']
 
 # 出力用データフレーム（元のデータをコピー）
 df_output = df.copy()
 
 print("翻訳対象の列:")
-for col_code, lang_name in lang_mapping.items():
-    print(f"  {col_code:10s} → {lang_name}")
+for col_code in target_columns:
+    print(f"  {col_code:10s} → {registry.name(col_code)}")
 print()
 
 # 各言語列を日本語に逆翻訳
@@ -146,8 +134,10 @@ print("逆翻訳処理開始")
 print("=" * 80)
 print()
 
-for col_code, lang_name in lang_mapping.items():
-    print(f"処理中: {lang_name} ({col_code})")
+# 翻訳対象のテキストを列ごとに収集（重複除去）
+column_texts = {}
+for col_code in target_columns:
+    print(f"対象: {registry.name(col_code)} ({col_code})")
 
     # 翻訳対象のテキストを取得（空欄を除く）
     translations = df[col_code].dropna().tolist()
@@ -159,77 +149,87 @@ for col_code, lang_name in lang_mapping.items():
 
     if len(translations) == 0:
         print(f"  スキップ: 翻訳対象なし")
-        print()
         continue
 
-    # 逆翻訳結果を格納
-    reverse_translations = {}
-
-    # バッチ処理（API制限対策）
-    # バッチサイズを20に設定（URLが長すぎるエラーを防ぐ）
-    batch_size = 20
-    total_batches = (len(translations) + batch_size - 1) // batch_size
-
-    for batch_idx in range(total_batches):
-        start_idx = batch_idx * batch_size
-        end_idx = min((batch_idx + 1) * batch_size, len(translations))
-        batch = translations[start_idx:end_idx]
-
-        print(f"  バッチ {batch_idx + 1}/{total_batches}: {len(batch)}件")
-
-        try:
-            # Google Translate API で翻訳
-            source_lang = api_lang_codes[col_code]
-
-            # 未翻訳のテキストのみを抽出
-            texts_to_translate = [t for t in batch if t not in reverse_translations]
-
-            if len(texts_to_translate) > 0:
-                if use_api_key:
-                    # REST APIで翻訳（APIキー使用・バッチ処理）
-                    translated_texts = translate_with_api_key(
-                        texts_to_translate,
-                        source_lang=source_lang,
-                        target_lang='ja',
-                        api_key=api_key
-                    )
-                    # 結果を辞書に格納
-                    for original, translated in zip(texts_to_translate, translated_texts):
-                        reverse_translations[original] = translated
-                else:
-                    # Client Libraryで翻訳（サービスアカウント使用）
-                    for text in texts_to_translate:
-                        result = translate_client.translate(
-                            text,
-                            source_language=source_lang,
-                            target_language='ja'
-                        )
-                        reverse_translations[text] = result['translatedText']
-
-            # API制限対策（1秒待機）
-            if batch_idx < total_batches - 1:
-                time.sleep(1)
-
-        except Exception as e:
-            print(f"  エラー: {e}")
-            print(f"  バッチ {batch_idx + 1} をスキップします")
-
-    # 逆翻訳結果をデータフレームに適用
+    column_texts[col_code] = list(dict.fromkeys(translations))
+print()
+
+# 前回の実行から内容が変わったセル・新しいセルだけを翻訳する
+# （(行キー=ja列, 列) ごとの内容ハッシュを出力Excelの隣に保存）
+manifest = CellHashManifest.load(default_manifest_path(input_csv, excel_file))
+if full:
+    manifest.entries = {}
+plan = manifest.plan(df, list(column_texts), {c: registry.api_code(c) for c in column_texts}, 'ja')
+print(f"差分翻訳: 変更・追加 {plan.pending_cells}セル、前回の結果を引き継ぎ {plan.reused_cells}セル")
+print()
+
+# 待機時間ではなくトークンバケットでリクエスト数を制限する
+journal = None if dry_run else RunJournal(journal_file, resume=resume)
+client = TranslationClient(
+    backend=backend,
+    max_concurrency=MAX_CONCURRENCY,
+    requests_per_second=REQUESTS_PER_SECOND,
+    journal=journal
+)
+
+if dry_run:
+    # 実行時と同じ設定（重複除去・キャッシュ・用語集・チャンク分割・レート制限）で見積もる
+    report = estimate_jobs(
+        [
+            (col_code, plan.pending[col_code], registry.api_code(col_code), 'ja')
+            for col_code in column_texts
+        ],
+        engine=client.engine
+    )
+    print_estimate(report)
+    sys.exit(0)
+
+# 逆翻訳結果を格納（列ごと）
+# 変わっていないセルは前回の結果を引き継ぐ
+reverse_translations_by_column = {col_code: dict(plan.reused[col_code]) for col_code in column_texts}
+
+# 全言語・全バッチを並列に翻訳（失敗したバッチは原文のまま残す）
+if resume:
+    print(f"再開モード: 完了済み {journal.chunk_count}バッチをジャーナルから再利用")
+print(f"並列翻訳中: {len(column_texts)}言語（同時 {MAX_CONCURRENCY}件、{REQUESTS_PER_SECOND}リクエスト/秒まで）")
+column_results = client.translate_columns(
+    {
+        col_code: (plan.pending[col_code], registry.api_code(col_code), 'ja')
+        for col_code in column_texts
+    },
+    raise_on_error=False
+)
+for col_code in column_texts:
+    for original, translated in zip(plan.pending[col_code], column_results[col_code]):
+        if translated is not None:
+            reverse_translations_by_column[col_code][original] = translated
+
+# 逆翻訳結果をデータフレームに適用
+for col_code, reverse_translations in reverse_translations_by_column.items():
+    manifest.update(plan, col_code, reverse_translations)
     df_output[col_code] = df[col_code].apply(
         lambda x: reverse_translations.get(x, x) if pd.notna(x) and x != '' else x
     )
 
-    print(f"  完了: {len(reverse_translations)}件の逆翻訳")
+    print(f"完了: {registry.name(col_code)} ({col_code}) {len(reverse_translations)}/{len(column_texts[col_code])}件の逆翻訳")
+
+# 失敗したバッチがある場合は再開方法を表示
+failed_count = sum(
+    len(column_texts[col_code]) - len(reverse_translations)
+    for col_code, reverse_translations in reverse_translations_by_column.items()
+)
+if failed_count > 0:
     print()
+    print(f"注意: {failed_count}件が未翻訳です（原文のまま出力）")
+    print("  --resume を付けて再実行すると、完了済みのバッチを再利用して残りだけを翻訳します")
 
+print()
 print("=" * 80)
 print("逆翻訳処理完了")
 print("=" * 80)
 print()
 
 # Excelファイルに保存
-excel_file = os.path.join(output_dir, '逆翻訳_検証結果.xlsx')
-
 print("Excelファイル作成中...")
 
 with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
@@ -275,6 +275,9 @@ for ws in [ws_input, ws_output]:
 
 wb.save(excel_file)
 
+# Excelの保存に成功してからハッシュを保存（途中で失敗した場合は次回も同じセルを翻訳する）
+manifest.save()
+
 print()
 print(f"保存: {excel_file}")
 print()
@@ -294,9 +297,9 @@ with open(summary_file, 'w', encoding='utf-8') as f:
     f.write("\n")
 
     f.write("逆翻訳した言語:\n")
-    for col_code, lang_name in lang_mapping.items():
+    for col_code in target_columns:
         count = df[col_code].notna().sum()
-        f.write(f"  {lang_name:15s} ({col_code:10s}): {count}件\n")
+        f.write(f"  {registry.name(col_code):15s} ({col_code:10s}): {count}件\n")
     f.write("\n")
 
     f.write(f"出力Excel: {os.path.basename(excel_file)}\n")
@@ -307,6 +310,9 @@ with open(summary_file, 'w', encoding='utf-8') as f:
     f.write("座標: 両シートの行・列位置は完全に一致\n")
 
 print(f"サマリー保存: {summary_file}")
+
+# 言語ペアごとのリクエスト数・応答時間・再試行などを書き出す
+write_run_summary()
 print()
 
 print("=" * 80)